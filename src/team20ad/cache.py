@@ -0,0 +1,131 @@
+"""Opt-in persistent cache for expression graphs and generated derivative code.
+
+The cache is disabled unless a directory is set, either with `set_cache_dir()` or through
+the TEAM20AD_CACHE_DIR environment variable. Entries are keyed by a hash of what they
+were built from (e.g. the functions and the variable ordering) and the package version,
+so upgrading the package never reuses stale entries.
+
+Entries are pickled: only point the cache at a directory you trust.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+from . import __version__
+
+
+_cache_dir = None
+
+
+def set_cache_dir(path):
+    """Enables the cache in the given directory, or disables it if path is None.
+
+    Parameter
+    ------
+    path : str or None
+        the cache directory; it is created if it does not exist.
+    """
+    global _cache_dir
+    if path is not None:
+        os.makedirs(path, exist_ok = True)
+    _cache_dir = path
+
+
+def get_cache_dir():
+    """Returns the cache directory, or None if the cache is disabled.
+
+    Returns
+    ------
+    str or None
+        the directory set by set_cache_dir(), or else the TEAM20AD_CACHE_DIR environment variable.
+    """
+    if _cache_dir is not None:
+        return _cache_dir
+    return os.environ.get("TEAM20AD_CACHE_DIR") or None
+
+
+def cache_key(*parts):
+    """Returns a key identifying the given parts and the package version.
+
+    Parameter
+    ------
+    parts : str, or tuple or list of str
+        what the cached entry is built from.
+
+    Returns
+    ------
+    str
+        a hexadecimal hash.
+    """
+    return hashlib.sha256(repr((__version__, parts)).encode()).hexdigest()
+
+
+def _path(kind, key):
+    return os.path.join(get_cache_dir(), f"{kind}-{key}.pkl")
+
+
+def load(kind, key):
+    """Returns a cached entry.
+
+    Parameters
+    ------
+    kind : str
+        the kind of entry, e.g. 'graph' or 'kernel'.
+    key : str
+        the key returned by cache_key().
+
+    Returns
+    ------
+    object or None
+        the entry, or None if the cache is disabled, or the entry is missing, unreadable
+        or was written by another version of the package.
+    """
+    if get_cache_dir() is None:
+        return None
+    try:
+        with open(_path(kind, key), 'rb') as f:
+            version, data = pickle.load(f)
+    except (OSError, EOFError, ValueError, TypeError, AttributeError, ImportError, pickle.UnpicklingError):
+        return None
+    return data if version == __version__ else None
+
+
+def store(kind, key, data):
+    """Stores an entry if the cache is enabled.
+
+    The entry is written to a temporary file first, so concurrent readers never see
+    a partially written entry.
+
+    Parameters
+    ------
+    kind : str
+        the kind of entry, e.g. 'graph' or 'kernel'.
+    key : str
+        the key returned by cache_key().
+    data : object
+        the picklable entry.
+    """
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return
+    os.makedirs(cache_dir, exist_ok = True)
+    fd, tmp = tempfile.mkstemp(dir = cache_dir, suffix = '.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((__version__, data), f)
+        os.replace(tmp, _path(kind, key))
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def clear_cache():
+    """Removes every entry from the cache directory."""
+    cache_dir = get_cache_dir()
+    if cache_dir is None or not os.path.isdir(cache_dir):
+        return
+    for name in os.listdir(cache_dir):
+        if name.endswith('.pkl'):
+            os.remove(os.path.join(cache_dir, name))
@@ -0,0 +1,337 @@
+"""Source-to-source automatic differentiation.
+
+The functions are translated into the source of a straight-line Python function computing
+both the function values and the Jacobian with plain float arithmetic. No DualNumber or
+Node objects are created when the generated function is called.
+"""
+
+import numpy as np
+from functools import lru_cache
+
+from . import cache
+from .expression import compile_graph
+
+
+# source templates of the value and the local partials (one per operand, None if the
+# operand must be constant) of each operation; {v} refers to the value of the node itself
+_TEMPLATES = {
+    'add': ('{0} + {1}', ('1.0', '1.0')),
+    'sub': ('{0} - {1}', ('1.0', '-1.0')),
+    'neg': ('-{0}', ('-1.0',)),
+    'mul': ('{0} * {1}', ('{1}', '{0}')),
+    'truediv': ('{0} / {1}', ('1.0 / {1}', '-{v} / {1}')),
+    'pow': ('{0} ** {1}', ('{1} * {0} ** ({1} - 1)', '(_math.log({0}) * {v} if {0} > 0 else 0.0)')),
+    'pow_const': ('{0} ** {1}', ('{1} * {0} ** {2}', None)),
+    'abs': ('abs({0})', ('(({0} > 0) - ({0} < 0))',)),
+    'sqrt': ('_math.sqrt({0})', ('0.5 / {v}',)),
+    'exp': ('_exp({0})', ('{v}',)),
+    'log': ('_math.log({0})', ('1.0 / {0}',)),
+    'log_base': ('_math.log({0}) / _math.log({1})', ('1.0 / ({0} * _math.log({1}))', None)),
+    'sin': ('_math.sin({0})', ('_math.cos({0})',)),
+    'cos': ('_math.cos({0})', ('-_math.sin({0})',)),
+    'tan': ('_math.tan({0})', ('1.0 / _math.cos({0}) ** 2',)),
+    'arcsin': ('_math.asin({0})', ('1.0 / _math.sqrt(1.0 - {0} * {0})',)),
+    'arccos': ('_math.acos({0})', ('-1.0 / _math.sqrt(1.0 - {0} * {0})',)),
+    'arctan': ('_math.atan({0})', ('1.0 / (1.0 + {0} * {0})',)),
+    'sinh': ('_sinh({0})', ('_cosh({0})',)),
+    'cosh': ('_cosh({0})', ('_sinh({0})',)),
+    'tanh': ('_math.tanh({0})', ('1.0 - {v} * {v}',)),
+    'logistic': ('{1} / (1.0 + _exp(-{2} * ({0} - {3})))', ('{2} * {v} * (1.0 - {v} / {1})', None, None, None)),
+}
+
+# domain checks emitted before an operation, as a condition on its operands and the
+# ValueError raised when it holds; they match the checks of the functions in elementary.py
+_GUARDS = {
+    'sqrt': ('{0} <= 0', "'Should not be negative.'"),
+    'log': ('{0} <= 0', "'Should not be negative.'"),
+    'log_base': ('{0} <= 0', "'Should not be negative.'"),
+    'tan': ('{0} % _math.pi == _math.pi / 2', "'Tan is undefined in the given domain'"),
+    'arcsin': ('abs({0}) >= 1', "'arcsin() cannot be evaluated at {{}}.'.format({0})"),
+    'arccos': ('abs({0}) >= 1', "'arccos() cannot be evaluated at {{}}.'.format({0})"),
+}
+
+# default parameters of logistic, filled in when omitted
+_LOGISTIC_DEFAULTS = ('1', '1', '0')
+
+# functions of elementary.py that overflow to inf like NumPy instead of raising OverflowError
+_HELPERS = ('_cosh', '_exp', '_sinh')
+
+
+def _literal(value):
+    """Returns the source of a constant."""
+    if not np.isfinite(value):  # the repr of inf and nan is not a literal
+        return f"float('{value!r}')"
+    return repr(value) if value >= 0 else f"({value!r})"
+
+
+def _is_atom(src):
+    """Returns whether a source snippet is a name or a non-negative literal."""
+    return src.isidentifier() or src.replace('.', '', 1).replace('e', '', 1).isdigit()
+
+
+def generate_source(var_names, func_list, name = 'ad_kernel'):
+    """Generates a straight-line Python function computing function values and the Jacobian.
+
+    Only structurally nonzero partials are computed.
+
+    Parameters
+    ------
+    var_names : list of str
+        the variable ordering; these are the parameters of the generated function and
+        the columns of the Jacobian.
+    func_list : str, Expression, or list of str or Expression
+        (a list of) function(s) encoded as string(s) or parsed Expression(s).
+    name : str, optional (default = 'ad_kernel')
+        the name of the generated function.
+
+    Returns
+    ------
+    str
+        the source of a module defining the function, which returns a list of function
+        values and the Jacobian as a list of rows.
+
+    Raises
+    ------
+    ValueError
+        if a variable name is not a public identifier, or a function depends on the
+        variables through an operand that has to be constant (e.g. the base of log).
+        The generated function raises ValueError outside the domain of an elementary
+        function, like the functions of elementary.py.
+    NameError
+        if a function uses a variable missing from var_names.
+
+    Examples
+    ------
+    >>> print(generate_source(['x', 'y'], ['x * y']))
+    import math as _math
+    <BLANKLINE>
+    <BLANKLINE>
+    def ad_kernel(x, y):
+        _v2 = x * y
+        return [_v2], [[y, x]]
+    <BLANKLINE>
+    """
+    graph = compile_graph(func_list)
+    var_names = list(var_names)
+    for var_name in var_names:
+        if not var_name.isidentifier() or var_name.startswith('_'):
+            raise ValueError(f"Invalid variable name '{var_name}'.")
+    column = {var_name: j for j, var_name in enumerate(var_names)}
+
+    lines = []
+    vals = {}  # node position -> source of its value
+    tans = {}  # node position -> {column: source of its partial}, structural zeros omitted
+    guarded = set()  # (guard, operand) pairs already checked
+    for i, node in enumerate(graph.nodes):
+        if node.op == 'var':
+            if node.value not in column:
+                raise NameError(f"name '{node.value}' is not defined")
+            vals[i], tans[i] = node.value, {column[node.value]: '1.0'}
+            continue
+        if node.op == 'const':
+            vals[i], tans[i] = _literal(node.value), {}
+            continue
+
+        op = node.op
+        args = [vals[a] for a in node.args]
+        if op == 'log' and len(args) == 2:
+            op = 'log_base'
+        elif op == 'pow' and graph.nodes[node.args[1]].op == 'const':
+            op = 'pow_const'
+            exponent = graph.nodes[node.args[1]].value - 1
+            args.append(_literal(exponent))
+        elif op == 'logistic':
+            args += _LOGISTIC_DEFAULTS[len(args) - 1:]
+        value, partials = _TEMPLATES[op]
+
+        if op in _GUARDS and (_GUARDS[op], args[0]) not in guarded:
+            condition, message = _GUARDS[op]
+            lines.append(f"if {condition.format(*args)}:")
+            lines.append(f"    raise ValueError({message.format(*args)})")
+            guarded.add((_GUARDS[op], args[0]))
+        vals[i] = f"_v{i}"
+        lines.append(f"_v{i} = {value.format(*args)}")
+
+        tans[i] = {}
+        terms = {}
+        for k, a in enumerate(node.args):
+            if not tans[a]:
+                continue
+            if partials[k] is None:
+                raise ValueError(f"Operand {k} of {node.op}() should not depend on the variables.")
+            partial = partials[k].format(*args, v = vals[i])
+            if partial not in ('1.0', '-1.0') and not _is_atom(partial):
+                lines.append(f"_p{i}_{k} = {partial}")
+                partial = f"_p{i}_{k}"
+            for j, tangent in tans[a].items():
+                if tangent in ('1.0', '-1.0'):
+                    if partial in ('1.0', '-1.0'):
+                        term = '1.0' if partial == tangent else '-1.0'
+                    else:
+                        term = partial if tangent == '1.0' else f"-{partial}"
+                elif partial == '1.0':
+                    term = tangent
+                elif partial == '-1.0':
+                    term = f"-{tangent}"
+                else:
+                    term = f"{partial} * {tangent}"
+                terms.setdefault(j, []).append(term)
+
+        for j in sorted(terms):
+            src = ' + '.join(terms[j]).replace('+ -', '- ')
+            if _is_atom(src) or src == '-1.0':
+                tans[i][j] = src
+            else:
+                lines.append(f"_d{i}_{j} = {src}")
+                tans[i][j] = f"_d{i}_{j}"
+
+    func_evals = ', '.join(vals[o] for o in graph.outputs)
+    rows = ', '.join('[' + ', '.join(tans[o].get(j, '0.0') for j in range(len(var_names))) + ']'
+                     for o in graph.outputs)
+    lines.append(f"return [{func_evals}], [{rows}]")
+
+    body = '\n'.join('    ' + line for line in lines)
+    header = "import math as _math\n"
+    helpers = [helper for helper in _HELPERS if helper + '(' in body]
+    if helpers:
+        header += f"from team20ad.elementary import {', '.join(helpers)}\n"
+    return f"{header}\n\ndef {name}({', '.join(var_names)}):\n{body}\n"
+
+
+@lru_cache(maxsize = 128)
+def _compile_kernel(var_names, func_list, name):
+    key = cache.cache_key('kernel', var_names, func_list, name)
+    source = cache.load('kernel', key)
+    if source is None:
+        source = generate_source(list(var_names), list(func_list), name)
+        cache.store('kernel', key, source)
+    namespace = {}
+    exec(compile(source, f"<{name}>", "exec"), namespace)
+    kernel = namespace[name]
+    kernel.source = source
+    return kernel
+
+
+def compile_kernel(var_names, func_list, name = 'ad_kernel'):
+    """Compiles the function generated by generate_source().
+
+    Kernels are cached, so the source is generated only once per set of functions and
+    variable ordering. If the persistent cache is enabled (see `cache.set_cache_dir()`),
+    the source is also stored on disk and reused by other processes.
+
+    Parameters
+    ------
+    var_names : list of str
+        the variable ordering.
+    func_list : str, Expression, or list of str or Expression
+        (a list of) function(s) encoded as string(s) or parsed Expression(s).
+    name : str, optional (default = 'ad_kernel')
+        the name of the generated function.
+
+    Returns
+    ------
+    function
+        the generated function; its source is available as its `source` attribute.
+    """
+    graph = compile_graph(func_list)
+    return _compile_kernel(tuple(var_names), tuple(graph.func_list), name)
+
+
+def write_module(path, var_names, func_list, name = 'ad_kernel'):
+    """Writes the function generated by generate_source() to an importable module.
+
+    Parameters
+    ------
+    path : str
+        path of the module file to write.
+    var_names : list of str
+        the variable ordering.
+    func_list : str, Expression, or list of str or Expression
+        (a list of) function(s) encoded as string(s) or parsed Expression(s).
+    name : str, optional (default = 'ad_kernel')
+        the name of the generated function.
+    """
+    source = generate_source(var_names, func_list, name)
+    with open(path, 'w') as f:
+        f.write(f'"""Generated by team20ad.codegenAD from {compile_graph(func_list).func_list!r}."""\n\n')
+        f.write(source)
+
+
+class CodegenAD:
+    """Automatic Differentiation through generated straight-line code.
+
+    Parameters
+    ------
+    var_dict: dict
+        a dictionary of variables and their corresponding values
+    func_list: str, Expression, or list of str or Expression
+        (a list of) function(s) encoded as string(s) or parsed Expression(s)
+
+    Attributes
+    ------
+    func_evals: list
+        the evaluation of function(s) at the given point
+    Dpf: numpy.array
+        derivatives of function(s) evaluated at the given point
+    kernel: function
+        the generated function, taking the variables in the order of var_dict
+
+    Examples
+    --------
+    >>> var_dict = {'x': 1, 'y': 1}
+    >>> func_list = ['x**2 + y**2', 'exp(x + y)']
+    >>> ad = CodegenAD(var_dict, func_list)
+    >>> ad()
+    ===== Codegen AD =====
+    Vars: {'x': 1, 'y': 1}
+    Funcs: ['x**2 + y**2', 'exp(x + y)']
+    -----
+    Func evals: [2, 7.38905609893065]
+    Derivatives:
+    [[2.        2.       ]
+     [7.3890561 7.3890561]]
+    """
+
+    def __init__(self, var_dict, func_list):
+        # type checks
+        if not isinstance(var_dict, dict):
+            raise TypeError("var_dict should be a dictionary.")
+
+        self.var_dict = var_dict
+        self.func_list = compile_graph(func_list).func_list
+        self.kernel = compile_kernel(list(var_dict), func_list)
+
+        self.func_evals, Dpf = self.kernel(*var_dict.values())
+        self.Dpf = np.array(Dpf, dtype = float).reshape(len(self.func_list), len(var_dict))
+
+    def update(self, **changed_vars):
+        """Re-evaluates at a point where only the given variables changed.
+
+        The generated function is straight-line code, so it is simply called again.
+
+        Parameters
+        ------
+        changed_vars : int or float
+            new values of variables, passed as keyword arguments.
+
+        Raises
+        ------
+        KeyError
+            if a variable is not in var_dict.
+        """
+        for var_name in changed_vars:
+            if var_name not in self.var_dict:
+                raise KeyError(f"Unknown variable '{var_name}'.")
+        self.var_dict = {**self.var_dict, **changed_vars}
+
+        self.func_evals, Dpf = self.kernel(*self.var_dict.values())
+        self.Dpf[:] = np.array(Dpf, dtype = float).reshape(self.Dpf.shape)
+
+    def __call__(self):
+        out = "===== Codegen AD =====\n"
+        out += f"Vars: {self.var_dict}\n"
+        out += f"Funcs: {self.func_list}\n"
+        out += "-----\n"
+        out += f"Func evals: {self.func_evals}\n"
+        out += f"Derivatives:\n{self.Dpf}"
+        print(out)
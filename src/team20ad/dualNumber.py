@@ -1,3 +1,4 @@
+import numbers
 import numpy as np
 
 
@@ -12,9 +13,11 @@ class DualNumber:
     real : int or float
         The real part of a dual number, which represents the value of user
         defined function(s) 'f' evaluated at point 'x'.
-    dual : int or float
+    dual : int, float or numpy.array
         The dual part of a dual number, corresponding to the derivative
-        of user defined functions(s) 'f' evaluated at point 'x'.
+        of user defined functions(s) 'f' evaluated at point 'x'. A vector holds
+        the derivatives along several directions, e.g. the whole gradient when
+        the variables are seeded with the rows of the identity matrix.
 
     Examples
     ------
@@ -22,8 +25,13 @@ class DualNumber:
     DualNumber(3.0, 4)
     >>> DualNumber(3)
     DualNumber(3, 1.0)
+    >>> x, y = DualNumber(3, np.array([1., 0.])), DualNumber(2, np.array([0., 1.]))
+    >>> x * y
+    DualNumber(6, [2. 3.])
     """
 
+    __slots__ = ('real', 'dual')
+
     _supported_scalars = (int, float)
 
     def __init__(self, real, dual = 1.0):
@@ -32,8 +40,9 @@ class DualNumber:
         ------
         real : int or float
             The value of user defined function(s) 'f' evaluated at point 'x'.
-        dual : int or float, optional (default = 1.0)
-            The corresponding derivative of user defined functions(s) 'f' evaluated at point 'x'.
+        dual : int, float or numpy.array, optional (default = 1.0)
+            The corresponding derivative of user defined functions(s) 'f' evaluated at point 'x',
+            or a vector of derivatives along several directions.
         
         Raises
         ------
@@ -66,6 +75,49 @@ class DualNumber:
         """
         return f"DualNumber: real = {self.real}, dual = {self.dual}"
 
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        """Evaluates NumPy ufuncs, e.g. np.sin(x) or np.multiply(x, y), with the DualNumber rules.
+
+        Arithmetic ufuncs are mapped to the operators of DualNumber and elementary ones
+        to the functions of the same name in elementary.py. When an operand is an array,
+        e.g. an object array of DualNumbers, all operands are packed into a DualArray and
+        evaluated at once; the result is an object array of DualNumbers.
+
+        Returns
+        ------
+        DualNumber, numpy.array
+            the result, or NotImplemented for unsupported ufuncs.
+        """
+        from team20ad import elementary
+        from team20ad.expression import apply_ufunc
+
+        if not any(isinstance(x, np.ndarray) for x in inputs):
+            return apply_ufunc(DualNumber, elementary, ufunc, method, inputs, kwargs)
+
+        shape = np.broadcast_shapes(*(getattr(x, 'shape', ()) for x in inputs))
+        packed = [DualArray.from_duals(np.broadcast_to(np.array(x, dtype = object), shape))
+                  if isinstance(x, DualNumber) or getattr(x, 'dtype', None) == object else x
+                  for x in inputs]
+        result = apply_ufunc(DualArray, elementary, ufunc, method, packed, kwargs)
+        return result.to_duals() if isinstance(result, DualArray) else result
+
+    def __array_function__(self, func, types, args, kwargs):
+        """Evaluates np.sum and np.dot over DualNumbers (or sequences of them) as a DualArray.
+
+        Returns
+        ------
+        DualNumber, numpy.array
+            the result, or NotImplemented for other functions.
+        """
+        if func not in _ARRAY_FUNCTIONS:
+            return NotImplemented
+        packed = [DualArray.from_duals(x) if isinstance(x, (DualNumber, list, tuple, np.ndarray)) else x
+                  for x in args]
+        result = func(*packed, **kwargs)
+        if isinstance(result, DualArray):
+            return result.to_duals()[()] if result.real.ndim == 0 else result.to_duals()
+        return result
+
     def __neg__(self):
         """Returns the negation of the DualNumber instance.
 
@@ -74,7 +126,7 @@ class DualNumber:
         DualNumber
             the negation of the DualNumber instance for both real and dual parts.
         """
-        return DualNumber(-self.real, -self.dual)
+        return _dual(-self.real, -self.dual)
 
     def __add__(self, other):
         """Returns the sum of the DualNumber instance and another given instance of supported type.
@@ -89,11 +141,12 @@ class DualNumber:
         DualNumber
             the sum of the two instances.
         """
-        if not isinstance(other, (*self._supported_scalars, DualNumber)):
-            raise TypeError(f"Unsupported type '{type(other)}'")
-        if isinstance(other, self._supported_scalars):
-            return DualNumber(self.real + other, self.dual)
-        return DualNumber(self.real + other.real, self.dual + other.dual)
+        kind = _KINDS.get(type(other)) or _operand_kind(other)
+        if kind == 'dual':
+            return _dual(self.real + other.real, self.dual + other.dual)
+        if kind == 'scalar':
+            return _dual(self.real + other, self.dual)
+        return NotImplemented
 
     def __radd__(self, other):
         """Returns the sum of the DualNumber instance and another given instance of supported type.
@@ -126,11 +179,12 @@ class DualNumber:
         DualNumber
             the substraction of the two instances.
         """
-        if not isinstance(other, (*self._supported_scalars, DualNumber)):
-            raise TypeError(f"Unsupported type '{type(other)}'")
-        if isinstance(other, self._supported_scalars):
-            return DualNumber(self.real - other, self.dual)
-        return DualNumber(self.real - other.real, self.dual - other.dual)
+        kind = _KINDS.get(type(other)) or _operand_kind(other)
+        if kind == 'dual':
+            return _dual(self.real - other.real, self.dual - other.dual)
+        if kind == 'scalar':
+            return _dual(self.real - other, self.dual)
+        return NotImplemented
 
     def __rsub__(self, other):
         """Returns the substraction of a scalar object and a DualNumber
@@ -145,11 +199,12 @@ class DualNumber:
         DualNumber
             the substraction of the two instances.
         """
-        if not isinstance(other, (*self._supported_scalars, DualNumber)):
-            raise TypeError(f"Unsupported type '{type(other)}'")
-        if isinstance(other, self._supported_scalars):
-            return DualNumber(other - self.real , -self.dual)
-        return DualNumber(other.real - self.real, other.dual - self.dual)
+        kind = _KINDS.get(type(other)) or _operand_kind(other)
+        if kind == 'dual':
+            return _dual(other.real - self.real, other.dual - self.dual)
+        if kind == 'scalar':
+            return _dual(other - self.real, -self.dual)
+        return NotImplemented
 
     def __mul__(self, other):
         """Returns the product of the DualNumber instance and another given instance of supported type.
@@ -164,12 +219,12 @@ class DualNumber:
         DualNumber
             the product of the two instances.
         """
-        if not isinstance(other, (*self._supported_scalars, DualNumber)):
-            raise TypeError(f"Unsupported type '{type(other)}'")
-        if isinstance(other, self._supported_scalars):
-            return DualNumber(self.real * other, other * self.dual)
-        return DualNumber(self.real * other.real,
-                          self.real * other.dual + other.real * self.dual)
+        kind = _KINDS.get(type(other)) or _operand_kind(other)
+        if kind == 'dual':
+            return _dual(self.real * other.real, self.real * other.dual + other.real * self.dual)
+        if kind == 'scalar':
+            return _dual(self.real * other, other * self.dual)
+        return NotImplemented
 
     def __rmul__(self, other):
         """Returns the product of the DualNumber instance and another scalar object.
@@ -202,16 +257,17 @@ class DualNumber:
         DualNumber
             the division of the two instances.
         """
-        if not isinstance(other, (*self._supported_scalars, DualNumber)):
-            raise TypeError(f"Unsupported type '{type(other)}'")
-        if isinstance(other, self._supported_scalars):
+        kind = _KINDS.get(type(other)) or _operand_kind(other)
+        if kind == 'dual':
+            if other.real == 0:
+                raise ZeroDivisionError("Cannot divide by zero.")
+            return _dual(self.real / other.real,
+                         (self.dual * other.real - self.real * other.dual) / (other.real ** 2))
+        if kind == 'scalar':
             if other == 0:
                 raise ZeroDivisionError("Cannot divide by zero.")
-            return DualNumber(self.real / other, self.dual / other)
-        if other.real == 0:
-            raise ZeroDivisionError("Cannot divide by zero.")
-        return DualNumber(self.real / other.real,
-                          (self.dual * other.real - self.real * other.dual) / (other.real ** 2))
+            return _dual(self.real / other, self.dual / other)
+        return NotImplemented
 
     def __rtruediv__(self, other):
         """Returns the division of the DualNumber instance and a scalar object.
@@ -226,11 +282,14 @@ class DualNumber:
         DualNumber
             the division of the two instances.
         """
-        if not isinstance(other, self._supported_scalars):
+        kind = _KINDS.get(type(other)) or _operand_kind(other)
+        if kind == 'scalar':
+            if other == 0:
+                raise ZeroDivisionError("Cannot divide by zero.")
+            return _dual(other / self.real, (-other / self.real ** 2) * self.dual)
+        if kind == 'dual':
             raise TypeError(f"Unsupported type '{type(other)}'")
-        if other == 0:
-            raise ZeroDivisionError("Cannot divide by zero.")
-        return DualNumber(other / self.real, (-other / self.real ** 2) * self.dual)
+        return NotImplemented
 
     def __pow__(self, other):
         """Returns the exponential of the DualNumber instance as base and another given instance of supported type as an exponent.
@@ -245,9 +304,10 @@ class DualNumber:
         DualNumber
             the result of the exponential operation on the given instances.
         """
-        if not isinstance(other, (*self._supported_scalars, DualNumber)):
-            raise TypeError(f"Unsupported type '{type(other)}'")
-        if isinstance(other, self._supported_scalars):
+        kind = _KINDS.get(type(other)) or _operand_kind(other)
+        if kind == 'array':
+            return NotImplemented
+        if kind == 'scalar':
             real_pow = self.real ** other
             dual_pow = other * (self.real ** (other - 1)) * self.dual
         else:
@@ -274,7 +334,10 @@ class DualNumber:
         DualNumber
             the result of the exponential operation on the given instances.
         """
-        if not isinstance(other, self._supported_scalars):
+        kind = _KINDS.get(type(other)) or _operand_kind(other)
+        if kind == 'array':
+            return NotImplemented
+        if kind == 'dual':
             raise TypeError(f"Unsupported type '{type(other)}'")
         real_pow = other ** self.real
         if other < 0:
@@ -295,11 +358,12 @@ class DualNumber:
         bool
             True if the two instances are equal; and False, otherwise.
         """
-        if not isinstance(other, (*self._supported_scalars, DualNumber)):
-            raise TypeError(f"Unsupported type '{type(other)}'")
-        if isinstance(other, self._supported_scalars):
-            return (self.real == other.real) and (self.dual == 0)
-        return (self.real == other.real) and (self.dual == other.dual)
+        kind = _KINDS.get(type(other)) or _operand_kind(other)
+        if kind == 'dual':
+            return bool(self.real == other.real and np.all(self.dual == other.dual))
+        if kind == 'scalar':
+            return bool(self.real == other and np.all(self.dual == 0))
+        return NotImplemented
 
     def __ne__(self, other):
         """Compares two objects if they are not equal.
@@ -397,6 +461,741 @@ class DualNumber:
         Returns
         ------
         DualNumber
-            the absolute value of the DualNumber instance on both real and dual parts.
+            the absolute value of the DualNumber instance, whose dual part is scaled
+            by the sign of the real part.
+        """
+        return DualNumber(abs(self.real), np.sign(self.real) * self.dual)
+
+class DualArray:
+    """Dual numbers at many points at once, with NumPy arrays as real and dual parts.
+
+    Every operation of DualNumber, and every function of elementary.py, is applied
+    elementwise, so one evaluation differentiates a whole batch of points.
+
+    Attributes
+    ------
+    real : numpy.array
+        The real parts, i.e. the values of user defined function(s) 'f' at each point.
+    dual : numpy.array
+        The dual parts, of the same shape as real, or with a leading axis holding the
+        derivatives along several directions (e.g. one per variable).
+
+    Examples
+    ------
+    >>> x = DualArray([1., 2., 3.])
+    >>> x * x
+    DualArray([1. 4. 9.], [2. 4. 6.])
+    >>> y = DualArray([1., 2.], [[1., 1.], [0., 0.]])
+    >>> (y * 3).dual
+    array([[3., 3.],
+           [0., 0.]])
+    """
+
+    def __init__(self, real, dual = 1.0):
+        """
+        Parameters
+        ------
+        real : array_like
+            The values of user defined function(s) 'f' evaluated at each point.
+        dual : array_like, optional (default = 1.0)
+            The corresponding derivatives, of the shape of real, or with a leading axis of
+            directions; a scalar is broadcast to the shape of real.
+
+        Raises
+        ------
+        TypeError
+            if an argument value is not numeric.
+        ValueError
+            if the shape of dual does not match the shape of real.
+        """
+        try:
+            self.real = np.asarray(real, dtype = float)
+            dual = np.asarray(dual, dtype = float)
+        except (TypeError, ValueError):
+            raise TypeError("DualArray parts should be numeric arrays.")
+        if dual.ndim == 0:
+            dual = np.full(self.real.shape, float(dual))
+        if dual.shape[dual.ndim - self.real.ndim:] != self.real.shape or dual.ndim > self.real.ndim + 1:
+            raise ValueError(f"Dual part of shape {dual.shape} does not match real part of shape {self.real.shape}.")
+        self.dual = dual
+
+    def __repr__(self):
+        """Returns a representation of the DualArray instance.
+
+        Returns
+        ------
+        str
+            a representation of the DualArray instance.
+        """
+        return f"DualArray({self.real}, {self.dual})"
+
+    def __str__(self):
+        """Returns a string representation of the DualArray instance.
+
+        Returns
+        ------
+        str
+            a string representation of the DualArray instance.
+        """
+        return f"DualArray: real = {self.real}, dual = {self.dual}"
+
+    def __len__(self):
+        """Returns the number of points along the first axis.
+
+        Returns
+        ------
+        int
+            the length of the real part.
+        """
+        return len(self.real)
+
+    def __getitem__(self, index):
+        """Returns the dual numbers at the given points.
+
+        Parameter
+        ------
+        index : int, slice or array_like
+            the points to select, indexing the real part.
+
+        Returns
+        ------
+        DualArray
+            the selected points, with all directions of the dual part.
+        """
+        if self.dual.ndim > self.real.ndim:
+            return DualArray(self.real[index], self.dual[(slice(None), index)])
+        return DualArray(self.real[index], self.dual[index])
+
+    @property
+    def shape(self):
+        """tuple: the shape of the batch of points."""
+        return self.real.shape
+
+    @classmethod
+    def from_duals(cls, duals):
+        """Packs an array of DualNumbers (or numbers, which have a zero dual part) into a DualArray.
+
+        Parameter
+        ------
+        duals : array_like
+            the DualNumbers, e.g. an object array; vector dual parts become the leading
+            axis of the DualArray's dual part.
+
+        Returns
+        ------
+        DualArray
+            the DualNumbers as one DualArray.
+        """
+        duals = np.asarray(duals, dtype = object)
+        real = np.array([getattr(d, 'real', d) for d in duals.flat], dtype = float).reshape(duals.shape)
+        tangents = [np.asarray(d.dual if isinstance(d, DualNumber) else 0., dtype = float) for d in duals.flat]
+        width = np.broadcast_shapes(*(t.shape for t in tangents)) if tangents else ()
+        dual = np.array([np.broadcast_to(t, width) for t in tangents]).reshape(duals.shape + width)
+        if width:
+            dual = np.moveaxis(dual, -1, 0)
+        return cls(real, dual)
+
+    def to_duals(self):
+        """Unpacks the DualArray into an array of DualNumbers.
+
+        Returns
+        ------
+        numpy.array
+            an object array of DualNumbers, one per point.
+        """
+        tangents = np.moveaxis(self.dual, 0, -1) if self.dual.ndim > self.real.ndim else self.dual
+        duals = np.empty(self.real.shape, dtype = object)
+        for index in np.ndindex(self.real.shape):
+            tangent = tangents[index]
+            duals[index] = DualNumber(float(self.real[index]), tangent if np.ndim(tangent) else float(tangent))
+        return duals
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        """Evaluates NumPy ufuncs, e.g. np.sin(x) or array + x, with the DualArray rules.
+
+        Returns
+        ------
+        DualArray
+            the result, or NotImplemented for unsupported ufuncs.
+        """
+        from team20ad import elementary
+        from team20ad.expression import apply_ufunc
+
+        inputs = [DualArray.from_duals(x) if getattr(x, 'dtype', None) == object else x for x in inputs]
+        return apply_ufunc(DualArray, elementary, ufunc, method, inputs, kwargs)
+
+    def __array_function__(self, func, types, args, kwargs):
+        """Evaluates np.sum, np.mean and np.dot over the points of DualArrays.
+
+        Returns
+        ------
+        DualArray
+            the result, or NotImplemented for other functions.
+        """
+        if func not in _ARRAY_FUNCTIONS:
+            return NotImplemented
+        return _ARRAY_FUNCTIONS[func](*args, **kwargs)
+
+    @staticmethod
+    def _parts(other):
+        """Returns the real and dual parts of an operand; constants have a zero dual part."""
+        if isinstance(other, (DualArray, DualNumber)):
+            return other.real, other.dual
+        if isinstance(other, (*DualNumber._supported_scalars, np.ndarray, np.number)):
+            return other, 0.
+        raise TypeError(f"Unsupported type '{type(other)}'")
+
+    def __neg__(self):
+        """Returns the negation of the DualArray instance.
+
+        Returns
+        ------
+        DualArray
+            the negation of both real and dual parts.
+        """
+        return DualArray(-self.real, -self.dual)
+
+    def __add__(self, other):
+        """Returns the elementwise sum of the DualArray instance and another operand.
+
+        Parameter
+        ------
+        other : DualArray, DualNumber, numpy.array, int, or float
+            the instance to compute the sum with.
+
+        Returns
+        ------
+        DualArray
+            the sum at each point.
+        """
+        real, dual = self._parts(other)
+        return DualArray(self.real + real, self.dual + dual)
+
+    def __radd__(self, other):
+        """Returns the elementwise sum of another operand and the DualArray instance.
+
+        As the add operation is commutative, this method delegates the operation
+        to __add__().
+
+        Parameter
+        ------
+        other : DualNumber, numpy.array, int, or float
+            the instance to compute the sum with.
+
+        Returns
+        ------
+        DualArray
+            the sum at each point.
         """
-        return DualNumber(abs(self.real), abs(self.dual))
\ No newline at end of file
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        """Returns the elementwise subtraction of another operand from the DualArray instance.
+
+        Parameter
+        ------
+        other : DualArray, DualNumber, numpy.array, int, or float
+            the instance to subtract.
+
+        Returns
+        ------
+        DualArray
+            the subtraction at each point.
+        """
+        real, dual = self._parts(other)
+        return DualArray(self.real - real, self.dual - dual)
+
+    def __rsub__(self, other):
+        """Returns the elementwise subtraction of the DualArray instance from another operand.
+
+        Parameter
+        ------
+        other : DualNumber, numpy.array, int, or float
+            the instance to be subtracted from.
+
+        Returns
+        ------
+        DualArray
+            the subtraction at each point.
+        """
+        real, dual = self._parts(other)
+        return DualArray(real - self.real, dual - self.dual)
+
+    def __mul__(self, other):
+        """Returns the elementwise product of the DualArray instance and another operand.
+
+        Parameter
+        ------
+        other : DualArray, DualNumber, numpy.array, int, or float
+            the instance to compute the product with.
+
+        Returns
+        ------
+        DualArray
+            the product at each point.
+        """
+        real, dual = self._parts(other)
+        return DualArray(self.real * real, self.real * dual + real * self.dual)
+
+    def __rmul__(self, other):
+        """Returns the elementwise product of another operand and the DualArray instance.
+
+        As the multiplication operation is commutative, this method delegates the operation
+        to __mul__().
+
+        Parameter
+        ------
+        other : DualNumber, numpy.array, int, or float
+            the instance to compute the product with.
+
+        Returns
+        ------
+        DualArray
+            the product at each point.
+        """
+        return self.__mul__(other)
+
+    def __truediv__(self, other):
+        """Returns the elementwise division of the DualArray instance by another operand.
+
+        Parameter
+        ------
+        other : DualArray, DualNumber, numpy.array, int, or float
+            the instance to divide by.
+
+        Returns
+        ------
+        DualArray
+            the division at each point.
+
+        Raises
+        ------
+        ZeroDivisionError
+            if any divisor is zero.
+        """
+        real, dual = self._parts(other)
+        if np.any(np.equal(real, 0)):
+            raise ZeroDivisionError("Cannot divide by zero.")
+        return DualArray(self.real / real, (self.dual * real - self.real * dual) / real ** 2)
+
+    def __rtruediv__(self, other):
+        """Returns the elementwise division of another operand by the DualArray instance.
+
+        Parameter
+        ------
+        other : DualNumber, numpy.array, int, or float
+            the instance to be divided.
+
+        Returns
+        ------
+        DualArray
+            the division at each point.
+
+        Raises
+        ------
+        ZeroDivisionError
+            if any divisor is zero.
+        """
+        real, dual = self._parts(other)
+        if np.any(self.real == 0):
+            raise ZeroDivisionError("Cannot divide by zero.")
+        return DualArray(real / self.real, (dual * self.real - real * self.dual) / self.real ** 2)
+
+    def __pow__(self, other):
+        """Returns the elementwise exponential with the DualArray instance as base.
+
+        As for DualNumber, the derivative with respect to the exponent is only
+        accumulated where the base is positive.
+
+        Parameter
+        ------
+        other : DualArray, DualNumber, numpy.array, int, or float
+            the exponent part.
+
+        Returns
+        ------
+        DualArray
+            the result of the exponential operation at each point.
+        """
+        real, dual = self._parts(other)
+        real_pow = self.real ** real
+        dual_pow = real * self.real ** (real - 1) * self.dual
+        if not np.isscalar(dual) or dual != 0:
+            positive = self.real > 0
+            dual_pow = dual_pow + np.where(positive, np.log(np.where(positive, self.real, 1.)), 0.) * real_pow * dual
+        return DualArray(real_pow, dual_pow)
+
+    def __rpow__(self, other):
+        """Returns the elementwise exponential with the DualArray instance as exponent.
+
+        Parameter
+        ------
+        other : DualNumber, numpy.array, int, or float
+            the base of the exponential function.
+
+        Returns
+        ------
+        DualArray
+            the result of the exponential operation at each point.
+
+        Raises
+        ------
+        ValueError
+            if any base is negative.
+        """
+        real, dual = self._parts(other)
+        if np.any(np.less(real, 0)):
+            raise ValueError(f"Unsupported value '{type(other)}'")
+        real_pow = real ** self.real
+        return DualArray(real_pow, np.log(real) * real_pow * self.dual)
+
+    def __eq__(self, other):
+        """Compares the DualArray instance with another operand elementwise.
+
+        Parameter
+        ------
+        other : DualArray, DualNumber, numpy.array, int, or float
+            The object to compare with.
+
+        Returns
+        ------
+        numpy.array
+            True where both the real part and every direction of the dual part are equal.
+        """
+        real, dual = self._parts(other)
+        equal = np.equal(self.dual, dual)
+        if self.dual.ndim > self.real.ndim:
+            equal = equal.all(axis = 0)
+        return np.logical_and(self.real == real, equal)
+
+    def __ne__(self, other):
+        """Compares the DualArray instance with another operand elementwise.
+
+        This operator is a negation of __eq__().
+
+        Parameter
+        ------
+        other : DualArray, DualNumber, numpy.array, int, or float
+            The object to compare with.
+
+        Returns
+        ------
+        numpy.array
+            True where the two operands differ.
+        """
+        return np.logical_not(self.__eq__(other))
+
+    def __lt__(self, other):
+        """Compares the real parts elementwise.
+
+        Parameter
+        ------
+        other : DualArray, DualNumber, numpy.array, int, or float
+            The object to compare with.
+
+        Returns
+        ------
+        numpy.array
+            True where less than the given object.
+        """
+        return self.real < self._parts(other)[0]
+
+    def __gt__(self, other):
+        """Compares the real parts elementwise.
+
+        Parameter
+        ------
+        other : DualArray, DualNumber, numpy.array, int, or float
+            The object to compare with.
+
+        Returns
+        ------
+        numpy.array
+            True where greater than the given object.
+        """
+        return self.real > self._parts(other)[0]
+
+    def __le__(self, other):
+        """Compares the real parts elementwise.
+
+        Parameter
+        ------
+        other : DualArray, DualNumber, numpy.array, int, or float
+            The object to compare with.
+
+        Returns
+        ------
+        numpy.array
+            True where less than or equal to the given object.
+        """
+        return self.real <= self._parts(other)[0]
+
+    def __ge__(self, other):
+        """Compares the real parts elementwise.
+
+        Parameter
+        ------
+        other : DualArray, DualNumber, numpy.array, int, or float
+            The object to compare with.
+
+        Returns
+        ------
+        numpy.array
+            True where greater than or equal to the given object.
+        """
+        return self.real >= self._parts(other)[0]
+
+    def __abs__(self):
+        """Returns the absolute value of the DualArray instance.
+
+        Returns
+        ------
+        DualArray
+            the absolute value at each point, whose dual part is scaled by the sign of the
+            real part.
+        """
+        return DualArray(np.abs(self.real), np.sign(self.real) * self.dual)
+
+
+class SparseTangent:
+    """A sparse tangent vector, storing only the partials of the variables it depends on.
+
+    Used as the dual part of a DualNumber, it lets a forward pass carry gradients with
+    respect to many variables when each intermediate only depends on a few of them: sums
+    merge the entries of both operands, scaling touches the stored entries only, and no
+    dense vector with one entry per variable is ever allocated. Every DualNumber operation
+    and elementary function accepts it unchanged, as they only add, subtract and scale
+    dual parts.
+
+    Attributes
+    ------
+    entries : dict
+        a mapping of variable indices to partials; missing indices are structural zeros.
+
+    Examples
+    ------
+    >>> x = DualNumber(3., SparseTangent({0: 1.}))
+    >>> y = DualNumber(2., SparseTangent({7: 1.}))
+    >>> x * y
+    DualNumber(6.0, SparseTangent({0: 2.0, 7: 3.0}))
+    """
+
+    __slots__ = ('entries',)
+
+    # NumPy scalars defer to the reflected operators instead of building object arrays
+    __array_ufunc__ = None
+
+    def __init__(self, entries = None):
+        """
+        Parameters
+        ------
+        entries : dict, optional (default = None, no entries)
+            a mapping of variable indices to partials.
+        """
+        self.entries = dict(entries) if entries else {}
+
+    def __repr__(self):
+        """Returns a representation of the SparseTangent instance.
+
+        Returns
+        ------
+        str
+            a representation of the SparseTangent instance.
+        """
+        return f"SparseTangent({ {i: float(self.entries[i]) for i in sorted(self.entries)} })"
+
+    def __len__(self):
+        """Returns the number of stored entries."""
+        return len(self.entries)
+
+    @property
+    def indices(self):
+        """The indices of the stored entries, in increasing order, as a numpy.array."""
+        return np.array(sorted(self.entries), dtype = int)
+
+    @property
+    def values(self):
+        """The stored partials, in the order of indices, as a numpy.array."""
+        return np.array([self.entries[i] for i in sorted(self.entries)], dtype = float)
+
+    def toarray(self, size):
+        """Returns the dense tangent vector.
+
+        Parameters
+        ------
+        size : int
+            the number of variables.
+
+        Returns
+        ------
+        numpy.array
+            the tangent with zeros at the missing indices.
+        """
+        dense = np.zeros(size)
+        dense[self.indices] = self.values
+        return dense
+
+    def __neg__(self):
+        """Returns the negation of the SparseTangent instance."""
+        return SparseTangent({i: -v for i, v in self.entries.items()})
+
+    def __add__(self, other):
+        """Returns the sum of two SparseTangent instances, merging their entries.
+
+        Parameter
+        ------
+        other : SparseTangent, or 0
+            the instance to compute the sum with; a scalar zero leaves the tangent unchanged.
+
+        Returns
+        ------
+        SparseTangent
+            the sum of the two instances.
+        """
+        if not isinstance(other, SparseTangent):
+            if isinstance(other, numbers.Real) and other == 0:
+                return self
+            raise TypeError(f"Unsupported type '{type(other)}'")
+        if len(other.entries) > len(self.entries):
+            self, other = other, self
+        entries = dict(self.entries)
+        for i, v in other.entries.items():
+            entries[i] = entries.get(i, 0.) + v
+        return SparseTangent(entries)
+
+    def __radd__(self, other):
+        """Returns the sum of another instance and the SparseTangent instance."""
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        """Returns the substraction of the SparseTangent instance and another one."""
+        if isinstance(other, SparseTangent):
+            other = -other
+        return self.__add__(other)
+
+    def __rsub__(self, other):
+        """Returns the substraction of another instance and the SparseTangent instance."""
+        return (-self).__add__(other)
+
+    def __mul__(self, other):
+        """Returns the SparseTangent instance scaled by a scalar.
+
+        Parameter
+        ------
+        other : int or float
+            the scaling factor; NumPy scalars are supported as well.
+
+        Returns
+        ------
+        SparseTangent
+            the scaled instance.
+        """
+        if not isinstance(other, numbers.Real):
+            raise TypeError(f"Unsupported type '{type(other)}'")
+        return SparseTangent({i: v * other for i, v in self.entries.items()})
+
+    def __rmul__(self, other):
+        """Returns the SparseTangent instance scaled by a scalar."""
+        return self.__mul__(other)
+
+    def __truediv__(self, other):
+        """Returns the SparseTangent instance divided by a scalar."""
+        if not isinstance(other, numbers.Real):
+            raise TypeError(f"Unsupported type '{type(other)}'")
+        return SparseTangent({i: v / other for i, v in self.entries.items()})
+
+    def __eq__(self, other):
+        """Compares two tangents entrywise, missing entries being zeros.
+
+        Parameter
+        ------
+        other : SparseTangent, int, or float
+            The object to compare with; a scalar equals the tangent if every entry, including
+            the missing ones, equals it, which is only possible for zero.
+
+        Returns
+        ------
+        bool
+            True if the two instances are equal; and False, otherwise.
+        """
+        if isinstance(other, SparseTangent):
+            return all(self.entries.get(i, 0.) == other.entries.get(i, 0.)
+                       for i in {*self.entries, *other.entries})
+        return other == 0 and all(v == 0 for v in self.entries.values())
+
+    def __ne__(self, other):
+        """Compares two tangents if they are not equal."""
+        return not self.__eq__(other)
+
+
+def _sum(a, axis = None):
+    """Sums a DualArray over the given axis of points, or over all points."""
+    a = a if isinstance(a, DualArray) else DualArray.from_duals(a)
+    offset = a.dual.ndim - a.real.ndim  # 1 if the dual part has a leading axis of directions
+    if axis is None:
+        dual_axis = tuple(range(offset, a.dual.ndim))
+    else:
+        dual_axis = tuple(np.add(axis, offset)) if isinstance(axis, tuple) else axis % a.real.ndim + offset
+    return DualArray(a.real.sum(axis = axis), a.dual.sum(axis = dual_axis))
+
+
+def _mean(a, axis = None):
+    """Averages a DualArray over the given axis of points, or over all points."""
+    a = a if isinstance(a, DualArray) else DualArray.from_duals(a)
+    total = _sum(a, axis)
+    return total / (a.real.size / max(total.real.size, 1))
+
+
+def _dot(a, b):
+    """Returns the dot product of DualArrays (vectors) and numeric arrays."""
+    (a_real, a_dual), (b_real, b_dual) = DualArray._parts(a), DualArray._parts(b)
+    if np.ndim(a_real) == 0 or np.ndim(b_real) == 0:
+        return a * b
+    dual = 0.
+    if isinstance(a, (DualArray, DualNumber)):
+        dual = dual + np.dot(a_dual, b_real)
+    if isinstance(b, (DualArray, DualNumber)):
+        dual = dual + np.tensordot(b_dual, a_real, axes = ([-1], [-1]))
+    return DualArray(np.dot(a_real, b_real), dual)
+
+
+# NumPy functions evaluated on DualArrays through __array_function__
+_ARRAY_FUNCTIONS = {np.sum: _sum, np.mean: _mean, np.dot: _dot}
+
+
+# operand kinds of the DualNumber operators by exact type: 'dual', 'scalar', or 'array' for
+# operands evaluated elementwise by NumPy or DualArray. The common types are precomputed so
+# that each operator needs a single lookup; subclasses such as bool or numpy.float64 are
+# added on first use.
+_KINDS = {DualNumber: 'dual', int: 'scalar', float: 'scalar', np.ndarray: 'array', DualArray: 'array'}
+
+
+def _operand_kind(other):
+    """Returns the operand kind of an object, caching it for its type.
+
+    Raises
+    ------
+    TypeError
+        if the object is not a supported operand.
+    """
+    if isinstance(other, DualNumber):
+        kind = 'dual'
+    elif isinstance(other, DualNumber._supported_scalars):
+        kind = 'scalar'
+    elif isinstance(other, (np.ndarray, DualArray)):
+        kind = 'array'
+    else:
+        raise TypeError(f"Unsupported type '{type(other)}'")
+    _KINDS[type(other)] = kind
+    return kind
+
+
+_new = object.__new__
+
+
+def _dual(real, dual):
+    """Creates a DualNumber from a real part known to be supported, skipping __init__()."""
+    x = _new(DualNumber)
+    x.real = real
+    x.dual = dual
+    return x
@@ -1,29 +1,104 @@
 """Elementary functions for supporting the operations of forward mode AD.
+
+Every function accepts DualNumber, DualArray, HyperDualNumber and TaylorNumber objects as
+well as plain numbers and NumPy arrays; arrays are processed elementwise.
+
+DualNumbers and plain numbers, whose values are Python scalars, take a fast path through
+the math module, as NumPy has a large overhead on scalars. Arrays and DualArrays are
+evaluated with one vectorized NumPy call per subterm. Either way, subterms shared by the
+value and the derivative are computed once.
 """
 
+import math
+
 import numpy as np
 
-from team20ad.dualNumber import DualNumber
+from team20ad.dualNumber import DualNumber, DualArray, _dual
+from team20ad.hyperDualNumber import HyperDualNumber
+from team20ad.taylorNumber import TaylorNumber
+
+
+_reals = (int, float)
+_duals = (DualNumber, DualArray, HyperDualNumber, TaylorNumber)
+
+
+def _exp(x):
+    """math.exp(), overflowing to inf like np.exp()."""
+    try:
+        return math.exp(x)
+    except OverflowError:
+        return math.inf
+
+
+def _sinh(x):
+    """math.sinh(), overflowing to +-inf like np.sinh()."""
+    try:
+        return math.sinh(x)
+    except OverflowError:
+        return math.copysign(math.inf, x)
+
 
+def _sin(x):
+    """math.sin(), giving nan at +-inf like np.sin()."""
+    try:
+        return math.sin(x)
+    except ValueError:
+        return math.nan
 
-_supported_scalars = (int, float)
+
+def _cos(x):
+    """math.cos(), giving nan at +-inf like np.cos()."""
+    try:
+        return math.cos(x)
+    except ValueError:
+        return math.nan
+
+
+def _tan(x):
+    """math.tan(), giving nan at +-inf like np.tan()."""
+    try:
+        return math.tan(x)
+    except ValueError:
+        return math.nan
+
+
+def _cosh(x):
+    """math.cosh(), overflowing to inf like np.cosh()."""
+    try:
+        return math.cosh(x)
+    except OverflowError:
+        return math.inf
 
 
 def sqrt(val):
     """square root function supporting operations for forward mode AD.
-    
+
     Parameter
     ------
-    val : DualNumber, int or float
+    val : DualNumber, DualArray, HyperDualNumber, TaylorNumber, int, float or numpy.array
         value to compute square root
     """
-    if isinstance(val, DualNumber):
+    if type(val) is DualNumber:
+        if val.real <= 0:
+            raise ValueError(f"Should not be negative.")
+        real = math.sqrt(val.real)
+        return _dual(real, 0.5 / real * val.dual)
+    elif isinstance(val, _reals):
         if val <= 0:
             raise ValueError(f"Should not be negative.")
+        return math.sqrt(val)
+    elif isinstance(val, _duals):
+        if np.any(val.real <= 0):
+            raise ValueError(f"Should not be negative.")
 
-        return DualNumber(np.sqrt(val.real), 1 / 2 / np.sqrt(val.real) * val.dual)
-    elif isinstance(val, _supported_scalars):
-        if val <= 0:
+        if isinstance(val, TaylorNumber):
+            return val.sqrt()
+        real = np.sqrt(val.real)
+        if isinstance(val, HyperDualNumber):
+            return val.chain(real, 0.5 / real, -0.25 / (real * val.real))
+        return type(val)(real, 0.5 / real * val.dual)
+    elif isinstance(val, np.ndarray):
+        if np.any(val <= 0):
             raise ValueError(f"Should not be negative.")
 
         return np.sqrt(val)
@@ -33,19 +108,29 @@ def sqrt(val):
 
 def exp(val):
     """exponential function (base natural) supporting operations for forward mode AD.
-    
+
     Parameter
     ------
-    val : DualNumber, int or float
+    val : DualNumber, DualArray, HyperDualNumber, TaylorNumber, int, float or numpy.array
         value to compute
 
     Notes
     ------
     exponential functions for other bases are handled by __pow__ in the DualNumber class.
     """
-    if isinstance(val, DualNumber):
-        return DualNumber(np.exp(val.real), np.exp(val.real) * val.dual)
-    elif isinstance(val, _supported_scalars):
+    if type(val) is DualNumber:
+        real = _exp(val.real)
+        return _dual(real, real * val.dual)
+    elif isinstance(val, _reals):
+        return _exp(val)
+    elif isinstance(val, _duals):
+        if isinstance(val, TaylorNumber):
+            return val.exp()
+        real = np.exp(val.real)
+        if isinstance(val, HyperDualNumber):
+            return val.chain(real, real, real)
+        return type(val)(real, real * val.dual)
+    elif isinstance(val, np.ndarray):
         return np.exp(val)
     else:
         raise TypeError(f"Unsupported type '{type(val)}'")
@@ -56,30 +141,43 @@ def log(val, base = None):
 
     Parameter
     ------
-    val : DualNumber, int or float
+    val : DualNumber, DualArray, HyperDualNumber, TaylorNumber, int, float or numpy.array
         value to compute the log
     base : int or float
         base value of log function, optional (default = None assumed natural e)
     """
-    if isinstance(val, DualNumber):
+    if type(val) is DualNumber:
         if val.real <= 0:
             raise ValueError(f"Should not be negative.")
-
         if base is None:
-            return DualNumber(np.log(val.real), 1 / val.real * val.dual)
-
-        real = np.log(val.real) / np.log(base)
-        dual = (1 / val.real / np.log(base)) * val.dual
-        return DualNumber(real, dual)
-    elif isinstance(val, _supported_scalars):
+            return _dual(math.log(val.real), 1 / val.real * val.dual)
+        return _dual(math.log(val.real) / math.log(base), 1 / val.real / math.log(base) * val.dual)
+    elif isinstance(val, _reals):
         if val <= 0:
             raise ValueError(f"Should not be negative.")
+        return math.log(val) if base is None else math.log(val) / math.log(base)
+    elif isinstance(val, _duals):
+        if np.any(val.real <= 0):
+            raise ValueError(f"Should not be negative.")
+
+        if isinstance(val, TaylorNumber):
+            return val.log() if base is None else val.log() * (1 / np.log(base))
+        scale = 1 if base is None else 1 / np.log(base)
+        if isinstance(val, HyperDualNumber):
+            return val.chain(np.log(val.real) * scale, scale / val.real, -scale / val.real ** 2)
+
+        if base is None:
+            return type(val)(np.log(val.real), 1 / val.real * val.dual)
+        return type(val)(np.log(val.real) / np.log(base), (1 / val.real / np.log(base)) * val.dual)
+    elif isinstance(val, np.ndarray):
+        if np.any(val <= 0):
+            raise ValueError(f"Should not be negative.")
 
         if base is None:
             return np.log(val)
 
         return np.log(val) / np.log(base)
-    else: 
+    else:
         raise TypeError(f"Unsupported type '{type(val)}'")
 
 
@@ -88,12 +186,21 @@ def sin(val):
 
     Parameter
     ------
-    val : DualNumber, int or float
+    val : DualNumber, DualArray, HyperDualNumber, TaylorNumber, int, float or numpy.array
         value to compute sine
     """
-    if isinstance(val, DualNumber):
-        return DualNumber(np.sin(val.real), np.cos(val.real) * val.dual)
-    elif isinstance(val, _supported_scalars):
+    if type(val) is DualNumber:
+        return _dual(_sin(val.real), _cos(val.real) * val.dual)
+    elif isinstance(val, _reals):
+        return _sin(val)
+    elif isinstance(val, _duals):
+        if isinstance(val, TaylorNumber):
+            return val.sin()
+        real = np.sin(val.real)
+        if isinstance(val, HyperDualNumber):
+            return val.chain(real, np.cos(val.real), -real)
+        return type(val)(real, np.cos(val.real) * val.dual)
+    elif isinstance(val, np.ndarray):
         return np.sin(val)
     else:
         raise TypeError(f"Unsupported type '{type(val)}'")
@@ -104,12 +211,21 @@ def cos(val):
 
     Parameter
     ------
-    val : DualNumber, int or float
+    val : DualNumber, DualArray, HyperDualNumber, TaylorNumber, int, float or numpy.array
         value to compute cosine
     """
-    if isinstance(val, DualNumber):
-        return DualNumber(np.cos(val.real), -np.sin(val.real) * val.dual)
-    elif isinstance(val, _supported_scalars):
+    if type(val) is DualNumber:
+        return _dual(_cos(val.real), -_sin(val.real) * val.dual)
+    elif isinstance(val, _reals):
+        return _cos(val)
+    elif isinstance(val, _duals):
+        if isinstance(val, TaylorNumber):
+            return val.cos()
+        real = np.cos(val.real)
+        if isinstance(val, HyperDualNumber):
+            return val.chain(real, -np.sin(val.real), -real)
+        return type(val)(real, -np.sin(val.real) * val.dual)
+    elif isinstance(val, np.ndarray):
         return np.cos(val)
     else:
         raise TypeError(f"Unsupported type '{type(val)}'")
@@ -120,18 +236,32 @@ def tan(val):
 
     Parameter
     ------
-    val : DualNumber, int or float
+    val : DualNumber, DualArray, HyperDualNumber, TaylorNumber, int, float or numpy.array
         value to compute tangent
     """
-    if isinstance(val, DualNumber):
+    if type(val) is DualNumber:
+        if val.real % math.pi == math.pi / 2:
+            raise ValueError('Tan is undefined in the given domain')
+        cos = _cos(val.real)
+        return _dual(_tan(val.real), 1 / (cos * cos) * val.dual)
+    elif isinstance(val, _reals):
+        if val % math.pi == math.pi / 2:
+            raise ValueError('Tan is undefined in the given domain')
+        return _tan(val)
+    elif isinstance(val, _duals):
         x = val.real % np.pi == (np.pi / 2)
-        if x:
+        if np.any(x):
             raise ValueError('Tan is undefined in the given domain')
 
-        return DualNumber(np.tan(val.real), 1 / (np.cos(val.real) ** 2) * val.dual)
-    elif isinstance(val, _supported_scalars):
-        x = val.real % np.pi == (np.pi / 2)
-        if x:
+        if isinstance(val, TaylorNumber):
+            return val.tan()
+        real, sec2 = np.tan(val.real), 1 / np.cos(val.real) ** 2
+        if isinstance(val, HyperDualNumber):
+            return val.chain(real, sec2, 2 * real * sec2)
+        return type(val)(real, sec2 * val.dual)
+    elif isinstance(val, np.ndarray):
+        x = val % np.pi == (np.pi / 2)
+        if np.any(x):
             raise ValueError('Tan is undefined in the given domain')
 
         return np.tan(val)
@@ -144,17 +274,31 @@ def arcsin(val):
 
     Parameter
     ------
-    val : DualNumber, int or float
+    val : DualNumber, DualArray, HyperDualNumber, TaylorNumber, int, float or numpy.array
         value to compute inverse sine
     """
-    if isinstance(val, DualNumber):
+    if type(val) is DualNumber:
         if abs(val.real) >= 1:
             raise ValueError(
                 'arcsin() cannot be evaluated at {}.'.format(val.real))
-        return DualNumber(np.arcsin(val.real), 1 / np.sqrt(1 - val.real ** 2) * val.dual)
-    elif isinstance(val, _supported_scalars):
+        return _dual(math.asin(val.real), 1 / math.sqrt(1 - val.real * val.real) * val.dual)
+    elif isinstance(val, _reals):
         if abs(val) >= 1:
             raise ValueError('arcsin() cannot be evaluated at {}.'.format(val))
+        return math.asin(val)
+    elif isinstance(val, _duals):
+        if np.any(abs(val.real) >= 1):
+            raise ValueError(
+                'arcsin() cannot be evaluated at {}.'.format(val.real))
+        if isinstance(val, TaylorNumber):
+            return val.arcsin()
+        first = 1 / np.sqrt(1 - val.real ** 2)
+        if isinstance(val, HyperDualNumber):
+            return val.chain(np.arcsin(val.real), first, val.real * first ** 3)
+        return type(val)(np.arcsin(val.real), first * val.dual)
+    elif isinstance(val, np.ndarray):
+        if np.any(abs(val) >= 1):
+            raise ValueError('arcsin() cannot be evaluated at {}.'.format(val))
         return np.arcsin(val)
     else:
         raise TypeError(f"Unsupported type '{type(val)}'")
@@ -165,17 +309,31 @@ def arccos(val):
 
     Parameter
     ------
-    val : DualNumber, int or float
+    val : DualNumber, DualArray, HyperDualNumber, TaylorNumber, int, float or numpy.array
         value to compute inverse cosine
     """
-    if isinstance(val, DualNumber):
+    if type(val) is DualNumber:
         if abs(val.real) >= 1:
             raise ValueError(
                 'arccos() cannot be evaluated at {}.'.format(val.real))
-        return DualNumber(np.arccos(val.real), -1 / np.sqrt(1 - val.real ** 2) * val.dual)
-    elif isinstance(val, _supported_scalars):
+        return _dual(math.acos(val.real), -1 / math.sqrt(1 - val.real * val.real) * val.dual)
+    elif isinstance(val, _reals):
         if abs(val) >= 1:
             raise ValueError('arccos() cannot be evaluated at {}.'.format(val))
+        return math.acos(val)
+    elif isinstance(val, _duals):
+        if np.any(abs(val.real) >= 1):
+            raise ValueError(
+                'arccos() cannot be evaluated at {}.'.format(val.real))
+        if isinstance(val, TaylorNumber):
+            return val.arccos()
+        first = -1 / np.sqrt(1 - val.real ** 2)
+        if isinstance(val, HyperDualNumber):
+            return val.chain(np.arccos(val.real), first, val.real * first ** 3)
+        return type(val)(np.arccos(val.real), first * val.dual)
+    elif isinstance(val, np.ndarray):
+        if np.any(abs(val) >= 1):
+            raise ValueError('arccos() cannot be evaluated at {}.'.format(val))
         return np.arccos(val)
     else:
         raise TypeError(f"Unsupported type '{type(val)}'")
@@ -186,12 +344,21 @@ def arctan(val):
 
     Parameter
     ------
-    val : DualNumber, int or float
+    val : DualNumber, DualArray, HyperDualNumber, TaylorNumber, int, float or numpy.array
         value to compute inverse tangent
     """
-    if isinstance(val, DualNumber):
-        return DualNumber(np.arctan(val.real), 1 / (1 + val.real ** 2) * val.dual)
-    elif isinstance(val, _supported_scalars):
+    if type(val) is DualNumber:
+        return _dual(math.atan(val.real), 1 / (1 + val.real * val.real) * val.dual)
+    elif isinstance(val, _reals):
+        return math.atan(val)
+    elif isinstance(val, _duals):
+        if isinstance(val, TaylorNumber):
+            return val.arctan()
+        first = 1 / (1 + val.real ** 2)
+        if isinstance(val, HyperDualNumber):
+            return val.chain(np.arctan(val.real), first, -2 * val.real * first ** 2)
+        return type(val)(np.arctan(val.real), first * val.dual)
+    elif isinstance(val, np.ndarray):
         return np.arctan(val)
     else:
         raise TypeError(f"Unsupported type '{type(val)}'")
@@ -202,12 +369,21 @@ def sinh(val):
 
     Parameter
     ------
-    val : DualNumber, int or float
+    val : DualNumber, DualArray, HyperDualNumber, TaylorNumber, int, float or numpy.array
         value to compute hyerbolic sine
     """
-    if isinstance(val, DualNumber):
-        return DualNumber(np.sinh(val.real), np.cosh(val.real) * val.dual)
-    elif isinstance(val, _supported_scalars):
+    if type(val) is DualNumber:
+        return _dual(_sinh(val.real), _cosh(val.real) * val.dual)
+    elif isinstance(val, _reals):
+        return _sinh(val)
+    elif isinstance(val, _duals):
+        if isinstance(val, TaylorNumber):
+            return val.sinh()
+        real = np.sinh(val.real)
+        if isinstance(val, HyperDualNumber):
+            return val.chain(real, np.cosh(val.real), real)
+        return type(val)(real, np.cosh(val.real) * val.dual)
+    elif isinstance(val, np.ndarray):
         return np.sinh(val)
     else:
         raise TypeError(f"Unsupported type '{type(val)}'")
@@ -218,12 +394,21 @@ def cosh(val):
 
     Parameter
     ------
-    val : DualNumber, int or float
+    val : DualNumber, DualArray, HyperDualNumber, TaylorNumber, int, float or numpy.array
         value to compute hyerbolic cosine
     """
-    if isinstance(val, DualNumber):
-        return DualNumber(np.cosh(val.real), np.sinh(val.real) * val.dual)
-    elif isinstance(val, _supported_scalars):
+    if type(val) is DualNumber:
+        return _dual(_cosh(val.real), _sinh(val.real) * val.dual)
+    elif isinstance(val, _reals):
+        return _cosh(val)
+    elif isinstance(val, _duals):
+        if isinstance(val, TaylorNumber):
+            return val.cosh()
+        real = np.cosh(val.real)
+        if isinstance(val, HyperDualNumber):
+            return val.chain(real, np.sinh(val.real), real)
+        return type(val)(real, np.sinh(val.real) * val.dual)
+    elif isinstance(val, np.ndarray):
         return np.cosh(val)
     else:
         raise TypeError(f"Unsupported type '{type(val)}'")
@@ -234,12 +419,23 @@ def tanh(val):
 
     Parameter
     ------
-    val : DualNumber, int or float
+    val : DualNumber, DualArray, HyperDualNumber, TaylorNumber, int, float or numpy.array
         value to compute hyerbolic tangent
     """
-    if isinstance(val, DualNumber):
-        return DualNumber(np.tanh(val.real), (1 - (np.tanh(val.real) ** 2)) * val.dual)
-    elif isinstance(val, _supported_scalars):
+    if type(val) is DualNumber:
+        real = math.tanh(val.real)
+        return _dual(real, (1 - real * real) * val.dual)
+    elif isinstance(val, _reals):
+        return math.tanh(val)
+    elif isinstance(val, _duals):
+        if isinstance(val, TaylorNumber):
+            return val.tanh()
+        real = np.tanh(val.real)
+        first = 1 - real ** 2
+        if isinstance(val, HyperDualNumber):
+            return val.chain(real, first, -2 * real * first)
+        return type(val)(real, first * val.dual)
+    elif isinstance(val, np.ndarray):
         return np.tanh(val)
     else:
         raise TypeError(f"Unsupported type '{type(val)}'")
@@ -250,7 +446,7 @@ def logistic(val, L = 1, k = 1, x_0 = 0):
 
     Parameter
     ------
-    val : DualNumber, int or float
+    val : DualNumber, DualArray, HyperDualNumber, TaylorNumber, int, float or numpy.array
         value to compute the logistic
     L : int or float, optional (default = 1)
         the supremum of the values of the function
@@ -259,11 +455,20 @@ def logistic(val, L = 1, k = 1, x_0 = 0):
     x_0 : int or float, optional (default = 0)
         the x value of the sigmoid's midpoint
     """
-    if isinstance(val, DualNumber):
+    if type(val) is DualNumber:
+        real = L / (1 + _exp(-k * (val.real - x_0)))
+        return _dual(real, k * real * (1 - real / L) * val.dual)
+    elif isinstance(val, _reals):
+        return L / (1 + _exp(-k * (val - x_0)))
+    elif isinstance(val, TaylorNumber):
+        return L / (1 + (-k * (val - x_0)).exp())
+    elif isinstance(val, _duals):
         real = L / (1 + np.exp(-k * (val.real - x_0) ) )
-        dual = k * real * (1 - real / L) * val.dual
-        return DualNumber(real, dual)
-    elif isinstance(val, _supported_scalars):
-        return L / (1 + np.exp(-k * (val.real - x_0) ) )
+        first = k * real * (1 - real / L)
+        if isinstance(val, HyperDualNumber):
+            return val.chain(real, first, k * first * (1 - 2 * real / L))
+        return type(val)(real, first * val.dual)
+    elif isinstance(val, np.ndarray):
+        return L / (1 + np.exp(-k * (val - x_0) ) )
     else:
-        raise TypeError(f"Unsupported type '{type(val)}'")
\ No newline at end of file
+        raise TypeError(f"Unsupported type '{type(val)}'")
@@ -0,0 +1,704 @@
+"""Expression graphs shared by the forward and reverse mode AD engines.
+
+Function strings are parsed once into an `ExpressionGraph`: a directed acyclic graph
+of variables, constants and the operations supported by `elementary.py` and `Node`,
+stored in topological order. Nodes are hash-consed, so a subterm shared by several
+functions (or repeated within one) is stored, and hence evaluated, only once. While the
+graph is built, constant subterms are folded and identities such as `x * 1`, `x + 0` or
+`x ** 1` are removed, so neither engine records them. Both AD engines evaluate this
+graph directly with their own rules for each operation.
+"""
+
+import ast
+import operator
+import numpy as np
+from functools import lru_cache
+
+from . import cache, elementary
+
+
+# elementary functions that may be called in function strings
+ELEM_FUNCS = ('sqrt', 'exp', 'log', 'sin', 'cos', 'tan', 'arcsin', 'arccos',
+              'arctan', 'sinh', 'cosh', 'tanh', 'logistic')
+
+# arithmetic operations and the Python operators they are evaluated with
+ARITHMETIC = {'add': operator.add, 'sub': operator.sub, 'mul': operator.mul,
+              'truediv': operator.truediv, 'pow': operator.pow,
+              'neg': operator.neg, 'abs': operator.abs}
+
+# NumPy ufuncs and the operators implementing them, as (method, reflected method)
+UFUNC_OPERATORS = {np.add: ('__add__', '__radd__'), np.subtract: ('__sub__', '__rsub__'),
+                   np.multiply: ('__mul__', '__rmul__'), np.true_divide: ('__truediv__', '__rtruediv__'),
+                   np.power: ('__pow__', '__rpow__'), np.negative: ('__neg__', None),
+                   np.absolute: ('__abs__', None), np.equal: ('__eq__', '__eq__'),
+                   np.not_equal: ('__ne__', '__ne__'), np.less: ('__lt__', '__gt__'),
+                   np.greater: ('__gt__', '__lt__'), np.less_equal: ('__le__', '__ge__'),
+                   np.greater_equal: ('__ge__', '__le__')}
+
+# module prefixes under which the elementary functions may be called, e.g. 'np.sin(x)'
+_MODULES = ('np', 'numpy')
+
+_BINOPS = {ast.Add: 'add', ast.Sub: 'sub', ast.Mult: 'mul', ast.Div: 'truediv', ast.Pow: 'pow'}
+
+# operations whose operands can be reordered, so that e.g. 'x * y' and 'y * x' share a node
+_COMMUTATIVE = ('add', 'mul')
+
+# rules folding operations on constants, matching the forward mode evaluation of scalars
+_FOLD = {**ARITHMETIC, **{f: getattr(elementary, f) for f in ELEM_FUNCS}}
+
+# keyword parameters (and defaults) of the elementary functions taking more than one argument
+_SIGNATURES = {'log': (('val', None), ('base', None)),
+               'logistic': (('val', None), ('L', 1), ('k', 1), ('x_0', 0))}
+
+
+class ExprNode:
+    """A node of an expression graph.
+
+    Attributes
+    ------
+    op : str
+        'var' for a variable, 'const' for a constant, or the name of the operation
+        (a key of ARITHMETIC or one of ELEM_FUNCS).
+    args : tuple of int
+        positions of the operands in the graph.
+    value : str, int, float or None
+        the variable name for 'var' nodes, the number for 'const' nodes and None otherwise.
+    """
+
+    __slots__ = ('op', 'args', 'value')
+
+    def __init__(self, op, args = (), value = None):
+        self.op = op
+        self.args = args
+        self.value = value
+
+    def __repr__(self):
+        """Returns a representation of the ExprNode instance.
+
+        Returns
+        ------
+        str
+            a representation of the ExprNode instance.
+        """
+        if self.op in ('var', 'const'):
+            return f"ExprNode({self.op!r}, value={self.value!r})"
+        return f"ExprNode({self.op!r}, args={self.args})"
+
+
+class Expression:
+    """A function string parsed once into an abstract syntax tree.
+
+    Attributes
+    ------
+    func : str
+        the function encoded as a string.
+    tree : ast.AST
+        the parsed body of the function.
+
+    Examples
+    ------
+    >>> f = Expression('x**2 + y')
+    >>> f.variables
+    ['x', 'y']
+    """
+
+    def __init__(self, func):
+        """
+        Parameters
+        ------
+        func : str
+            the function encoded as a string.
+
+        Raises
+        ------
+        TypeError
+            if func is not a string.
+        SyntaxError
+            if func is not a valid Python expression.
+        """
+        if not isinstance(func, str):
+            raise TypeError("func_list should be a string or a list of strings.")
+        self.func = func
+        self.tree = ast.parse(func.strip(), mode = "eval").body
+
+    def __repr__(self):
+        """Returns a representation of the Expression instance.
+
+        Returns
+        ------
+        str
+            a representation of the Expression instance.
+        """
+        return f"Expression({self.func!r})"
+
+    @property
+    def variables(self):
+        """Names of the variables of the function in order of appearance."""
+        return ExpressionGraph([self]).var_names
+
+
+class ExpressionGraph:
+    """A directed acyclic graph of (a list of) parsed function(s).
+
+    Equal subterms are merged into a single node across all functions (hash-consing).
+
+    Attributes
+    ------
+    func_list : list of str
+        the functions encoded as strings.
+    nodes : list of ExprNode
+        the nodes of the graph in topological order.
+    outputs : list of int
+        positions of the nodes computing each function.
+    var_names : list of str
+        names of the variables in order of appearance.
+
+    Examples
+    ------
+    >>> g = ExpressionGraph([Expression('x * y'), Expression('-x + 1')])
+    >>> g.evaluate({'x': 2, 'y': 3}, ARITHMETIC)
+    [6, -1]
+    """
+
+    def __init__(self, exprs):
+        """
+        Parameters
+        ------
+        exprs : list of Expression
+            the parsed functions.
+
+        Raises
+        ------
+        ValueError
+            if a function uses an operation that is not supported.
+        NameError
+            if a function calls an unknown function.
+        """
+        self.func_list = [expr.func for expr in exprs]
+        self.nodes = []
+        self.var_names = []
+        self._index = {}
+        self._cones = {}
+        self._deps = None
+        self.outputs = [self._build(expr.tree) for expr in exprs]
+        self._prune()
+
+    def __repr__(self):
+        """Returns a representation of the ExpressionGraph instance.
+
+        Returns
+        ------
+        str
+            a representation of the ExpressionGraph instance.
+        """
+        return f"ExpressionGraph({self.func_list})"
+
+    def __len__(self):
+        """Returns the number of nodes in the graph."""
+        return len(self.nodes)
+
+    def _add(self, op, args = (), value = None):
+        """Returns the position of a node, appending it to the graph unless an equal node exists."""
+        if op not in ('var', 'const'):
+            simplified = self._simplify(op, args)
+            if simplified is not None:
+                return simplified
+        if op in _COMMUTATIVE:
+            args = tuple(sorted(args))
+        key = (op, args, type(value), value)
+        if key not in self._index:
+            if op == 'var':
+                self.var_names.append(value)
+            self.nodes.append(ExprNode(op, args, value))
+            self._index[key] = len(self.nodes) - 1
+        return self._index[key]
+
+    def _const(self, i):
+        """Returns the value of the node at position i if it is a constant, and None otherwise."""
+        node = self.nodes[i]
+        return node.value if node.op == 'const' else None
+
+    def _simplify(self, op, args):
+        """Folds constants and removes identities.
+
+        Returns
+        ------
+        int or None
+            the position of a node equivalent to the operation, or None if it cannot be simplified.
+        """
+        consts = [self._const(a) for a in args]
+        if None not in consts:
+            try:
+                value = _FOLD[op](*consts)
+            except (ArithmeticError, ValueError, TypeError):
+                return None  # leave the error to be raised when the function is evaluated
+            if isinstance(value, float):
+                return self._add('const', value = float(value))
+            if isinstance(value, int):
+                return self._add('const', value = value)
+            return None
+
+        if op == 'neg' and self.nodes[args[0]].op == 'neg':  # -(-x)
+            return self.nodes[args[0]].args[0]
+        if len(args) != 2:
+            return None
+
+        (a, b), (ca, cb) = args, consts
+        if op == 'add':
+            if ca == 0:
+                return b
+            if cb == 0:
+                return a
+        elif op == 'sub':
+            if a == b:
+                return self._add('const', value = 0)
+            if cb == 0:
+                return a
+            if ca == 0:
+                return self._add('neg', (b,))
+        elif op == 'mul':
+            if ca == 0 or cb == 0:
+                return self._add('const', value = 0)
+            if ca == 1:
+                return b
+            if cb == 1:
+                return a
+            if ca == -1:
+                return self._add('neg', (b,))
+            if cb == -1:
+                return self._add('neg', (a,))
+        elif op == 'truediv':
+            if cb == 1:
+                return a
+        elif op == 'pow':
+            if cb == 0:
+                return self._add('const', value = 1)
+            if cb == 1:
+                return a
+        return None
+
+    def _prune(self):
+        """Removes nodes that no function depends on, e.g. the branches of 'x * 0'."""
+        live = self.cone(range(len(self.outputs)))
+        if len(live) == len(self.nodes):
+            return
+        position = {i: k for k, i in enumerate(live)}
+        nodes = [self.nodes[i] for i in live]
+        for node in nodes:
+            node.args = tuple(position[a] for a in node.args)
+        self.nodes = nodes
+        self.outputs = [position[i] for i in self.outputs]
+        self.var_names = [node.value for node in nodes if node.op == 'var']
+        self._index = {key: position[i] for key, i in self._index.items() if i in position}
+        self._cones = {}
+        self._deps = None
+
+    def _build(self, tree):
+        """Adds the nodes of an abstract syntax tree and returns the position of its root.
+
+        The tree is walked in postorder with an explicit stack rather than by recursion, so
+        expressions of any depth, e.g. sums of thousands of terms, are supported.
+        """
+        positions = []  # positions of the operands built so far
+        stack = [tree]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, tuple):  # an operation whose operands are built
+                op, n = item
+                args = tuple(positions[len(positions) - n:])
+                del positions[len(positions) - n:]
+                positions.append(args[0] if op is None else self._add(op, args))
+                continue
+            op, operands, value = self._operation(item)
+            if op in ('var', 'const'):
+                positions.append(self._add(op, value = value))
+            else:
+                stack.append((op, len(operands)))
+                stack.extend(reversed(operands))  # the left operand is built first
+        return positions[0]
+
+    def _operation(self, tree):
+        """Returns the operation of the root of an abstract syntax tree.
+
+        Returns
+        ------
+        tuple
+            the operation, its operands as syntax trees and the value of a 'var' or 'const'
+            node. The operation is None for a unary plus, which is its operand.
+        """
+        if isinstance(tree, ast.Name):
+            return 'var', (), tree.id
+
+        if isinstance(tree, ast.Constant):
+            if type(tree.value) not in (int, float):
+                raise ValueError(f"Unsupported constant {tree.value!r}.")
+            return 'const', (), tree.value
+
+        if isinstance(tree, ast.UnaryOp):
+            if isinstance(tree.op, ast.UAdd):
+                return None, (tree.operand,), None
+            if isinstance(tree.op, ast.USub):
+                return 'neg', (tree.operand,), None
+
+        if isinstance(tree, ast.BinOp) and type(tree.op) in _BINOPS:
+            return _BINOPS[type(tree.op)], (tree.left, tree.right), None
+
+        if isinstance(tree, ast.Call) and isinstance(tree.func, ast.Attribute) \
+                and isinstance(tree.func.value, ast.Name) and tree.func.value.id in _MODULES:
+            # NumPy's elementary functions, e.g. 'np.sin(x)', are the built-in ones
+            name = 'abs' if tree.func.attr in ('abs', 'absolute') else tree.func.attr
+            if (name not in ELEM_FUNCS and name != 'abs') or name == 'logistic':
+                raise NameError(f"name '{ast.unparse(tree.func)}' is not defined")
+            if len(tree.args) != 1 or tree.keywords:
+                raise TypeError(f"Invalid arguments to {ast.unparse(tree.func)}().")
+            tree = ast.Call(ast.Name(name), tree.args, [])
+
+        if isinstance(tree, ast.Call) and isinstance(tree.func, ast.Name):
+            name = tree.func.id
+            if name not in ELEM_FUNCS and name != 'abs':
+                raise NameError(f"name '{name}' is not defined")
+            params = _SIGNATURES.get(name, (('val', None),))
+
+            args = list(tree.args)
+            keywords = {kw.arg: kw.value for kw in tree.keywords}
+            if len(args) > len(params) or any(kw not in dict(params) for kw in keywords):
+                raise TypeError(f"Invalid arguments to {name}().")
+            # normalize keyword arguments into positional ones, filling in skipped defaults
+            for param, default in params[len(args):]:
+                if not keywords:
+                    break
+                args.append(keywords.pop(param) if param in keywords else ast.Constant(default))
+            if keywords:
+                raise TypeError(f"Invalid arguments to {name}().")
+            return name, tuple(args), None
+
+        raise ValueError(f"Unsupported expression '{ast.unparse(tree)}'.")
+
+    def dependencies(self):
+        """Returns the variables each node structurally depends on.
+
+        Returns
+        ------
+        list of int
+            for every node, a bit mask whose k-th bit is set if the node depends on var_names[k].
+        """
+        if self._deps is None:
+            bit = {var_name: 1 << k for k, var_name in enumerate(self.var_names)}
+            deps = []
+            for node in self.nodes:
+                mask = bit[node.value] if node.op == 'var' else 0
+                for a in node.args:
+                    mask |= deps[a]
+                deps.append(mask)
+            self._deps = deps
+        return self._deps
+
+    def var_mask(self, var_names):
+        """Returns the bit mask of the given variables, as used by dependencies().
+
+        Parameter
+        ------
+        var_names : list of str
+            names of variables; names the graph does not use are ignored.
+
+        Returns
+        ------
+        int
+            the bit mask.
+        """
+        mask = 0
+        for k, var_name in enumerate(self.var_names):
+            if var_name in var_names:
+                mask |= 1 << k
+        return mask
+
+    def dependents(self, var_names = None):
+        """Returns the functions depending on each variable.
+
+        Parameter
+        ------
+        var_names : list of str, optional (default = None, the graph's var_names)
+            names of the variables.
+
+        Returns
+        ------
+        dict
+            a mapping of each variable name to the sorted indices of the functions depending on it.
+        """
+        if var_names is None:
+            var_names = self.var_names
+        pattern = self.sparsity(var_names)
+        return {var_name: np.flatnonzero(pattern[:, j]).tolist() for j, var_name in enumerate(var_names)}
+
+    def sparsity(self, var_names = None):
+        """Returns the structural sparsity pattern of the Jacobian.
+
+        Parameter
+        ------
+        var_names : list of str, optional (default = None, the graph's var_names)
+            the variable ordering of the Jacobian's columns.
+
+        Returns
+        ------
+        numpy.array
+            a boolean array whose (i, j) entry is False if function i does not depend on
+            variable j, i.e. the corresponding partial derivative is structurally zero.
+        """
+        if var_names is None:
+            var_names = self.var_names
+        column = {var_name: j for j, var_name in enumerate(var_names)}
+        columns = [column.get(var_name) for var_name in self.var_names]
+
+        deps = self.dependencies()
+        pattern = np.zeros((len(self.outputs), len(var_names)), dtype = bool)
+        for i, o in enumerate(self.outputs):
+            mask = deps[o]
+            while mask:
+                k = (mask & -mask).bit_length() - 1
+                if columns[k] is not None:
+                    pattern[i, columns[k]] = True
+                mask &= mask - 1
+        return pattern
+
+    def cone(self, outputs):
+        """Returns positions of the nodes needed to compute the given functions.
+
+        Parameter
+        ------
+        outputs : tuple of int
+            indices of the functions in func_list.
+
+        Returns
+        ------
+        list of int
+            positions of the needed nodes in topological order.
+
+        Notes
+        ------
+        The cones of single functions and of all functions are memoized. Graphs are shared
+        through compile_graph(), so the cones of other subsets, e.g. those recomputed by
+        update(), are not kept, which would grow the graph without bound.
+        """
+        outputs = tuple(outputs)
+        if outputs in self._cones:
+            return self._cones[outputs]
+        needed = set()
+        stack = [self.outputs[j] for j in outputs]
+        while stack:
+            i = stack.pop()
+            if i not in needed:
+                needed.add(i)
+                stack.extend(self.nodes[i].args)
+        cone = sorted(needed)
+        if len(outputs) == 1 or outputs == tuple(range(len(self.outputs))):
+            self._cones[outputs] = cone
+        return cone
+
+    def trace(self, inputs, rules, outputs = None, known = None):
+        """Evaluates every node needed by the given functions.
+
+        Parameters
+        ------
+        inputs : dict
+            a mapping of variable names to the values they take, e.g. DualNumber or Node objects.
+        rules : dict
+            a mapping of operation names to the callables evaluating them.
+        outputs : list of int, optional (default = None, all functions)
+            indices of the functions to evaluate.
+        known : dict, optional (default = None)
+            a mapping of node positions to values that are still valid and are reused
+            instead of being evaluated again.
+
+        Returns
+        ------
+        dict
+            a mapping of node positions to their values.
+
+        Raises
+        ------
+        NameError
+            if a variable of the evaluated functions is missing from inputs.
+        """
+        nodes = self.nodes
+        order = range(len(nodes)) if outputs is None else self.cone(outputs)
+
+        values = dict(known) if known else {}
+        for i in order:
+            if i in values:
+                continue
+            node = nodes[i]
+            if node.op == 'var':
+                try:
+                    values[i] = inputs[node.value]
+                except KeyError:
+                    raise NameError(f"name '{node.value}' is not defined") from None
+            elif node.op == 'const':
+                values[i] = node.value
+            else:
+                values[i] = rules[node.op](*[values[a] for a in node.args])
+        return values
+
+    def evaluate(self, inputs, rules, outputs = None):
+        """Evaluates the given functions.
+
+        Parameters
+        ------
+        inputs : dict
+            a mapping of variable names to the values they take, e.g. DualNumber or Node objects.
+        rules : dict
+            a mapping of operation names to the callables evaluating them.
+        outputs : list of int, optional (default = None, all functions)
+            indices of the functions to evaluate.
+
+        Returns
+        ------
+        list
+            the values of the evaluated functions.
+
+        Raises
+        ------
+        NameError
+            if a variable of the evaluated functions is missing from inputs.
+        """
+        values = self.trace(inputs, rules, outputs)
+        if outputs is None:
+            return [values[i] for i in self.outputs]
+        return [values[self.outputs[j]] for j in outputs]
+
+
+def apply_ufunc(cls, functions, ufunc, method, inputs, kwargs):
+    """Applies a NumPy ufunc to operands of which at least one is of an AD type.
+
+    Arithmetic ufuncs (e.g. np.add) are mapped to the operators of the AD type and the
+    elementary ones (e.g. np.sin) to the functions of the same name.
+
+    Parameters
+    ------
+    cls : type
+        the AD type overriding the ufunc, e.g. DualNumber or Node.
+    functions : module or type
+        provides the elementary functions of the AD type by name, e.g. `elementary` or Node.
+    ufunc : numpy.ufunc
+        the ufunc called.
+    method : str
+        how the ufunc was called; only '__call__' is supported.
+    inputs : tuple
+        the operands.
+    kwargs : dict
+        keyword arguments of the call; none are supported.
+
+    Returns
+    ------
+    object
+        the result, or NotImplemented if the ufunc or the way it was called is not supported.
+    """
+    if method != '__call__' or kwargs:
+        return NotImplemented
+    inputs = [x.item() if isinstance(x, np.generic) else x for x in inputs]
+    if ufunc in UFUNC_OPERATORS:
+        op, rop = UFUNC_OPERATORS[ufunc]
+        if isinstance(inputs[0], cls):
+            return getattr(inputs[0], op)(*inputs[1:])
+        return getattr(inputs[1], rop)(inputs[0])
+    if ufunc.__name__ in ELEM_FUNCS and len(inputs) == 1:
+        return getattr(functions, ufunc.__name__)(inputs[0])
+    return NotImplemented
+
+
+@lru_cache(maxsize = None)
+def compile_func(func):
+    """Returns the parsed Expression of a function string.
+
+    Function strings are parsed only once per process: calling this function again
+    with the same string returns the cached Expression.
+
+    Parameter
+    ------
+    func : str
+        the function encoded as a string.
+
+    Returns
+    ------
+    Expression
+        the parsed function.
+    """
+    return Expression(func)
+
+
+def compile_func_list(func_list):
+    """Parses (a list of) function(s) encoded as string(s).
+
+    Parameter
+    ------
+    func_list : str, Expression, or list of str or Expression
+        (a list of) function(s) to parse.
+
+    Returns
+    ------
+    list of Expression
+        the parsed functions in the given order.
+
+    Raises
+    ------
+    TypeError
+        if func_list is not a string, an Expression or a list of them.
+    """
+    if not isinstance(func_list, list):
+        func_list = [func_list]
+
+    exprs = []
+    for f in func_list:
+        if isinstance(f, Expression):
+            exprs.append(f)
+        elif isinstance(f, str):
+            exprs.append(compile_func(f))
+        else:
+            raise TypeError("func_list should be a string or a list of strings.")
+    return exprs
+
+
+@lru_cache(maxsize = 128)
+def _compile_graph(funcs):
+    key = cache.cache_key('graph', funcs)
+    graph = cache.load('graph', key)
+    if graph is None:
+        graph = ExpressionGraph(compile_func_list(list(funcs)))
+        cache.store('graph', key, graph)
+    return graph
+
+
+def compile_graph(func_list):
+    """Returns the ExpressionGraph of (a list of) function(s).
+
+    Graphs are cached in memory, so engines constructed repeatedly for the same functions
+    at different points reuse the same graph. If the persistent cache is enabled (see
+    `cache.set_cache_dir()`), graphs are also stored on disk and reused by other processes
+    without parsing the functions again.
+
+    Parameter
+    ------
+    func_list : str, Expression, or list of str or Expression
+        (a list of) function(s) to parse.
+
+    Returns
+    ------
+    ExpressionGraph
+        the graph of the functions.
+
+    Raises
+    ------
+    TypeError
+        if func_list is not a string, an Expression or a list of them.
+    """
+    if not isinstance(func_list, list):
+        func_list = [func_list]
+
+    funcs = []
+    for f in func_list:
+        if isinstance(f, Expression):
+            funcs.append(f.func)
+        elif isinstance(f, str):
+            funcs.append(f)
+        else:
+            raise TypeError("func_list should be a string or a list of strings.")
+    return _compile_graph(tuple(funcs))
@@ -1,8 +1,158 @@
 import numpy as np
 
 from team20ad.elementary import *
+from team20ad.dualNumber import SparseTangent
+from team20ad.expression import ARITHMETIC, compile_graph
 
 
+# rules evaluating the operations of an expression graph on DualNumber objects
+_RULES = {**ARITHMETIC, 'sqrt': sqrt, 'exp': exp, 'log': log, 'sin': sin, 'cos': cos, 'tan': tan,
+          'arcsin': arcsin, 'arccos': arccos, 'arctan': arctan,
+          'sinh': sinh, 'cosh': cosh, 'tanh': tanh, 'logistic': logistic}
+
+# number of tangent entries (nodes times chunk size) a pass may hold with the default chunk size
+_TANGENT_BUDGET = 2 ** 22
+
+
+def _jvp(graph, var_dict, v):
+    """Evaluates an expression graph with the variables seeded along the direction(s) v.
+
+    See jvp() for the parameters and the return values.
+    """
+    var_names = list(var_dict)
+    if isinstance(v, dict):
+        for var_name in v:
+            if var_name not in var_dict:
+                raise KeyError(f"Unknown variable '{var_name}'.")
+        v = [v.get(var_name, 0.) for var_name in var_names]
+    directions = np.asarray(v, dtype = float)
+    if directions.ndim not in (1, 2) or len(directions) != len(var_names):
+        raise ValueError("v should have one entry (or one row of a batch) per variable.")
+    batch = directions.shape[1:]
+
+    points = np.broadcast_shapes(*(np.shape(x) for x in var_dict.values()))
+    inputs = {var_name: np.asarray(x, dtype = float) if points else x for var_name, x in var_dict.items()}
+
+    # variables with no component along any direction stay plain scalars
+    for i, var_name in enumerate(var_names):
+        if not directions[i].any():
+            continue
+        if points:
+            inputs[var_name] = DualArray(np.broadcast_to(inputs[var_name], points),
+                                         np.multiply.outer(directions[i], np.ones(points)))
+        else:
+            inputs[var_name] = DualNumber(var_dict[var_name], directions[i] if batch else float(directions[i]))
+
+    func_evals = []
+    Jv = np.zeros((len(graph.outputs), *batch, *points))
+    for j, val in enumerate(graph.evaluate(inputs, _RULES)):
+        if isinstance(val, (DualNumber, DualArray)):
+            func_evals.append(val.real)
+            Jv[j] = val.dual
+        else:
+            func_evals.append(np.full(points, val) if points else val)
+    return func_evals, Jv
+
+
+def jvp(var_dict, func_list, v):
+    """Computes the function values and the Jacobian-vector product J v in a single forward pass.
+
+    The dual parts of the variables are seeded with the components of v, so the Jacobian
+    itself is never formed. A batch of k directions is propagated as vector tangents of
+    length k, still in a single pass.
+
+    Parameters
+    ------
+    var_dict : dict
+        a dictionary of variables and their corresponding values; values may be arrays
+        of points (see ForwardAD).
+    func_list : str, Expression, or list of str or Expression
+        (a list of) function(s) encoded as string(s) or compiled Expression(s).
+    v : dict or array-like
+        the direction, either by variable (missing variables are 0) or as a sequence in
+        the order of var_dict. For a batch of k directions, each variable has a sequence
+        of k components, i.e. v is an array of shape (n, k).
+
+    Returns
+    ------
+    list
+        the evaluation of function(s).
+    numpy.array
+        J v, of shape (m,), or (m, k) for a batch of directions; for arrays of points, the
+        axes of the points follow.
+
+    Raises
+    ------
+    KeyError
+        if v has a variable that is not in var_dict.
+    ValueError
+        if v does not have one entry per variable.
+
+    Examples
+    ------
+    >>> func_evals, Jv = jvp({'x': 1, 'y': 2}, ['x * y', 'exp(x)'], {'x': 1, 'y': 1})
+    >>> Jv
+    array([3.        , 2.71828183])
+    >>> func_evals, JV = jvp({'x': 1, 'y': 2}, ['x * y', 'exp(x)'], [[1, 0], [0, 1]])
+    >>> JV
+    array([[2.        , 1.        ],
+           [2.71828183, 0.        ]])
+    """
+    if not isinstance(var_dict, dict):
+        raise TypeError("var_dict should be a dictionary.")
+    return _jvp(compile_graph(func_list), var_dict, v)
+
+
+def sparse_jacobian(var_dict, func_list):
+    """Computes the function values and the sparse rows of the Jacobian in a single forward pass.
+
+    Each variable is seeded with a DualNumber whose dual part is a SparseTangent holding
+    a single entry, so intermediates only carry the partials of the variables they depend
+    on. This suits models with many variables where each function depends on a few of
+    them: no dense vector with one entry per variable is allocated.
+
+    Parameters
+    ------
+    var_dict : dict
+        a dictionary of variables and their corresponding values.
+    func_list : str, Expression, or list of str or Expression
+        (a list of) function(s) encoded as string(s) or compiled Expression(s).
+
+    Returns
+    ------
+    list
+        the evaluation of function(s).
+    list of SparseTangent
+        the rows of the Jacobian, indexed by the position of the variables in var_dict;
+        `row.indices` and `row.values` give the structurally nonzero entries, and
+        `row.toarray(len(var_dict))` the dense row.
+
+    Examples
+    ------
+    >>> func_evals, rows = sparse_jacobian({'x': 1, 'y': 2, 'z': 3}, ['x * y', 'exp(z)'])
+    >>> rows[0]
+    SparseTangent({0: 2.0, 1: 1.0})
+    >>> rows[1].indices
+    array([2])
+    """
+    if not isinstance(var_dict, dict):
+        raise TypeError("var_dict should be a dictionary.")
+    graph = compile_graph(func_list)
+    # NumPy scalars, e.g. np.int64, are converted to the Python scalars DualNumber supports
+    inputs = {var_name: DualNumber(var_value.item() if isinstance(var_value, np.generic) else var_value,
+                                   SparseTangent({i: 1.}))
+              for i, (var_name, var_value) in enumerate(var_dict.items())}
+
+    func_evals, rows = [], []
+    for val in graph.evaluate(inputs, _RULES):
+        if isinstance(val, DualNumber):
+            func_evals.append(val.real)
+            rows.append(val.dual)
+        else:
+            func_evals.append(val)
+            rows.append(SparseTangent())
+    return func_evals, rows
+
 
 class ForwardAD:
     """Forward Mode Automatic Differentiation.
@@ -10,16 +160,27 @@ class ForwardAD:
     Parameters
     ------
     var_dict: dict
-        a dictionary of variables and their corresponding values
-    func_list: str or list of str
-        (a list of) function(s) encoded as string(s)
+        a dictionary of variables and their corresponding values; values may be arrays
+        of points, which are all differentiated in one pass (see DualArray)
+    func_list: str, Expression, or list of str or Expression
+        (a list of) function(s) encoded as string(s) or compiled Expression(s)
+    chunk_size: int, optional (default = None)
+        the number of variables seeded per pass. Larger chunks mean fewer passes but
+        longer tangent vectors. By default all variables are seeded in one pass, unless
+        the tangents would exceed about 2**22 entries (32 MB).
 
     Attributes
     ------
     func_evals: numpy.array
         the evaluation of function(s) at the given point 
     Dpf: numpy.array
-        derivatives of function(s) evaluated at the given point
+        derivatives of function(s) evaluated at the given point; for arrays of points,
+        derivatives are indexed by function, variable, then point
+    sparsity: numpy.array
+        the structural sparsity pattern of Dpf; a pass only evaluates the functions that
+        depend on the variables it seeds
+    chunk_size: int
+        the number of variables seeded per pass
 
     Examples
     --------
@@ -49,53 +210,147 @@ class ForwardAD:
      [7.3890561 7.3890561]]
     """
 
-    def __init__(self, var_dict, func_list):
+    def __init__(self, var_dict, func_list, chunk_size = None):
         # type checks
         if not isinstance(var_dict, dict):
             raise TypeError("var_dict should be a dictionary.")
+        if chunk_size is not None:
+            if not isinstance(chunk_size, int):
+                raise TypeError("chunk_size should be an integer.")
+            if chunk_size < 1:
+                raise ValueError("chunk_size should be positive.")
 
-        if isinstance(func_list, list):
-            for f in func_list:
-                if not isinstance(f, str):
-                    raise TypeError("func_list should be a string or a list of strings.")
-        elif not isinstance(func_list, str):
-            raise TypeError("func_list should be a string or a list of strings.")
+        # function strings are parsed once into a graph cached across instances
+        self.graph = compile_graph(func_list)
 
         # var inits
-        elem_funcs = ['sqrt', 'exp', 'log', 'sin', 'cos', 'tan',
-                      'arcsin', 'arccos', 'arctan', 'sinh', 'cosh', 'tanh']
         self.var_dict = var_dict
+        self.func_list = self.graph.func_list
 
-        if isinstance(func_list, list):
-            self.func_list = func_list
-        else:
-            self.func_list = [func_list]
+        # arrays of points are broadcast against each other and evaluated as DualArrays
+        self._points = np.broadcast_shapes(*(np.shape(v) for v in var_dict.values()))
+        if self._points:
+            self.var_dict = {var_name: np.asarray(var_value, dtype = float)
+                             for var_name, var_value in var_dict.items()}
+
+        if chunk_size is None:
+            chunk_size = min(len(var_dict), _TANGENT_BUDGET // max(len(self.graph) * int(np.prod(self._points)), 1))
+        self.chunk_size = max(chunk_size, 1)
+
+        # functions are only differentiated with respect to the variables they depend on
+        self.sparsity = self.graph.sparsity(list(self.var_dict))
+        self._dependents = self.graph.dependents(list(var_dict))  # variable -> functions
+
+        self.func_evals = [None] * len(self.func_list)
+        self.Dpf = np.zeros((len(self.func_list), len(self.var_dict), *self._points))
+        self._values = {}  # the trace, kept for update() when there is a single chunk
+        self._evaluate(range(len(self.func_list)))
+
+    def _evaluate(self, outputs, changed = ()):
+        """Computes the values and the rows of Dpf of the given functions.
+
+        The variables are seeded chunk_size at a time with DualNumbers whose dual parts are
+        the rows of the identity matrix, so one pass yields the columns of Dpf of a whole
+        chunk. Variables outside the chunk are plain scalars.
 
-        vars = list(self.var_dict.keys())
+        Parameters
+        ------
+        outputs : list of int
+            indices of the functions to evaluate.
+        changed : list of str, optional (default = (), all variables)
+            the variables that changed since the last evaluation; with a single chunk,
+            subterms that do not depend on them keep their previous values.
+        """
+        outputs = list(outputs)
+        if not outputs:
+            return
 
-        self.func_evals = []
-        self.Dpf = np.zeros((len(self.func_list), len(self.var_dict)))
-        i = 0  # a helper counter to determine which partial deriv to take
+        var_names = list(self.var_dict)
+        single = self.chunk_size >= len(var_names)
+        known = None
+        if changed and single:
+            stale = self.graph.var_mask(changed)
+            deps = self.graph.dependencies()
+            known = {i: v for i, v in self._values.items() if not deps[i] & stale}
 
-        for _ in self.var_dict:
-            for var in self.var_dict:
-                if var == vars[i]:
-                    dual = 1
+        for start in range(0, len(var_names), self.chunk_size):
+            chunk = var_names[start:start + self.chunk_size]
+            columns = slice(start, start + len(chunk))
+            rows = [j for j in outputs if self.sparsity[j, columns].any()]
+            if not rows:
+                continue  # structurally zero
+
+            seeds = np.eye(len(chunk))
+            inputs = dict(self.var_dict)
+            for k, var_name in enumerate(chunk):
+                if self._points:
+                    seed = np.multiply.outer(seeds[k], np.ones(self._points))
+                    inputs[var_name] = DualArray(np.broadcast_to(self.var_dict[var_name], self._points), seed)
+                else:
+                    inputs[var_name] = DualNumber(self.var_dict[var_name], seeds[k])
+            values = self.graph.trace(inputs, _RULES, rows, known)
+            if single:
+                self._values.update(values)
+
+            for j in rows:
+                val = values[self.graph.outputs[j]]
+                if isinstance(val, (DualNumber, DualArray)):
+                    self.func_evals[j], self.Dpf[j, columns] = val.real, val.dual
                 else:
-                    dual = 0
-                exec(f"{var} = DualNumber({self.var_dict[var]}, {dual})")
+                    self.func_evals[j], self.Dpf[j, columns] = val, 0.
+
+        # functions depending on no variable
+        constant = [j for j in outputs if not self.sparsity[j].any()]
+        for j, val in zip(constant, self.graph.evaluate(self.var_dict, _RULES, constant)):
+            self.func_evals[j] = np.full(self._points, val) if self._points else val
+
+    def update(self, **changed_vars):
+        """Re-evaluates at a point where only the given variables changed.
+
+        Only the functions depending on a changed variable are evaluated again, and only
+        their subterms depending on a changed variable; everything else is reused.
+
+        Parameters
+        ------
+        changed_vars : int or float
+            new values of variables, passed as keyword arguments.
+
+        Raises
+        ------
+        KeyError
+            if a variable is not in var_dict.
 
-            for j in range(0, len(self.func_list)):
-                for f in elem_funcs:
-                    func = self.func_list[j]
-                    if f in self.func_list[j]:
-                        break
-                self.func_evals.append(eval(func).real)  # primal trace
-                self.Dpf[j, i] = eval(func).dual  # tangent trace
+        Examples
+        ------
+        >>> ad = ForwardAD({'x': 1, 'y': 2}, ['x * y', 'exp(y)'])
+        >>> ad.update(x = 3)
+        >>> ad.func_evals
+        [6, 7.38905609893065]
+        """
+        for var_name in changed_vars:
+            if var_name not in self.var_dict:
+                raise KeyError(f"Unknown variable '{var_name}'.")
+        self.var_dict = {**self.var_dict, **changed_vars}
 
-            i += 1
+        outputs = sorted({j for var_name in changed_vars for j in self._dependents[var_name]})
+        self._evaluate(outputs, list(changed_vars))
 
-        self.func_evals = self.func_evals[:len(self.func_list)]
+    def jvp(self, v):
+        """Computes the Jacobian-vector product J v at the current point in a single pass.
+
+        Parameters
+        ------
+        v : dict or array-like
+            the direction, or a batch of directions (see jvp()).
+
+        Returns
+        ------
+        list
+            the evaluation of function(s).
+        numpy.array
+            J v, of shape (m,), or (m, k) for a batch of k directions.
+        """
+        return _jvp(self.graph, self.var_dict, v)
 
     def __call__(self):
         out = "===== Forward AD =====\n"
@@ -106,3 +361,188 @@ class ForwardAD:
         out += f"Gradient:\n"
         out += f"{self.Dpf}"
         print(out)
+
+
+class HessianAD:
+    """Second derivatives in forward mode with hyper-dual numbers.
+
+    For each pair of variables x_i, x_j with i <= j, x_i is seeded along e1 and x_j along
+    e2 (see HyperDualNumber), so one pass yields the (i, j) entry of the Hessian of every
+    function. The (j, i) entry is the same by symmetry, so only the n (n + 1) / 2 passes of
+    the upper triangle are run, and a pass is skipped when no function depends on both
+    variables. The diagonal passes also yield the gradient.
+
+    Parameters
+    ------
+    var_dict: dict
+        a dictionary of variables and their corresponding values
+    func_list: str, Expression, or list of str or Expression
+        (a list of) function(s) encoded as string(s) or compiled Expression(s)
+
+    Attributes
+    ------
+    func_evals: list
+        the evaluation of function(s) at the given point
+    Dpf: numpy.array
+        derivatives of function(s) evaluated at the given point
+    Hpf: numpy.array
+        second derivatives of function(s) evaluated at the given point, indexed by
+        function, variable, then variable
+    sparsity: numpy.array
+        the structural sparsity pattern of Dpf
+
+    Examples
+    --------
+    >>> ad = HessianAD({'x': 1, 'y': 2}, ['x**2 * y', 'exp(x)'])
+    >>> ad()
+    ===== Hessian AD =====
+    Vars: {'x': 1, 'y': 2}
+    Funcs: ['x**2 * y', 'exp(x)']
+    -----
+    Func evals: [2, 2.718281828459045]
+    Gradient:
+    [[4.         1.        ]
+     [2.71828183 0.        ]]
+    Hessian:
+    [[[4.         2.        ]
+      [2.         0.        ]]
+    <BLANKLINE>
+     [[2.71828183 0.        ]
+      [0.         0.        ]]]
+    """
+
+    def __init__(self, var_dict, func_list):
+        # type checks
+        if not isinstance(var_dict, dict):
+            raise TypeError("var_dict should be a dictionary.")
+
+        self.graph = compile_graph(func_list)
+        self.var_dict = var_dict
+        self.func_list = self.graph.func_list
+        self.sparsity = self.graph.sparsity(list(var_dict))
+
+        var_names = list(var_dict)
+        self.func_evals = self.graph.evaluate(var_dict, _RULES)
+        self.Dpf = np.zeros((len(self.func_list), len(var_names)))
+        self.Hpf = np.zeros((len(self.func_list), len(var_names), len(var_names)))
+
+        for i, x_i in enumerate(var_names):
+            for j in range(i, len(var_names)):
+                x_j = var_names[j]
+                rows = [k for k in range(len(self.func_list)) if self.sparsity[k, i] and self.sparsity[k, j]]
+                if not rows:
+                    continue  # structurally zero
+
+                inputs = dict(var_dict)
+                if i == j:
+                    inputs[x_i] = HyperDualNumber(var_dict[x_i], 1., 1.)
+                else:
+                    inputs[x_i] = HyperDualNumber(var_dict[x_i], 1., 0.)
+                    inputs[x_j] = HyperDualNumber(var_dict[x_j], 0., 1.)
+                values = self.graph.trace(inputs, _RULES, rows)
+
+                for k in rows:
+                    val = values[self.graph.outputs[k]]
+                    if not isinstance(val, HyperDualNumber):
+                        continue
+                    self.Hpf[k, i, j] = self.Hpf[k, j, i] = val.eps1eps2
+                    if i == j:
+                        self.Dpf[k, i] = val.eps1
+
+    def __call__(self):
+        out = "===== Hessian AD =====\n"
+        out += f"Vars: {self.var_dict}\n"
+        out += f"Funcs: {self.func_list}\n"
+        out += "-----\n"
+        out += f"Func evals: {self.func_evals}\n"
+        out += f"Gradient:\n{self.Dpf}\n"
+        out += f"Hessian:\n{self.Hpf}"
+        print(out)
+
+
+class TaylorAD:
+    """Derivatives of arbitrary order along a direction in forward mode with Taylor polynomials.
+
+    Each variable x_i is seeded with the truncated Taylor polynomial x_i + v_i t (see
+    TaylorNumber), so one pass yields the derivatives d^k/dt^k f(x + t v) at t = 0 of every
+    function for k = 0, ..., order, at a cost of O(order**2) per operation.
+
+    Parameters
+    ------
+    var_dict: dict
+        a dictionary of variables and their corresponding values
+    func_list: str, Expression, or list of str or Expression
+        (a list of) function(s) encoded as string(s) or compiled Expression(s)
+    direction: dict
+        the components v_i of the direction, by variable; missing variables are 0
+    order: int, optional (default = 2)
+        the highest order of the derivatives
+
+    Attributes
+    ------
+    func_evals: list
+        the evaluation of function(s) at the given point
+    coeffs: numpy.array
+        the Taylor coefficients of function(s) along the direction, indexed by function,
+        then order
+    derivatives: numpy.array
+        the derivatives of function(s) along the direction, indexed by function, then
+        order; column 0 holds the function values
+
+    Examples
+    --------
+    >>> ad = TaylorAD({'x': 0, 'y': 1}, ['sin(x) * y', 'exp(x + y)'], {'x': 1}, order = 4)
+    >>> ad()
+    ===== Taylor AD =====
+    Vars: {'x': 0, 'y': 1}
+    Funcs: ['sin(x) * y', 'exp(x + y)']
+    Direction: {'x': 1}
+    -----
+    Func evals: [0.0, 2.718281828459045]
+    Derivatives:
+    [[ 0.          1.          0.         -1.          0.        ]
+     [ 2.71828183  2.71828183  2.71828183  2.71828183  2.71828183]]
+    """
+
+    def __init__(self, var_dict, func_list, direction, order = 2):
+        # type checks
+        if not isinstance(var_dict, dict):
+            raise TypeError("var_dict should be a dictionary.")
+        if not isinstance(direction, dict):
+            raise TypeError("direction should be a dictionary.")
+        for var_name in direction:
+            if var_name not in var_dict:
+                raise KeyError(f"Unknown variable '{var_name}'.")
+        if not isinstance(order, int) or order < 1:
+            raise ValueError("order should be a positive integer.")
+
+        self.graph = compile_graph(func_list)
+        self.var_dict = var_dict
+        self.func_list = self.graph.func_list
+        self.direction = direction
+        self.order = order
+
+        # variables with no component along the direction stay plain scalars
+        inputs = dict(var_dict)
+        for var_name, component in direction.items():
+            if component:
+                inputs[var_name] = TaylorNumber.variable(var_dict[var_name], component, order)
+
+        self.coeffs = np.zeros((len(self.func_list), order + 1))
+        for j, val in enumerate(self.graph.evaluate(inputs, _RULES)):
+            if isinstance(val, TaylorNumber):
+                self.coeffs[j] = val.coeffs
+            else:
+                self.coeffs[j, 0] = val
+        self.func_evals = self.coeffs[:, 0].tolist()
+        self.derivatives = self.coeffs * np.cumprod(np.maximum(np.arange(order + 1), 1))
+
+    def __call__(self):
+        out = "===== Taylor AD =====\n"
+        out += f"Vars: {self.var_dict}\n"
+        out += f"Funcs: {self.func_list}\n"
+        out += f"Direction: {self.direction}\n"
+        out += "-----\n"
+        out += f"Func evals: {self.func_evals}\n"
+        out += f"Derivatives:\n{self.derivatives}"
+        print(out)
@@ -0,0 +1,426 @@
+import numpy as np
+
+
+class HyperDualNumber:
+    """A hyper-dual number class supporting exact second derivatives in forward mode.
+
+    A hyper-dual number a + b e1 + c e2 + d e1e2 has two nilpotent parts e1 and e2
+    (e1**2 = e2**2 = 0, e1e2 != 0). Seeding the variable x_i along e1 and x_j along e2,
+    the e1e2 part of f is the second derivative of f with respect to x_i and x_j, and
+    its e1 and e2 parts are the first derivatives with respect to x_i and x_j.
+
+    Attributes
+    ------
+    _supported_scalars : tuple
+        A tuple containing types of objects that are supported by the
+        hyper-dual number operations.
+    real : int or float
+        The value of user defined function(s) 'f' evaluated at point 'x'.
+    eps1 : int or float
+        The derivative of 'f' along the direction seeded in e1.
+    eps2 : int or float
+        The derivative of 'f' along the direction seeded in e2.
+    eps1eps2 : int or float
+        The second derivative of 'f' along the directions seeded in e1 and e2.
+
+    Examples
+    ------
+    >>> x = HyperDualNumber(3., 1., 1.)
+    >>> x * x * x
+    HyperDualNumber(27.0, 27.0, 27.0, 18.0)
+    """
+
+    __slots__ = ('real', 'eps1', 'eps2', 'eps1eps2')
+
+    _supported_scalars = (int, float)
+
+    # NumPy scalars defer to the reflected operators instead of building object arrays
+    __array_ufunc__ = None
+
+    def __init__(self, real, eps1 = 0., eps2 = 0., eps1eps2 = 0.):
+        """
+        Parameters
+        ------
+        real : int or float
+            The value of user defined function(s) 'f' evaluated at point 'x'.
+        eps1 : int or float, optional (default = 0.)
+            The derivative along the direction seeded in e1.
+        eps2 : int or float, optional (default = 0.)
+            The derivative along the direction seeded in e2.
+        eps1eps2 : int or float, optional (default = 0.)
+            The second derivative along the directions seeded in e1 and e2.
+
+        Raises
+        ------
+        TypeError
+            if an argument value is of unsupported type.
+        """
+        if not isinstance(real, self._supported_scalars):
+            raise TypeError(f"Supported scalars: {self._supported_scalars}")
+        self.real = real
+        self.eps1 = eps1
+        self.eps2 = eps2
+        self.eps1eps2 = eps1eps2
+
+    def __repr__(self):
+        """Returns a representation of the HyperDualNumber instance.
+
+        Returns
+        ------
+        str
+            a representation of the HyperDualNumber instance.
+        """
+        return f"HyperDualNumber({self.real}, {self.eps1}, {self.eps2}, {self.eps1eps2})"
+
+    def __str__(self):
+        """Returns a string representation of the HyperDualNumber instance.
+
+        Returns
+        ------
+        str
+            a string representation of the HyperDualNumber instance.
+        """
+        return (f"HyperDualNumber: real = {self.real}, eps1 = {self.eps1}, "
+                f"eps2 = {self.eps2}, eps1eps2 = {self.eps1eps2}")
+
+    def chain(self, value, first, second):
+        """Applies a scalar function, given its value and derivatives at the real part.
+
+        f(a + b e1 + c e2 + d e1e2) = f(a) + f'(a) b e1 + f'(a) c e2 + (f'(a) d + f''(a) b c) e1e2,
+        which is how the functions of elementary.py are evaluated on hyper-dual numbers.
+
+        Parameters
+        ------
+        value : int or float
+            f(real).
+        first : int or float
+            f'(real).
+        second : int or float
+            f''(real).
+
+        Returns
+        ------
+        HyperDualNumber
+            f applied to the HyperDualNumber instance.
+        """
+        return HyperDualNumber(value, first * self.eps1, first * self.eps2,
+                               first * self.eps1eps2 + second * self.eps1 * self.eps2)
+
+    def _coerce(self, other):
+        """Returns another operand as a HyperDualNumber.
+
+        Raises
+        ------
+        TypeError
+            if the operand is of unsupported type.
+        """
+        if isinstance(other, HyperDualNumber):
+            return other
+        if isinstance(other, self._supported_scalars):
+            return HyperDualNumber(other)
+        raise TypeError(f"Unsupported type '{type(other)}'")
+
+    def _reciprocal(self):
+        """Returns 1 / the HyperDualNumber instance.
+
+        Raises
+        ------
+        ZeroDivisionError
+            if the real part is zero.
+        """
+        if self.real == 0:
+            raise ZeroDivisionError("Cannot divide by zero.")
+        return self.chain(1 / self.real, -1 / self.real ** 2, 2 / self.real ** 3)
+
+    def __neg__(self):
+        """Returns the negation of the HyperDualNumber instance.
+
+        Returns
+        ------
+        HyperDualNumber
+            the negation of all parts of the HyperDualNumber instance.
+        """
+        return HyperDualNumber(-self.real, -self.eps1, -self.eps2, -self.eps1eps2)
+
+    def __add__(self, other):
+        """Returns the sum of the HyperDualNumber instance and another given instance of supported type.
+
+        Parameter
+        ------
+        other : HyperDualNumber, int, or float
+            the instance to compute the sum with.
+
+        Returns
+        ------
+        HyperDualNumber
+            the sum of the two instances.
+        """
+        other = self._coerce(other)
+        return HyperDualNumber(self.real + other.real, self.eps1 + other.eps1,
+                               self.eps2 + other.eps2, self.eps1eps2 + other.eps1eps2)
+
+    def __radd__(self, other):
+        """Returns the sum of a scalar object and the HyperDualNumber instance.
+
+        Parameter
+        ------
+        other : int, or float
+            a scalar object to compute the sum with.
+
+        Returns
+        ------
+        HyperDualNumber
+            the sum of the two instances.
+        """
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        """Returns the substraction of the HyperDualNumber instance and another given instance of supported type.
+
+        Parameter
+        ------
+        other : HyperDualNumber, int, or float
+            the instance to subtract.
+
+        Returns
+        ------
+        HyperDualNumber
+            the substraction of the two instances.
+        """
+        return self.__add__(-self._coerce(other))
+
+    def __rsub__(self, other):
+        """Returns the substraction of a scalar object and the HyperDualNumber instance.
+
+        Parameter
+        ------
+        other : int, or float
+            a scalar object to be subtracted from.
+
+        Returns
+        ------
+        HyperDualNumber
+            the substraction of the two instances.
+        """
+        return (-self).__add__(other)
+
+    def __mul__(self, other):
+        """Returns the product of the HyperDualNumber instance and another given instance of supported type.
+
+        Parameter
+        ------
+        other : HyperDualNumber, int, or float
+            the instance to compute the product with.
+
+        Returns
+        ------
+        HyperDualNumber
+            the product of the two instances.
+        """
+        other = self._coerce(other)
+        return HyperDualNumber(self.real * other.real,
+                               self.real * other.eps1 + self.eps1 * other.real,
+                               self.real * other.eps2 + self.eps2 * other.real,
+                               self.real * other.eps1eps2 + self.eps1 * other.eps2
+                               + self.eps2 * other.eps1 + self.eps1eps2 * other.real)
+
+    def __rmul__(self, other):
+        """Returns the product of a scalar object and the HyperDualNumber instance.
+
+        Parameter
+        ------
+        other : int, or float
+            a scalar object to compute the product with.
+
+        Returns
+        ------
+        HyperDualNumber
+            the product of the two instances.
+        """
+        return self.__mul__(other)
+
+    def __truediv__(self, other):
+        """Returns the division of the HyperDualNumber instance and another given instance of supported type.
+
+        Parameter
+        ------
+        other : HyperDualNumber, int, or float
+            the instance to divide by.
+
+        Returns
+        ------
+        HyperDualNumber
+            the division of the two instances.
+        """
+        return self.__mul__(self._coerce(other)._reciprocal())
+
+    def __rtruediv__(self, other):
+        """Returns the division of a scalar object and the HyperDualNumber instance.
+
+        Parameter
+        ------
+        other : int, or float
+            the instance to be divided.
+
+        Returns
+        ------
+        HyperDualNumber
+            the division of the two instances.
+        """
+        return self._reciprocal().__mul__(other)
+
+    def __pow__(self, other):
+        """Returns the HyperDualNumber instance raised to the power of another given instance of supported type.
+
+        As for DualNumber, a HyperDualNumber exponent only contributes to the derivatives
+        when the base is positive.
+
+        Parameter
+        ------
+        other : HyperDualNumber, int, or float
+            the exponent.
+
+        Returns
+        ------
+        HyperDualNumber
+            the result of the power operation on the given instances.
+        """
+        other = self._coerce(other)
+        if other.eps1 or other.eps2 or other.eps1eps2:
+            if self.real > 0:
+                log = self.chain(np.log(self.real), 1 / self.real, -1 / self.real ** 2)
+                exponent = log * other
+                value = self.real ** other.real
+                return exponent.chain(value, value, value)
+
+        n = other.real
+        first = n * self.real ** (n - 1) if n != 0 else 0
+        second = n * (n - 1) * self.real ** (n - 2) if n not in (0, 1) else 0
+        return self.chain(self.real ** n, first, second)
+
+    def __rpow__(self, other):
+        """Returns a scalar object raised to the power of the HyperDualNumber instance.
+
+        Parameter
+        ------
+        other : int, or float
+            the base.
+
+        Returns
+        ------
+        HyperDualNumber
+            the result of the power operation on the given instances.
+
+        Raises
+        ------
+        ValueError
+            if the base is negative.
+        """
+        if not isinstance(other, self._supported_scalars):
+            raise TypeError(f"Unsupported type '{type(other)}'")
+        if other < 0:
+            raise ValueError(f"Unsupported value '{other}'")
+        value = other ** self.real
+        return self.chain(value, np.log(other) * value, np.log(other) ** 2 * value)
+
+    def __eq__(self, other):
+        """Compares two objects if they are equal, including all parts.
+
+        Parameter
+        ------
+        other : HyperDualNumber, int, or float
+            The object to compare with.
+
+        Returns
+        ------
+        bool
+            True if the two instances are equal; and False, otherwise.
+        """
+        other = self._coerce(other)
+        return bool(self.real == other.real and self.eps1 == other.eps1
+                    and self.eps2 == other.eps2 and self.eps1eps2 == other.eps1eps2)
+
+    def __ne__(self, other):
+        """Compares two objects if they are not equal.
+
+        Parameter
+        ------
+        other : HyperDualNumber, int, or float
+            The object to compare with.
+
+        Returns
+        ------
+        bool
+            True if the two instances are not equal; and False, otherwise.
+        """
+        return not self.__eq__(other)
+
+    def __lt__(self, other):
+        """Compares the real parts of two objects.
+
+        Parameter
+        ------
+        other : HyperDualNumber, int, or float
+            The object to compare with.
+
+        Returns
+        ------
+        bool
+            True if less than the given object; and False, otherwise.
+        """
+        return self.real < self._coerce(other).real
+
+    def __gt__(self, other):
+        """Compares the real parts of two objects.
+
+        Parameter
+        ------
+        other : HyperDualNumber, int, or float
+            The object to compare with.
+
+        Returns
+        ------
+        bool
+            True if greater than the given object; and False, otherwise.
+        """
+        return self.real > self._coerce(other).real
+
+    def __le__(self, other):
+        """Compares the real parts of two objects.
+
+        Parameter
+        ------
+        other : HyperDualNumber, int, or float
+            The object to compare with.
+
+        Returns
+        ------
+        bool
+            True if less than or equal to the given object; and False, otherwise.
+        """
+        return self.real <= self._coerce(other).real
+
+    def __ge__(self, other):
+        """Compares the real parts of two objects.
+
+        Parameter
+        ------
+        other : HyperDualNumber, int, or float
+            The object to compare with.
+
+        Returns
+        ------
+        bool
+            True if greater than or equal to the given object; and False, otherwise.
+        """
+        return self.real >= self._coerce(other).real
+
+    def __abs__(self):
+        """Returns the absolute value of the HyperDualNumber instance.
+
+        Returns
+        ------
+        HyperDualNumber
+            the absolute value, whose derivatives are scaled by the sign of the real part.
+        """
+        return self.chain(abs(self.real), np.sign(self.real), 0.)
@@ -1,7 +1,81 @@
 import numpy as np
-import re
 
-from .elementary import *
+from .expression import ARITHMETIC, apply_ufunc, compile_graph
+
+def _vjp(graph, var_dict, u):
+    """Evaluates an expression graph and sweeps it once with the outputs seeded with u.
+
+    See vjp() for the parameters and the return values.
+    """
+    seeds = np.asarray(u, dtype = float)
+    if seeds.ndim not in (1, 2) or seeds.shape[-1] != len(graph.outputs):
+        raise ValueError("u should have one entry (or one column of a batch) per function.")
+
+    inputs = {var_name: Node(float(var_value)) for var_name, var_value in var_dict.items()}
+    values = graph.trace(inputs, _RULES)
+    func_evals = [values[i].var if isinstance(values[i], Node) else float(values[i]) for i in graph.outputs]
+    nodes = list(inputs.values())
+
+    # functions that depend on no variable, or have no weight, are not swept
+    active = [j for j, i in enumerate(graph.outputs) if isinstance(values[i], Node) and seeds[..., j].any()]
+    order = graph.cone(active)
+
+    if seeds.ndim == 1:
+        weights = {}
+        for j in active:
+            weights[graph.outputs[j]] = weights.get(graph.outputs[j], 0.) + seeds[j]
+        adjoints = _adjoints(values, order, weights)
+        return func_evals, np.array([adjoints.get(id(node), 0.) for node in nodes])
+
+    adjoints = _adjoint_matrix(values, order, [graph.outputs[j] for j in active], seeds[:, active].T)
+    zero = np.zeros(len(seeds))
+    return func_evals, np.array([adjoints.get(id(node), zero) for node in nodes]).reshape(len(nodes), len(seeds)).T
+
+
+def vjp(var_dict, func_list, u):
+    """Computes the function values and the vector-Jacobian product u^T J in a single reverse sweep.
+
+    The adjoints of the outputs are seeded with the weights u, so the sweep accumulates
+    the gradient of the weighted sum of the functions and the Jacobian itself is never
+    formed. A batch of k weight vectors is swept at once, carrying k adjoints per Node.
+
+    Parameters
+    ------
+    var_dict : dict
+        a dictionary of variables and their corresponding values.
+    func_list : str, Expression, or list of str or Expression
+        (a list of) function(s) encoded as string(s) or compiled Expression(s).
+    u : array-like
+        the weights of the functions, in the order of func_list, or a batch of k weight
+        vectors as an array of shape (k, m).
+
+    Returns
+    ------
+    list
+        the evaluation of function(s).
+    numpy.array
+        u^T J, of shape (n,) with one entry per variable in the order of var_dict, or
+        (k, n) for a batch of weight vectors.
+
+    Raises
+    ------
+    ValueError
+        if u does not have one entry per function.
+
+    Examples
+    ------
+    >>> func_evals, uJ = vjp({'x': 1, 'y': 2}, ['x * y', 'exp(x)'], [1, 1])
+    >>> uJ
+    array([4.71828183, 1.        ])
+    >>> func_evals, UJ = vjp({'x': 1, 'y': 2}, ['x * y', 'exp(x)'], [[1, 0], [0, 1]])
+    >>> UJ
+    array([[2.        , 1.        ],
+           [2.71828183, 0.        ]])
+    """
+    if not isinstance(var_dict, dict):
+        raise TypeError("var_dict should be a dictionary.")
+    return _vjp(compile_graph(func_list), var_dict, u)
+
 
 class ReverseAD:
     """Reverse Mode Automatic Differentiation.
@@ -10,8 +84,8 @@ class ReverseAD:
     ------
     var_dict: dict
         a dictionary of variables and their corresponding values
-    func_list: str or list of str
-        (a list of) function(s) encoded as string(s)
+    func_list: str, Expression, or list of str or Expression
+        (a list of) function(s) encoded as string(s) or compiled Expression(s)
 
     Attributes
     ------
@@ -19,6 +93,9 @@ class ReverseAD:
         the evaluation of function(s) at the given point 
     Dpf: numpy.array
         derivatives of function(s) evaluated at the given point
+    sparsity: numpy.array
+        the structural sparsity pattern of Dpf; functions that depend on no variable
+        are not swept
 
     Examples
     --------
@@ -52,41 +129,106 @@ class ReverseAD:
         if not isinstance(var_dict, dict):
             raise TypeError("var_dict should be a dictionary.")
 
-        if isinstance(func_list, list):
-            for f in func_list:
-                if not isinstance(f, str):
-                    raise TypeError("func_list should be a string or a list of strings.")
-        elif not isinstance(func_list, str):
-            raise TypeError("func_list should be a string or a list of strings.")
-
-        if isinstance(func_list, list):
-            self.func_list = func_list
-        else: # if a single string, convert it to list
-            self.func_list = [func_list]
- 
-        self.func_evals = []
-        self.Dpf = []
+        # function strings are parsed once into a graph cached across instances
+        self.graph = compile_graph(func_list)
+        self.func_list = self.graph.func_list
+
         self.var_dict = var_dict
 
-        elem_funcs = ['sqrt', 'exp', 'log', 'sin', 'cos', 'tan',
-                      'arcsin', 'arccos', 'arctan', 'sinh', 'cosh', 'tanh']
+        # functions are only differentiated with respect to the variables they depend on
+        self.sparsity = self.graph.sparsity(list(var_dict))
+        self._dependents = self.graph.dependents(list(var_dict))  # variable -> functions
+
+        self.func_evals = [None] * len(self.func_list)
+        self.Dpf = np.zeros((len(self.func_list), len(var_dict)))
+        self._evaluate(range(len(self.func_list)))
 
-        for func in self.func_list:
-            for i in elem_funcs:
-                if i in func:
-                    func = re.sub(i + r'\(', 'Node.' + i + '(', func)
-                    func = re.sub('arcNode.', 'arc', func)
+    def _evaluate(self, outputs):
+        """Computes the values and the rows of Dpf of the given functions.
 
-            for var_name, var_value in var_dict.items():
-                exec(f'{var_name} = Node(float(var_value))')
-            vals = eval(func)
+        Parameter
+        ------
+        outputs : list of int
+            indices of the functions to evaluate.
+        """
+        outputs = list(outputs)
+        if not outputs:
+            return
+
+        # one forward trace shared by the functions, then the reverse sweeps
+        inputs = {var_name: Node(float(var_value)) for var_name, var_value in self.var_dict.items()}
+        values = self.graph.trace(inputs, _RULES, outputs)
+        nodes = list(inputs.values())
+
+        for j in outputs:
+            out = self.graph.outputs[j]
+            self.func_evals[j] = values[out].var if isinstance(values[out], Node) else float(values[out])
+
+        swept = [j for j in outputs if self.sparsity[j].any()]
+        if not swept:
+            return
+
+        # functions sharing most of their subterms are swept together, carrying a row of
+        # adjoints (one per function) through their union; the others are swept one by one
+        union = self.graph.cone(swept)
+        if len(swept) > 1 and sum(len(self.graph.cone([j])) for j in swept) > _BATCH_COST * len(union):
+            adjoints = _adjoint_matrix(values, union, [self.graph.outputs[j] for j in swept])
+            zero = np.zeros(len(swept))
+            self.Dpf[swept] = np.array([adjoints.get(id(node), zero) for node in nodes]).T
+            return
+
+        for j in swept:
+            columns = np.flatnonzero(self.sparsity[j])
+            adjoints = _adjoints(values, self.graph.cone([j]), {self.graph.outputs[j]: 1.})
+            self.Dpf[j, columns] = [adjoints.get(id(nodes[i]), 0.) for i in columns]
+
+    def update(self, **changed_vars):
+        """Re-evaluates at a point where only the given variables changed.
+
+        Only the functions depending on a changed variable are traced and swept again;
+        the other values and rows of Dpf are kept.
+
+        Parameters
+        ------
+        changed_vars : int or float
+            new values of variables, passed as keyword arguments.
 
-            value_keys = str(list(var_dict.keys())).replace('\'','')
-            v, d = eval(f'vals.g_derivatives({value_keys})')
+        Raises
+        ------
+        KeyError
+            if a variable is not in var_dict.
+
+        Examples
+        ------
+        >>> ad = ReverseAD({'x': 1, 'y': 2}, ['x * y', 'exp(y)'])
+        >>> ad.update(x = 3)
+        >>> ad.func_evals
+        [6.0, 7.38905609893065]
+        """
+        for var_name in changed_vars:
+            if var_name not in self.var_dict:
+                raise KeyError(f"Unknown variable '{var_name}'.")
+        self.var_dict = {**self.var_dict, **changed_vars}
 
-            self.func_evals.append(v)
-            self.Dpf.append(d)
-        self.Dpf = np.array(self.Dpf)
+        outputs = sorted({j for var_name in changed_vars for j in self._dependents[var_name]})
+        self._evaluate(outputs)
+
+    def vjp(self, u):
+        """Computes the vector-Jacobian product u^T J at the current point in a single sweep.
+
+        Parameters
+        ------
+        u : array-like
+            the weights of the functions, or a batch of weight vectors (see vjp()).
+
+        Returns
+        ------
+        list
+            the evaluation of function(s).
+        numpy.array
+            u^T J, of shape (n,), or (k, n) for a batch of k weight vectors.
+        """
+        return _vjp(self.graph, self.var_dict, u)
 
     def __call__(self):
         out = "===== Reverse AD =====\n"
@@ -154,6 +296,41 @@ class Node():
         return f"Node({self.var})"
         
 
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        """Evaluates NumPy ufuncs, e.g. np.sin(x) or np.multiply(x, y), by recording Nodes.
+
+        Arithmetic ufuncs are mapped to the operators of Node and elementary ones to its
+        static methods of the same name. Arrays of Nodes are evaluated element by element.
+
+        Returns
+        ------
+        Node, numpy.array
+            the result, or NotImplemented for unsupported ufuncs.
+        """
+        if any(isinstance(x, np.ndarray) for x in inputs):
+            elementwise = lambda *xs: apply_ufunc(Node, Node, ufunc, method, xs, kwargs)
+            inputs = [np.array(x, dtype = object) if isinstance(x, Node) else x for x in inputs]
+            return np.frompyfunc(elementwise, len(inputs), 1)(*inputs)
+        return apply_ufunc(Node, Node, ufunc, method, inputs, kwargs)
+
+
+    def __array_function__(self, func, types, args, kwargs):
+        """Evaluates np.sum, np.prod, np.mean and np.dot over Nodes (or sequences of them).
+
+        The Nodes are handled as an object array, whose elements are combined with the
+        operators of Node.
+
+        Returns
+        ------
+        Node, numpy.array
+            the result, or NotImplemented for other functions.
+        """
+        if func not in (np.sum, np.prod, np.mean, np.dot):
+            return NotImplemented
+        args = [np.asarray(x, dtype = object) if isinstance(x, (Node, list, tuple)) else x for x in args]
+        return func(*args, **kwargs)
+
+
     def g_derivatives(self, inputs):
         """
         Get derivatives for each variable in the function.
@@ -178,14 +355,36 @@ class Node():
             
 
     def partial(self):
-        """Computes derivative for a variable used in the function."""
+        """Computes derivative for a variable used in the function.
+
+        The adjoints of the Nodes depending on this one are accumulated in a single
+        iterative pass, children before parents, so the stack use does not grow with
+        the depth of the graph. Adjoints already computed are reused.
+        """
         if len(self.child) == 0:
             return 1
         if self.derivative is not None:
             return self.derivative
-        else:
-            self.derivative = sum([child.partial() * partial for child, partial in self.child])
-            return self.derivative
+
+        # order the Nodes whose adjoints are missing so that each follows its children,
+        # by a depth-first search with an explicit stack of child iterators
+        order, visited = [], {id(self)}
+        stack = [(self, iter(self.child))]
+        while stack:
+            node, children = stack[-1]
+            for child, _ in children:
+                if child.child and child.derivative is None and id(child) not in visited:
+                    visited.add(id(child))
+                    stack.append((child, iter(child.child)))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+
+        for node in order:
+            node.derivative = sum([(child.derivative if child.child else 1) * partial
+                                   for child, partial in node.child])
+        return self.derivative
 
 
     def __add__(self, other):
@@ -201,6 +400,8 @@ class Node():
         Node
             a new Node instance as a sum of the two instances.
         """
+        if isinstance(other, np.ndarray):
+            return NotImplemented  # evaluated elementwise by __array_ufunc__()
         try:
             new_add = Node(self.var + other.var)
             self.child.append((new_add, 1))
@@ -248,7 +449,20 @@ class Node():
         Node
             a new Node instance as a difference between the two instances.
         """
-        return self.__add__(-other)
+        if isinstance(other, np.ndarray):
+            return NotImplemented  # evaluated elementwise by __array_ufunc__()
+        try:
+            new_sub = Node(self.var - other.var)
+            self.child.append((new_sub, 1))
+            other.child.append((new_sub, -1))
+            return new_sub
+        except:
+            if isinstance(other, int) or isinstance(other, float):
+                new_sub = Node(self.var - other)
+                self.child.append((new_sub, 1))
+                return new_sub
+            else:
+                raise TypeError("Not real number")
 
 
     def __rsub__(self, other):
@@ -264,7 +478,12 @@ class Node():
         Node
             a new Node instance as a difference between the two instances.
         """
-        return (-self).__add__(other)
+        if isinstance(other, int) or isinstance(other, float):
+            new_sub = Node(other - self.var)
+            self.child.append((new_sub, -1))
+            return new_sub
+        else:
+            raise TypeError("Not real number")
 
 
     def __mul__(self, other):
@@ -280,6 +499,8 @@ class Node():
         Node
             a new Node instance as a product of the two instances.
         """
+        if isinstance(other, np.ndarray):
+            return NotImplemented  # evaluated elementwise by __array_ufunc__()
         try:
             new_mul = Node(other.var * self.var)
             self.child.append((new_mul, other.var))
@@ -327,15 +548,17 @@ class Node():
         Node
             a new Node instance as a division of the two instances.
         """
+        if isinstance(other, np.ndarray):
+            return NotImplemented  # evaluated elementwise by __array_ufunc__()
         try:
             new_div = Node(self.var / other.var)
-            self.child.append((new_div,((1 * other.var - 0 * self.var) / other.var**2)))
+            self.child.append((new_div, 1 / other.var))
             other.child.append((new_div, (-self.var/(other.var**2))))
             return new_div
         except AttributeError:
             if isinstance(other, int) or isinstance(other, float):
                 new_div = Node(self.var / other)
-                self.child.append((new_div,((1 * other - 0 * self.var) / other**2)))
+                self.child.append((new_div, 1 / other))
                 return new_div
             else:
                 raise TypeError(f"{other} is invalid.")
@@ -356,13 +579,13 @@ class Node():
         """
         try:
             new_div = Node(other.var / self.var)
-            self.child.append((new_div, ((0 * self.var - other.var * 1) / self.var**2)))
+            self.child.append((new_div, -other.var / self.var**2))
             other.child.append((new_div, 1/self.var))
             return new_div
         except:
             if isinstance(other, int) or isinstance(other, float):
                 new_div = Node(other / self.var)
-                self.child.append((new_div, ((0 * self.var - other * 1) / self.var**2)))
+                self.child.append((new_div, -other / self.var**2))
                 return new_div
             else:
                 raise TypeError(f"Input {other} is not valid.")
@@ -501,7 +724,7 @@ class Node():
             a new Node instance that has the absolute value
         """
         new_abs = Node(abs(self.var))
-        self.child.append((1, new_abs))
+        self.child.append((new_abs, np.sign(self.var)))
         return new_abs
 
 
@@ -518,6 +741,8 @@ class Node():
         Node
             the result of the exponential operation as a new Node instance.
         """
+        if isinstance(other, np.ndarray):
+            return NotImplemented  # evaluated elementwise by __array_ufunc__()
         try:
             new_val = Node(self.var ** other.var)
             self.child.append((new_val, (other.var) * self.var ** (other.var-1)))
@@ -564,6 +789,13 @@ class Node():
         base : Node, int or float
             base value of log function, optional (default = None assumed natural e)
         """
+        if isinstance(base, Node) and isinstance(var, (int, float)):
+            if var <= 0:
+                raise ValueError('Input must to be greater than 0.')
+            log_var = Node(np.log(var) / np.log(base.var))
+            base.child.append((log_var, -log_var.var / (base.var * np.log(base.var))))
+            return log_var
+
         try:
             if var.var <= 0:
                 raise ValueError('Input must to be greater than 0.')
@@ -572,11 +804,15 @@ class Node():
 
         if base is None:
             log_var = Node(np.log(var.var))
-            var.child.append((log_var, (1. / var.var) * 1))
+            var.child.append((log_var, 1. / var.var))
             return log_var
 
-        log_var = Node(np.log(var.var) / np.log(base.var))
-        var.child.append((log_var, (1 / var.var / np.log(base.var)) * 1))
+        log_base = np.log(getattr(base, 'var', base))
+        log_var = Node(np.log(var.var) / log_base)
+        var.child.append((log_var, 1 / var.var / log_base))
+        if isinstance(base, Node):
+            # d/db log(x) / log(b) = -log(x) / (b log(b)^2)
+            base.child.append((log_var, -log_var.var / (base.var * log_base)))
         return log_var
         
 
@@ -594,7 +830,7 @@ class Node():
         else:
             try:
                 sqrt_var = Node(var.var**(1/2))
-                var.child.append((sqrt_var, (1/2)*var.var**(-1/2)))
+                var.child.append((sqrt_var, (1/2)*var.var**(-1/2) if var.var else np.inf))
             except:
                 raise TypeError(f"Invalid input type.")
         return sqrt_var
@@ -614,8 +850,9 @@ class Node():
         exponential functions for other bases are handled by __pow__ in the Node class.
         """
         try:
-            new_val = Node(np.exp(var.var))
-            var.child.append((new_val, np.exp(var.var) * 1))
+            value = np.exp(var.var)
+            new_val = Node(value)
+            var.child.append((new_val, value))
             return new_val
         except:
             if not isinstance(var, int) and not isinstance(var, float):
@@ -635,7 +872,7 @@ class Node():
         """
         try:
             new_val = Node(np.sin(var.var))
-            var.child.append((new_val, 1 * np.cos(var.var)))
+            var.child.append((new_val, np.cos(var.var)))
             return new_val
         except:
             if not isinstance(var, int) and not isinstance(var, float):
@@ -655,7 +892,7 @@ class Node():
         """
         try:
             new_val = Node(np.cos(var.var))
-            var.child.append((new_val, 1 * -np.sin(var.var)))
+            var.child.append((new_val, -np.sin(var.var)))
             return new_val
         except:
             if not isinstance(var, int) and not isinstance(var, float):
@@ -675,7 +912,7 @@ class Node():
         """
         try:
             new_val = Node(np.tan(var.var))
-            var.child.append((new_val, 1 * 1 / np.power(np.cos(var.var), 2)))
+            var.child.append((new_val, 1 / np.power(np.cos(var.var), 2)))
             return new_val
         except:
             if not isinstance(var, int) and not isinstance(var, float):
@@ -698,7 +935,7 @@ class Node():
                 raise ValueError('Please input -1 <= x <=1')
             else:
                 new_val = Node(np.arcsin(var.var))
-                var.child.append((new_val, 1 / np.sqrt(1 - (var.var ** 2))))
+                var.child.append((new_val, 1 / np.sqrt(1 - (var.var ** 2)) if abs(var.var) != 1 else np.inf))
                 return new_val
         except:
             if not isinstance(var, int) and not isinstance(var, float):
@@ -723,7 +960,7 @@ class Node():
                 raise ValueError('Please input -1 <= x <=1')
             else:
                 new_val = Node(np.arccos(var.var))
-                var.child.append((new_val, -1 / np.sqrt(1 - (var.var ** 2))))
+                var.child.append((new_val, -1 / np.sqrt(1 - (var.var ** 2)) if abs(var.var) != 1 else -np.inf))
             return new_val
         except:
                 raise TypeError(f"Input {var} is not valid.")
@@ -740,7 +977,7 @@ class Node():
         """
         try:
             new_val = Node(np.arctan(var.var))
-            var.child.append((new_val, 1 * 1 / (1 + np.power(var.var, 2))))
+            var.child.append((new_val, 1 / (1 + np.power(var.var, 2))))
 
             return new_val
 
@@ -759,7 +996,7 @@ class Node():
         """
         try:
             new_val = Node(np.sinh(var.var))
-            var.child.append((new_val, 1 * np.cosh(var.var)))
+            var.child.append((new_val, np.cosh(var.var)))
             return new_val
 
         except AttributeError:
@@ -777,7 +1014,7 @@ class Node():
         """
         try:
             new_val = Node(np.cosh(var.var))
-            var.child.append((new_val, 1 * np.sinh(var.var)))
+            var.child.append((new_val, np.sinh(var.var)))
 
             return new_val
 
@@ -796,24 +1033,109 @@ class Node():
         """
         try:
             new_val = Node(np.tanh(var.var))
-            var.child.append((new_val, 1 * 1 / np.power(np.cosh(var.var), 2)))
+            var.child.append((new_val, 1 / np.power(np.cosh(var.var), 2)))
             return new_val
         except AttributeError:
             return np.tanh(var)
 
     @staticmethod
-    def logistic(var):
+    def logistic(var, L = 1, k = 1, x_0 = 0):
         """Logistic function supporting operations for reverse mode AD.
 
         Parameter
         ------
         var : Node, int or float
             value to compute the logistic
+        L : int or float, optional (default = 1)
+            the supremum of the values of the function
+        k : int or float, optional (default = 1)
+            the logistic growth rate or steepness of the curve
+        x_0 : int or float, optional (default = 0)
+            the x value of the sigmoid's midpoint
         """
+        if any(isinstance(param, Node) for param in (L, k, x_0)):
+            raise ValueError("The parameters of logistic() should not depend on the variables.")
         try:
-            logistic_var = Node(1 / (1 + np.exp(-var.var)))
-            var.child.append((logistic_var, 1 / (1 + np.exp(-var.var)) * (1-(1 / (1 + np.exp(-var.var)) * 1))))
+            value = L / (1 + np.exp(-k * (var.var - x_0)))
+            logistic_var = Node(value)
+            var.child.append((logistic_var, k * value * (1 - value / L)))
             return logistic_var
         except:
-            raise TypeError(f"Invalid input type.")   
-        
\ No newline at end of file
+            raise TypeError(f"Invalid input type.")
+
+
+def _adjoints(values, order, seeds):
+    """Accumulates the adjoints of Nodes with respect to a weighted sum of outputs.
+
+    Parameters
+    ------
+    values : dict
+        a mapping of expression graph positions to the Nodes (or scalars) computed there.
+    order : list of int
+        positions of the outputs' ancestors in topological order.
+    seeds : dict
+        a mapping of positions of the outputs to their weights, e.g. {output: 1.} for the
+        adjoints with respect to a single output.
+
+    Returns
+    ------
+    dict
+        a mapping of Node ids to their adjoints. Nodes outside of order are absent.
+    """
+    adjoints = {}
+    for i in reversed(order):
+        node = values[i]
+        if isinstance(node, Node):
+            adjoints[id(node)] = seeds.get(i, 0.) + sum(adjoints.get(id(child), 0.) * partial for child, partial in node.child)
+    return adjoints
+
+
+def _adjoint_matrix(values, order, outputs, seeds = None):
+    """Accumulates the adjoints of Nodes with respect to several outputs in one sweep.
+
+    Parameters
+    ------
+    values : dict
+        a mapping of expression graph positions to the Nodes (or scalars) computed there.
+    order : list of int
+        positions of the outputs' ancestors in topological order.
+    outputs : list of int
+        positions of the outputs.
+    seeds : numpy.array, optional (default = None, the identity matrix)
+        the seeds of the adjoints of the outputs, one row of k columns per output; the
+        adjoints are then those of k weighted sums of the outputs.
+
+    Returns
+    ------
+    dict
+        a mapping of Node ids to arrays of their adjoints, with one entry per column of
+        seeds (by default, per output). Nodes outside of order are absent.
+    """
+    if seeds is None:
+        seeds = np.eye(len(outputs))
+    rows = {}  # Node id -> row of the adjoint matrix
+    matrix = np.zeros((len(order), seeds.shape[1]))
+    position = {i: r for r, i in enumerate(order)}
+    for k, i in enumerate(outputs):
+        matrix[position[i]] += seeds[k]
+
+    for r in range(len(order) - 1, -1, -1):
+        node = values[order[r]]
+        if not isinstance(node, Node):
+            continue
+        children = [(rows[id(child)], partial) for child, partial in node.child if id(child) in rows]
+        if children:
+            index, partials = zip(*children)
+            matrix[r] += np.dot(partials, matrix[list(index)])
+        rows[id(node)] = r
+    return {node_id: matrix[r] for node_id, r in rows.items()}
+
+
+# a batched sweep costs about this many sweeps of a single function, per Node
+_BATCH_COST = 5
+
+# rules evaluating the operations of an expression graph on Node objects
+_RULES = {**ARITHMETIC, 'sqrt': Node.sqrt, 'exp': Node.exp, 'log': Node.log, 'sin': Node.sin,
+          'cos': Node.cos, 'tan': Node.tan, 'arcsin': Node.arcsin, 'arccos': Node.arccos,
+          'arctan': Node.arctan, 'sinh': Node.sinh, 'cosh': Node.cosh, 'tanh': Node.tanh,
+          'logistic': Node.logistic}
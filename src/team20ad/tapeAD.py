@@ -0,0 +1,683 @@
+"""Reverse mode AD on a flat, array-backed Wengert tape.
+
+Where `Node` links every operation to its operands through Python lists of
+(Node, partial) tuples, the operations here are recorded as entries of a `Tape`: the
+positions of at most two operands, the local partials with respect to them and the value,
+stored in preallocated NumPy buffers that grow geometrically. A `TapeVar` only holds its
+tape, its position and its value; the reverse sweep walks the tape backwards once.
+
+Each entry also keeps the operation and the constant operand it was recorded with, so a
+tape recorded once can be replayed at other values of the variables: the values and
+partials are recomputed in place, without tracing the functions or creating objects again.
+"""
+
+import math
+import numpy as np
+
+from . import elementary
+from .expression import ARITHMETIC, apply_ufunc
+from .reverseAD import ReverseAD
+
+
+class TapeAD(ReverseAD):
+    """Reverse Mode Automatic Differentiation on a flat tape.
+
+    Same interface as ReverseAD, of which it is a drop-in replacement: the functions are
+    traced once onto a Tape, then each function is swept in reverse. update() replays the
+    recorded tape at the new point instead of tracing again, which makes it the fast way
+    to evaluate the same functions at many points, e.g. in optimization loops.
+
+    Parameters
+    ------
+    var_dict: dict
+        a dictionary of variables and their corresponding values
+    func_list: str, Expression, or list of str or Expression
+        (a list of) function(s) encoded as string(s) or compiled Expression(s)
+
+    Attributes
+    ------
+    func_evals: list
+        the evaluation of function(s) at the given point
+    Dpf: numpy.array
+        derivatives of function(s) evaluated at the given point
+    sparsity: numpy.array
+        the structural sparsity pattern of Dpf; functions that depend on no variable
+        are not swept
+    tape: Tape
+        the tape recorded by the first evaluation
+
+    Examples
+    --------
+    >>> ad = TapeAD({'x': 1, 'y': 2}, ['x**2 + y**2', 'exp(x + y)'])
+    >>> ad.func_evals
+    [5.0, 20.085536923187668]
+    >>> ad.Dpf
+    array([[ 2.        ,  4.        ],
+           [20.08553692, 20.08553692]])
+    >>> ad.update(x = 3)
+    >>> ad.Dpf
+    array([[  6.       ,   4.       ],
+           [148.4131591, 148.4131591]])
+    """
+
+    tape = None
+
+    def _record(self):
+        """Traces every function onto a new tape."""
+        self.tape = Tape()
+        inputs = {var_name: self.tape.variable(float(var_value)) for var_name, var_value in self.var_dict.items()}
+        values = self.graph.trace(inputs, _RULES)
+
+        self._wrt = [x.index for x in inputs.values()]
+        self._outputs = []  # position of each function on the tape, None if constant
+        self._entries = []  # positions of the subterms of each function on the tape
+        for j, i in enumerate(self.graph.outputs):
+            out = values[i]
+            if isinstance(out, TapeVar):
+                self._outputs.append(out.index)
+                # the graph was traced in topological order, so the positions are increasing
+                self._entries.append([values[p].index for p in self.graph.cone([j]) if isinstance(values[p], TapeVar)])
+            else:
+                self._outputs.append(None)
+                self._entries.append([])
+                self.func_evals[j] = float(out)
+
+    def _evaluate(self, outputs):
+        """Computes the values and the rows of Dpf of the given functions.
+
+        The first evaluation records the tape; later ones replay the entries the given
+        functions need.
+
+        Parameter
+        ------
+        outputs : list of int
+            indices of the functions to evaluate.
+        """
+        outputs = list(outputs)
+        if not outputs:
+            return
+
+        if self.tape is None:
+            self._record()
+        else:
+            variables = {i: float(value) for i, value in zip(self._wrt, self.var_dict.values())}
+            if len(outputs) == len(self.func_list):
+                self.tape.replay(variables)
+            else:
+                self.tape.replay(variables, sorted(set().union(*[self._entries[j] for j in outputs])))
+
+        values = self.tape.values
+        for j in outputs:
+            out = self._outputs[j]
+            if out is None:
+                continue
+            self.func_evals[j] = float(values[out])
+
+            columns = np.flatnonzero(self.sparsity[j])
+            if len(columns):
+                # only the entries of the function's subterms are swept
+                self.Dpf[j, columns] = self.tape.gradient(out, self._wrt, self._entries[j])[columns]
+
+
+class Tape:
+    """A Wengert tape: a flat record of the operations of a computation.
+
+    Entry k holds the value of the k-th recorded operation, the positions of its operands
+    (-1 if absent) and the partials of the operation with respect to them. Variables are
+    entries without operands.
+
+    Attributes
+    ------
+    values : numpy.array
+        the values of the recorded entries.
+    parents : numpy.array
+        the positions of the operands of each entry, of shape (len(tape), 2).
+    partials : numpy.array
+        the partials with respect to the operands of each entry, of shape (len(tape), 2).
+
+    Examples
+    ------
+    >>> tape = Tape()
+    >>> x, y = tape.variable(2.), tape.variable(3.)
+    >>> z = x * y + x
+    >>> len(tape), z.value
+    (4, 8.0)
+    >>> tape.gradient(z.index, [x.index, y.index])
+    array([4., 2.])
+    >>> tape.replay({x.index: 1., y.index: 5.})
+    >>> float(tape.values[z.index]), tape.gradient(z.index, [x.index, y.index])
+    (6.0, array([6., 1.]))
+    """
+
+    def __init__(self, capacity = 64):
+        """
+        Parameter
+        ------
+        capacity : int, optional (default = 64)
+            the number of entries allocated up front; the buffers double when full.
+        """
+        self._size = 0
+        self._ops = []  # the operation of each entry, 'var' for variables
+        self._consts = []  # the constant operand of each entry, if any
+        self._allocate(capacity)
+
+    def __repr__(self):
+        """Returns a representation of the Tape instance.
+
+        Returns
+        ------
+        str
+            a representation of the Tape instance.
+        """
+        return f"Tape({self._size} entries)"
+
+    def __len__(self):
+        """Returns the number of recorded entries."""
+        return self._size
+
+    @property
+    def values(self):
+        return self._values[:self._size]
+
+    @property
+    def parents(self):
+        return self._parents[:self._size]
+
+    @property
+    def partials(self):
+        return self._partials[:self._size]
+
+    def _allocate(self, capacity):
+        """Allocates buffers of the given capacity, keeping the recorded entries."""
+        buffers = {'_values': np.empty(capacity),
+                   '_parents': np.empty((capacity, 2), dtype = np.intp),
+                   '_partials': np.empty((capacity, 2))}
+        for name, new in buffers.items():
+            if self._size:
+                new[:self._size] = getattr(self, name)[:self._size]
+            setattr(self, name, new)
+        self._capacity = capacity
+        # entries are read and written through memoryviews of the buffers, which handle
+        # Python scalars several times faster than indexing the arrays
+        self._value_view = memoryview(self._values)
+        self._parent_view = memoryview(self._parents)
+        self._partial_view = memoryview(self._partials)
+
+    def record(self, value, parent = -1, partial = 0., other = -1, other_partial = 0., op = 'var', const = None):
+        """Appends an entry and returns its position.
+
+        Parameters
+        ------
+        value : float
+            the value of the operation.
+        parent, other : int, optional (default = -1, no operand)
+            the positions of the operands.
+        partial, other_partial : float, optional (default = 0.)
+            the partials of the operation with respect to the operands.
+        op : str, optional (default = 'var')
+            the operation, by which replay() recomputes the entry; 'var' entries are
+            not recomputed.
+        const : object, optional (default = None)
+            the constant operand or parameters of the operation, e.g. c in x + c.
+
+        Returns
+        ------
+        int
+            the position of the entry.
+        """
+        k = self._size
+        if k == self._capacity:
+            self._allocate(2 * k)
+        self._value_view[k] = value
+        self._parent_view[k, 0] = parent
+        self._parent_view[k, 1] = other
+        self._partial_view[k, 0] = partial
+        self._partial_view[k, 1] = other_partial
+        self._ops.append(op)
+        self._consts.append(const)
+        self._size = k + 1
+        return k
+
+    def variable(self, value):
+        """Records an independent variable.
+
+        Parameter
+        ------
+        value : int or float
+            the value of the variable.
+
+        Returns
+        ------
+        TapeVar
+            the variable.
+        """
+        return TapeVar(self, self.record(value), value)
+
+    def replay(self, variables, entries = None):
+        """Recomputes the values and partials of entries in place at new values of the variables.
+
+        The operations are those recorded, so the results are those of recording the same
+        computation again at the new values; no objects are created for the entries.
+
+        Parameters
+        ------
+        variables : dict
+            a mapping of positions of variables to their new values.
+        entries : list of int, optional (default = None, every entry)
+            the positions to recompute in increasing order; they must include every
+            entry on a path from a changed variable to the entries of interest.
+
+        Raises
+        ------
+        ValueError
+            if an operation is evaluated outside of its domain.
+        """
+        values, parents, partials = self._value_view, self._parent_view, self._partial_view
+        for k, value in variables.items():
+            values[k] = value
+
+        ops, consts = self._ops, self._consts
+        for k in range(self._size) if entries is None else entries:
+            op = ops[k]
+            rule = _UNARY.get(op)
+            if rule is not None:
+                values[k], partials[k, 0] = rule(values[parents[k, 0]], consts[k])
+            elif op != 'var':
+                values[k], partials[k, 0], partials[k, 1] = _BINARY[op](values[parents[k, 0]], values[parents[k, 1]])
+
+    def gradient(self, output, wrt, entries = None):
+        """Computes the adjoints of entries with respect to an output by a reverse sweep.
+
+        Parameters
+        ------
+        output : int
+            the position of the output.
+        wrt : list of int
+            the positions whose adjoints are returned, e.g. those of the variables.
+        entries : list of int, optional (default = None, every entry up to the output)
+            the positions to sweep in increasing order; they must include every entry
+            on a path from the entries in wrt to the output.
+
+        Returns
+        ------
+        numpy.array
+            the derivatives of the output with respect to the entries in wrt.
+        """
+        if entries is None:
+            entries = range(output + 1)
+        parents, partials = self._parent_view, self._partial_view
+
+        adjoints = {output: 1.}
+        for k in reversed(entries):
+            adjoint = adjoints.get(k)
+            if adjoint:
+                p, q = parents[k, 0], parents[k, 1]
+                if p >= 0:
+                    adjoints[p] = adjoints.get(p, 0.) + adjoint * partials[k, 0]
+                    if q >= 0:
+                        adjoints[q] = adjoints.get(q, 0.) + adjoint * partials[k, 1]
+        return np.array([adjoints.get(i, 0.) for i in wrt])
+
+
+class TapeVar:
+    """A value recorded on a Tape, supporting the operations of reverse mode AD.
+
+    Operations on TapeVars compute their value and record an entry on the tape; they
+    create no other objects.
+
+    Attributes
+    ------
+    tape : Tape
+        the tape the value is recorded on.
+    index : int
+        the position of the value on the tape.
+    value : int or float
+        the value.
+    """
+
+    __slots__ = ('tape', 'index', 'value')
+
+    def __init__(self, tape, index, value):
+        """
+        Parameters
+        ------
+        tape : Tape
+            the tape the value is recorded on.
+        index : int
+            the position of the value on the tape.
+        value : int or float
+            the value.
+        """
+        self.tape = tape
+        self.index = index
+        self.value = value
+
+    def __repr__(self):
+        """Returns a representation of the TapeVar instance.
+
+        Returns
+        ------
+        str
+            a representation of the TapeVar instance.
+        """
+        return f"TapeVar({self.value})"
+
+    def _unary(self, op, const = None):
+        """Records an operation of the TapeVar instance and a constant operand, if any."""
+        value, partial = _UNARY[op](self.value, const)
+        return TapeVar(self.tape, self.tape.record(value, self.index, partial, -1, 0., op, const), value)
+
+    def _binary(self, op, other):
+        """Records an operation of the TapeVar instance and another TapeVar."""
+        value, partial, other_partial = _BINARY[op](self.value, other.value)
+        return TapeVar(self.tape, self.tape.record(value, self.index, partial, other.index, other_partial, op), value)
+
+    def _arithmetic(self, op, other):
+        """Records an arithmetic operation of the TapeVar instance and a TapeVar, int or float."""
+        if isinstance(other, TapeVar):
+            return self._binary(op, other)
+        if isinstance(other, (int, float)):
+            return self._unary(op + '_const', other)
+        if isinstance(other, np.ndarray):
+            return NotImplemented  # evaluated elementwise by __array_ufunc__()
+        raise TypeError(f"Unsupported type '{type(other)}'")
+
+    def _reflected(self, op, other):
+        """Records an arithmetic operation of an int or float and the TapeVar instance."""
+        if isinstance(other, (int, float)):
+            return self._unary(op, other)
+        raise TypeError(f"Unsupported type '{type(other)}'")
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        """Evaluates NumPy ufuncs, e.g. np.sin(x) or np.multiply(x, y), by recording entries.
+
+        Arithmetic ufuncs are mapped to the operators of TapeVar and elementary ones to its
+        static methods of the same name. Arrays are evaluated element by element.
+
+        Returns
+        ------
+        TapeVar, numpy.array
+            the result, or NotImplemented for unsupported ufuncs.
+        """
+        if any(isinstance(x, np.ndarray) for x in inputs):
+            elementwise = lambda *xs: apply_ufunc(TapeVar, TapeVar, ufunc, method, xs, kwargs)
+            inputs = [np.array(x, dtype = object) if isinstance(x, TapeVar) else x for x in inputs]
+            return np.frompyfunc(elementwise, len(inputs), 1)(*inputs)
+        return apply_ufunc(TapeVar, TapeVar, ufunc, method, inputs, kwargs)
+
+    def __add__(self, other):
+        """Returns the sum of the TapeVar instance and a TapeVar, int or float."""
+        return self._arithmetic('add', other)
+
+    def __radd__(self, other):
+        """Returns the sum of an int or float and the TapeVar instance."""
+        return self._reflected('add_const', other)
+
+    def __sub__(self, other):
+        """Returns the difference of the TapeVar instance and a TapeVar, int or float."""
+        return self._arithmetic('sub', other)
+
+    def __rsub__(self, other):
+        """Returns the difference of an int or float and the TapeVar instance."""
+        return self._reflected('rsub_const', other)
+
+    def __mul__(self, other):
+        """Returns the product of the TapeVar instance and a TapeVar, int or float."""
+        return self._arithmetic('mul', other)
+
+    def __rmul__(self, other):
+        """Returns the product of an int or float and the TapeVar instance."""
+        return self._reflected('mul_const', other)
+
+    def __truediv__(self, other):
+        """Returns the quotient of the TapeVar instance and a TapeVar, int or float."""
+        return self._arithmetic('truediv', other)
+
+    def __rtruediv__(self, other):
+        """Returns the quotient of an int or float and the TapeVar instance."""
+        return self._reflected('rtruediv_const', other)
+
+    def __pow__(self, other):
+        """Returns the TapeVar instance raised to the power of a TapeVar, int or float.
+
+        As for Node, a TapeVar exponent only contributes to the derivative when the base
+        is positive.
+        """
+        return self._arithmetic('pow', other)
+
+    def __rpow__(self, other):
+        """Returns an int or float raised to the power of the TapeVar instance."""
+        return self._reflected('rpow_const', other)
+
+    def __neg__(self):
+        """Returns the negation of the TapeVar instance."""
+        return self._unary('neg')
+
+    def __abs__(self):
+        """Returns the absolute value of the TapeVar instance."""
+        return self._unary('abs')
+
+    def __eq__(self, other):
+        """Compares the values of two objects."""
+        return self.value == getattr(other, 'value', other)
+
+    def __ne__(self, other):
+        """Compares the values of two objects."""
+        return self.value != getattr(other, 'value', other)
+
+    def __lt__(self, other):
+        """Compares the values of two objects."""
+        return self.value < getattr(other, 'value', other)
+
+    def __gt__(self, other):
+        """Compares the values of two objects."""
+        return self.value > getattr(other, 'value', other)
+
+    def __le__(self, other):
+        """Compares the values of two objects."""
+        return self.value <= getattr(other, 'value', other)
+
+    def __ge__(self, other):
+        """Compares the values of two objects."""
+        return self.value >= getattr(other, 'value', other)
+
+    __hash__ = object.__hash__
+
+    @staticmethod
+    def sqrt(var):
+        """Square root function recording on the tape; other values are handled by elementary.sqrt()."""
+        return var._unary('sqrt') if isinstance(var, TapeVar) else elementary.sqrt(var)
+
+    @staticmethod
+    def exp(var):
+        """Exponential function recording on the tape; other values are handled by elementary.exp()."""
+        return var._unary('exp') if isinstance(var, TapeVar) else elementary.exp(var)
+
+    @staticmethod
+    def log(var, base = None):
+        """Logarithmic function recording on the tape; other values are handled by elementary.log().
+
+        The base, if given, may be a TapeVar as well.
+        """
+        if isinstance(base, TapeVar):
+            return var._binary('log_base', base) if isinstance(var, TapeVar) else base._unary('rlog_const', var)
+        return var._unary('log', base) if isinstance(var, TapeVar) else elementary.log(var, base)
+
+    @staticmethod
+    def sin(var):
+        """Sine function recording on the tape; other values are handled by elementary.sin()."""
+        return var._unary('sin') if isinstance(var, TapeVar) else elementary.sin(var)
+
+    @staticmethod
+    def cos(var):
+        """Cosine function recording on the tape; other values are handled by elementary.cos()."""
+        return var._unary('cos') if isinstance(var, TapeVar) else elementary.cos(var)
+
+    @staticmethod
+    def tan(var):
+        """Tangent function recording on the tape; other values are handled by elementary.tan()."""
+        return var._unary('tan') if isinstance(var, TapeVar) else elementary.tan(var)
+
+    @staticmethod
+    def arcsin(var):
+        """Inverse sine function recording on the tape; other values are handled by elementary.arcsin()."""
+        return var._unary('arcsin') if isinstance(var, TapeVar) else elementary.arcsin(var)
+
+    @staticmethod
+    def arccos(var):
+        """Inverse cosine function recording on the tape; other values are handled by elementary.arccos()."""
+        return var._unary('arccos') if isinstance(var, TapeVar) else elementary.arccos(var)
+
+    @staticmethod
+    def arctan(var):
+        """Inverse tangent function recording on the tape; other values are handled by elementary.arctan()."""
+        return var._unary('arctan') if isinstance(var, TapeVar) else elementary.arctan(var)
+
+    @staticmethod
+    def sinh(var):
+        """Hyperbolic sine function recording on the tape; other values are handled by elementary.sinh()."""
+        return var._unary('sinh') if isinstance(var, TapeVar) else elementary.sinh(var)
+
+    @staticmethod
+    def cosh(var):
+        """Hyperbolic cosine function recording on the tape; other values are handled by elementary.cosh()."""
+        return var._unary('cosh') if isinstance(var, TapeVar) else elementary.cosh(var)
+
+    @staticmethod
+    def tanh(var):
+        """Hyperbolic tangent function recording on the tape; other values are handled by elementary.tanh()."""
+        return var._unary('tanh') if isinstance(var, TapeVar) else elementary.tanh(var)
+
+    @staticmethod
+    def logistic(var, L = 1, k = 1, x_0 = 0):
+        """Logistic function recording on the tape; other values are handled by elementary.logistic().
+
+        The parameters L, k and x_0 must be constant.
+        """
+        if any(isinstance(param, TapeVar) for param in (L, k, x_0)):
+            raise ValueError("The parameters of logistic() should not depend on the variables.")
+        if not isinstance(var, TapeVar):
+            return elementary.logistic(var, L, k, x_0)
+        return var._unary('logistic', (L, k, x_0))
+
+
+# local rules of the operations, shared by recording and replay: operations of a value x
+# and a constant c give (value, partial), operations of two values x and y give
+# (value, partial in x, partial in y)
+
+def _real_pow(x, y):
+    """x ** y, raising ValueError where Python would return a complex number."""
+    value = x ** y
+    if isinstance(value, complex):
+        raise ValueError(f"{x} cannot be raised to the non-integer power {y}.")
+    return value
+
+
+def _pow_const(x, c):
+    return _real_pow(x, c), c * x ** (c - 1) if c != 0 else 0.
+
+
+def _rpow_const(x, c):
+    value = _real_pow(c, x)
+    return value, math.log(c) * value if c > 0 else 0.
+
+
+def _sqrt(x, c):
+    if x < 0:
+        raise ValueError("Should not be negative.")
+    value = math.sqrt(x)
+    return value, 0.5 / value if value else math.inf
+
+
+def _exp(x, c):
+    value = elementary.exp(x)
+    return value, value
+
+
+def _log(x, base):
+    if x <= 0:
+        raise ValueError("Should not be negative.")
+    if base is None:
+        return math.log(x), 1 / x
+    return math.log(x) / math.log(base), 1 / x / math.log(base)
+
+
+def _rlog_const(x, c):
+    if c <= 0:
+        raise ValueError("Should not be negative.")
+    log_x = math.log(x)
+    value = math.log(c) / log_x
+    return value, -value / (x * log_x)
+
+
+def _log_base(x, y):
+    if x <= 0:
+        raise ValueError("Should not be negative.")
+    log_x, log_y = math.log(x), math.log(y)
+    value = log_x / log_y
+    return value, 1 / (x * log_y), -value / (y * log_y)
+
+
+def _tan(x, c):
+    if x % math.pi == math.pi / 2:
+        raise ValueError('Tan is undefined in the given domain')
+    cos = math.cos(x)
+    return math.tan(x), 1 / (cos * cos)
+
+
+def _arcsin(x, c):
+    if abs(x) > 1:
+        raise ValueError('arcsin() cannot be evaluated at {}.'.format(x))
+    return math.asin(x), 1 / math.sqrt(1 - x * x) if abs(x) < 1 else math.inf
+
+
+def _arccos(x, c):
+    if abs(x) > 1:
+        raise ValueError('arccos() cannot be evaluated at {}.'.format(x))
+    return math.acos(x), -1 / math.sqrt(1 - x * x) if abs(x) < 1 else -math.inf
+
+
+def _tanh(x, c):
+    value = math.tanh(x)
+    return value, 1 - value * value
+
+
+def _logistic(x, params):
+    L, k, x_0 = params
+    value = elementary.logistic(x, L, k, x_0)
+    return value, k * value * (1 - value / L)
+
+
+def _truediv(x, y):
+    value = x / y
+    return value, 1 / y, -value / y
+
+
+def _pow(x, y):
+    value = _real_pow(x, y)
+    return value, y * x ** (y - 1), math.log(x) * value if x > 0 else 0.
+
+
+_UNARY = {'add_const': lambda x, c: (x + c, 1.), 'sub_const': lambda x, c: (x - c, 1.),
+          'rsub_const': lambda x, c: (c - x, -1.), 'mul_const': lambda x, c: (x * c, c),
+          'truediv_const': lambda x, c: (x / c, 1 / c),
+          'rtruediv_const': lambda x, c: (c / x, -c / x / x),
+          'pow_const': _pow_const, 'rpow_const': _rpow_const,
+          'neg': lambda x, c: (-x, -1.), 'abs': lambda x, c: (abs(x), float((x > 0) - (x < 0))),
+          'sqrt': _sqrt, 'exp': _exp, 'log': _log, 'rlog_const': _rlog_const,
+          'sin': lambda x, c: (math.sin(x), math.cos(x)), 'cos': lambda x, c: (math.cos(x), -math.sin(x)),
+          'tan': _tan, 'arcsin': _arcsin, 'arccos': _arccos,
+          'arctan': lambda x, c: (math.atan(x), 1 / (1 + x * x)),
+          'sinh': lambda x, c: (elementary.sinh(x), elementary.cosh(x)),
+          'cosh': lambda x, c: (elementary.cosh(x), elementary.sinh(x)),
+          'tanh': _tanh, 'logistic': _logistic}
+
+_BINARY = {'add': lambda x, y: (x + y, 1., 1.), 'sub': lambda x, y: (x - y, 1., -1.),
+           'mul': lambda x, y: (x * y, y, x), 'truediv': _truediv, 'pow': _pow, 'log_base': _log_base}
+
+
+# rules evaluating the operations of an expression graph on TapeVar objects
+_RULES = {**ARITHMETIC, 'sqrt': TapeVar.sqrt, 'exp': TapeVar.exp, 'log': TapeVar.log, 'sin': TapeVar.sin,
+          'cos': TapeVar.cos, 'tan': TapeVar.tan, 'arcsin': TapeVar.arcsin, 'arccos': TapeVar.arccos,
+          'arctan': TapeVar.arctan, 'sinh': TapeVar.sinh, 'cosh': TapeVar.cosh, 'tanh': TapeVar.tanh,
+          'logistic': TapeVar.logistic}
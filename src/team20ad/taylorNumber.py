@@ -0,0 +1,562 @@
+import numpy as np
+
+
+class TaylorNumber:
+    """A truncated Taylor polynomial supporting derivatives of arbitrary order in forward mode.
+
+    A TaylorNumber holds the coefficients x_0, ..., x_K of x(t) = x_0 + x_1 t + ... + x_K t**K,
+    truncated at order K. Seeding the variables with x(t) = x + t v, the coefficient f_k of
+    a function f is its k-th derivative along the direction v divided by k!. Products,
+    quotients and elementary functions are propagated with the standard recurrences, in
+    O(K**2) per operation.
+
+    Attributes
+    ------
+    _supported_scalars : tuple
+        A tuple containing types of objects that are supported by the
+        Taylor polynomial operations.
+    coeffs : numpy.array
+        The Taylor coefficients x_0, ..., x_K.
+
+    Examples
+    ------
+    >>> x = TaylorNumber.variable(2., order = 3)
+    >>> x ** 3
+    TaylorNumber([ 8. 12.  6.  1.])
+    >>> (x ** 3).derivatives()
+    array([ 8., 12., 12.,  6.])
+    """
+
+    __slots__ = ('coeffs',)
+
+    _supported_scalars = (int, float)
+
+    # NumPy scalars defer to the reflected operators instead of building object arrays
+    __array_ufunc__ = None
+
+    def __init__(self, coeffs):
+        """
+        Parameters
+        ------
+        coeffs : list or numpy.array
+            The Taylor coefficients x_0, ..., x_K.
+
+        Raises
+        ------
+        TypeError
+            if the coefficients are not numbers.
+        ValueError
+            if there are no coefficients or they are not a flat sequence.
+        """
+        try:
+            self.coeffs = np.array(coeffs, dtype = float)
+        except (TypeError, ValueError):
+            raise TypeError("Taylor coefficients should be numbers.")
+        if self.coeffs.ndim != 1 or not len(self.coeffs):
+            raise ValueError("Taylor coefficients should be a non-empty sequence.")
+
+    @classmethod
+    def variable(cls, value, direction = 1., order = 1):
+        """Returns the Taylor polynomial of value + direction * t truncated at the given order.
+
+        Parameters
+        ------
+        value : int or float
+            the value of the variable.
+        direction : int or float, optional (default = 1.)
+            the component of the direction along this variable.
+        order : int, optional (default = 1)
+            the order K of the truncation.
+
+        Returns
+        ------
+        TaylorNumber
+            the Taylor polynomial seeding the variable.
+        """
+        if not isinstance(order, int) or order < 1:
+            raise ValueError("order should be a positive integer.")
+        coeffs = np.zeros(order + 1)
+        coeffs[0], coeffs[1] = value, direction
+        return cls(coeffs)
+
+    @property
+    def real(self):
+        """The value x_0 of the Taylor polynomial."""
+        return self.coeffs[0]
+
+    @property
+    def order(self):
+        """The order K of the truncation."""
+        return len(self.coeffs) - 1
+
+    def derivatives(self):
+        """Returns the derivatives along the seeded direction, k! x_k for k = 0, ..., K.
+
+        Returns
+        ------
+        numpy.array
+            the value and the derivatives of order 1 to K.
+        """
+        factorials = np.cumprod(np.maximum(np.arange(len(self.coeffs)), 1))
+        return self.coeffs * factorials
+
+    def __repr__(self):
+        """Returns a representation of the TaylorNumber instance.
+
+        Returns
+        ------
+        str
+            a representation of the TaylorNumber instance.
+        """
+        return f"TaylorNumber({self.coeffs})"
+
+    def __str__(self):
+        """Returns a string representation of the TaylorNumber instance.
+
+        Returns
+        ------
+        str
+            a string representation of the TaylorNumber instance.
+        """
+        return f"TaylorNumber: coeffs = {self.coeffs}"
+
+    def _coeffs(self, other):
+        """Returns the coefficients of another operand, padding scalars with zeros.
+
+        Raises
+        ------
+        TypeError
+            if the operand is of unsupported type.
+        ValueError
+            if the operand is truncated at a different order.
+        """
+        if isinstance(other, TaylorNumber):
+            if len(other.coeffs) != len(self.coeffs):
+                raise ValueError("Taylor polynomials should be truncated at the same order.")
+            return other.coeffs
+        if isinstance(other, self._supported_scalars):
+            coeffs = np.zeros(len(self.coeffs))
+            coeffs[0] = other
+            return coeffs
+        raise TypeError(f"Unsupported type '{type(other)}'")
+
+    def _integrate(self, value, g):
+        """Returns u with u(0) = value and u' = g x', the rule of a function whose derivative g is known.
+
+        u_k = 1/k sum_{j=1}^{k} j x_j g_{k-j}
+        """
+        x = self.coeffs
+        u = np.empty(len(x))
+        u[0] = value
+        jx = np.arange(len(x)) * x
+        for k in range(1, len(x)):
+            u[k] = np.dot(jx[1:k + 1], g[k - 1::-1]) / k
+        return TaylorNumber(u)
+
+    def _sincos(self, sign):
+        """Returns (sin, cos) for sign = -1, or (sinh, cosh) for sign = 1.
+
+        s' = c x' and c' = sign s x', so both are filled in together.
+        """
+        x = self.coeffs
+        s, c = np.empty(len(x)), np.empty(len(x))
+        if sign < 0:
+            s[0], c[0] = np.sin(x[0]), np.cos(x[0])
+        else:
+            s[0], c[0] = np.sinh(x[0]), np.cosh(x[0])
+        jx = np.arange(len(x)) * x
+        for k in range(1, len(x)):
+            s[k] = np.dot(jx[1:k + 1], c[k - 1::-1]) / k
+            c[k] = sign * np.dot(jx[1:k + 1], s[k - 1::-1]) / k
+        return TaylorNumber(s), TaylorNumber(c)
+
+    def __neg__(self):
+        """Returns the negation of the TaylorNumber instance.
+
+        Returns
+        ------
+        TaylorNumber
+            the negation of every coefficient.
+        """
+        return TaylorNumber(-self.coeffs)
+
+    def __add__(self, other):
+        """Returns the sum of the TaylorNumber instance and another given instance of supported type.
+
+        Parameter
+        ------
+        other : TaylorNumber, int, or float
+            the instance to compute the sum with.
+
+        Returns
+        ------
+        TaylorNumber
+            the sum of the two instances.
+        """
+        return TaylorNumber(self.coeffs + self._coeffs(other))
+
+    def __radd__(self, other):
+        """Returns the sum of a scalar object and the TaylorNumber instance.
+
+        Parameter
+        ------
+        other : int, or float
+            a scalar object to compute the sum with.
+
+        Returns
+        ------
+        TaylorNumber
+            the sum of the two instances.
+        """
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        """Returns the substraction of the TaylorNumber instance and another given instance of supported type.
+
+        Parameter
+        ------
+        other : TaylorNumber, int, or float
+            the instance to subtract.
+
+        Returns
+        ------
+        TaylorNumber
+            the substraction of the two instances.
+        """
+        return TaylorNumber(self.coeffs - self._coeffs(other))
+
+    def __rsub__(self, other):
+        """Returns the substraction of a scalar object and the TaylorNumber instance.
+
+        Parameter
+        ------
+        other : int, or float
+            a scalar object to be subtracted from.
+
+        Returns
+        ------
+        TaylorNumber
+            the substraction of the two instances.
+        """
+        return TaylorNumber(self._coeffs(other) - self.coeffs)
+
+    def __mul__(self, other):
+        """Returns the product of the TaylorNumber instance and another given instance of supported type.
+
+        The coefficients of the product are the truncated Cauchy product of the coefficients.
+
+        Parameter
+        ------
+        other : TaylorNumber, int, or float
+            the instance to compute the product with.
+
+        Returns
+        ------
+        TaylorNumber
+            the product of the two instances.
+        """
+        if isinstance(other, self._supported_scalars):
+            return TaylorNumber(self.coeffs * other)
+        return TaylorNumber(np.convolve(self.coeffs, self._coeffs(other))[:len(self.coeffs)])
+
+    def __rmul__(self, other):
+        """Returns the product of a scalar object and the TaylorNumber instance.
+
+        Parameter
+        ------
+        other : int, or float
+            a scalar object to compute the product with.
+
+        Returns
+        ------
+        TaylorNumber
+            the product of the two instances.
+        """
+        return self.__mul__(other)
+
+    def __truediv__(self, other):
+        """Returns the division of the TaylorNumber instance and another given instance of supported type.
+
+        q = x / y is filled in from q y = x: q_k = (x_k - sum_{j=0}^{k-1} q_j y_{k-j}) / y_0.
+
+        Parameter
+        ------
+        other : TaylorNumber, int, or float
+            the instance to divide by.
+
+        Returns
+        ------
+        TaylorNumber
+            the division of the two instances.
+
+        Raises
+        ------
+        ZeroDivisionError
+            if the value of the divisor is zero.
+        """
+        y = self._coeffs(other)
+        if y[0] == 0:
+            raise ZeroDivisionError("Cannot divide by zero.")
+        x = self.coeffs
+        q = np.empty(len(x))
+        for k in range(len(x)):
+            q[k] = (x[k] - np.dot(q[:k], y[k:0:-1])) / y[0]
+        return TaylorNumber(q)
+
+    def __rtruediv__(self, other):
+        """Returns the division of a scalar object and the TaylorNumber instance.
+
+        Parameter
+        ------
+        other : int, or float
+            the instance to be divided.
+
+        Returns
+        ------
+        TaylorNumber
+            the division of the two instances.
+        """
+        return TaylorNumber(self._coeffs(other)).__truediv__(self)
+
+    def __pow__(self, other):
+        """Returns the TaylorNumber instance raised to the power of another given instance of supported type.
+
+        Non-negative integer powers are computed by repeated squaring. Other powers r
+        follow from x p' = r x' p:
+        p_k = 1/(k x_0) sum_{j=1}^{k} ((r + 1) j - k) x_j p_{k-j}.
+        A TaylorNumber exponent y is evaluated as exp(y log(x)).
+
+        Parameter
+        ------
+        other : TaylorNumber, int, or float
+            the exponent.
+
+        Returns
+        ------
+        TaylorNumber
+            the result of the power operation on the given instances.
+
+        Raises
+        ------
+        ValueError
+            if the power is not real or not differentiable at the value of the instance.
+        """
+        if isinstance(other, TaylorNumber):
+            self._coeffs(other)
+            if self.real <= 0:
+                raise ValueError("The base should be positive for a TaylorNumber exponent.")
+            return (other * self.log()).exp()
+        if not isinstance(other, self._supported_scalars):
+            raise TypeError(f"Unsupported type '{type(other)}'")
+
+        if float(other).is_integer() and other >= 0:
+            result, base, n = TaylorNumber(self._coeffs(1)), self, int(other)
+            while n:
+                if n & 1:
+                    result = result * base
+                base, n = base * base, n >> 1
+            return result
+
+        x = self.coeffs
+        if x[0] == 0 or (x[0] < 0 and not float(other).is_integer()):
+            raise ValueError(f"Unsupported value '{x[0]}' for the power {other}.")
+        p = np.empty(len(x))
+        p[0] = x[0] ** other
+        j = np.arange(len(x))
+        for k in range(1, len(x)):
+            p[k] = np.dot(((other + 1) * j[1:k + 1] - k) * x[1:k + 1], p[k - 1::-1]) / (k * x[0])
+        return TaylorNumber(p)
+
+    def __rpow__(self, other):
+        """Returns a scalar object raised to the power of the TaylorNumber instance, exp(x log(other)).
+
+        Parameter
+        ------
+        other : int, or float
+            the base.
+
+        Returns
+        ------
+        TaylorNumber
+            the result of the power operation on the given instances.
+
+        Raises
+        ------
+        ValueError
+            if the base is not positive.
+        """
+        if not isinstance(other, self._supported_scalars):
+            raise TypeError(f"Unsupported type '{type(other)}'")
+        if other <= 0:
+            raise ValueError(f"Unsupported value '{other}'")
+        return (self * float(np.log(other))).exp()
+
+    def __eq__(self, other):
+        """Compares two objects if they are equal, including all coefficients.
+
+        Parameter
+        ------
+        other : TaylorNumber, int, or float
+            The object to compare with.
+
+        Returns
+        ------
+        bool
+            True if the two instances are equal; and False, otherwise.
+        """
+        return bool(np.array_equal(self.coeffs, self._coeffs(other)))
+
+    def __ne__(self, other):
+        """Compares two objects if they are not equal.
+
+        Parameter
+        ------
+        other : TaylorNumber, int, or float
+            The object to compare with.
+
+        Returns
+        ------
+        bool
+            True if the two instances are not equal; and False, otherwise.
+        """
+        return not self.__eq__(other)
+
+    def __lt__(self, other):
+        """Compares the values of two objects.
+
+        Parameter
+        ------
+        other : TaylorNumber, int, or float
+            The object to compare with.
+
+        Returns
+        ------
+        bool
+            True if less than the given object; and False, otherwise.
+        """
+        return self.real < self._coeffs(other)[0]
+
+    def __gt__(self, other):
+        """Compares the values of two objects.
+
+        Parameter
+        ------
+        other : TaylorNumber, int, or float
+            The object to compare with.
+
+        Returns
+        ------
+        bool
+            True if greater than the given object; and False, otherwise.
+        """
+        return self.real > self._coeffs(other)[0]
+
+    def __le__(self, other):
+        """Compares the values of two objects.
+
+        Parameter
+        ------
+        other : TaylorNumber, int, or float
+            The object to compare with.
+
+        Returns
+        ------
+        bool
+            True if less than or equal to the given object; and False, otherwise.
+        """
+        return self.real <= self._coeffs(other)[0]
+
+    def __ge__(self, other):
+        """Compares the values of two objects.
+
+        Parameter
+        ------
+        other : TaylorNumber, int, or float
+            The object to compare with.
+
+        Returns
+        ------
+        bool
+            True if greater than or equal to the given object; and False, otherwise.
+        """
+        return self.real >= self._coeffs(other)[0]
+
+    def __abs__(self):
+        """Returns the absolute value of the TaylorNumber instance.
+
+        Returns
+        ------
+        TaylorNumber
+            the polynomial scaled by the sign of its value.
+        """
+        return TaylorNumber(np.sign(self.real) * self.coeffs) if self.real else TaylorNumber(np.zeros(len(self.coeffs)))
+
+    # elementary functions, called by the functions of the same name in elementary.py
+
+    def sqrt(self):
+        """Returns the square root of the TaylorNumber instance."""
+        return self ** 0.5
+
+    def exp(self):
+        """Returns the exponential of the TaylorNumber instance.
+
+        e' = e x', so e_k = 1/k sum_{j=1}^{k} j x_j e_{k-j}.
+        """
+        x = self.coeffs
+        e = np.empty(len(x))
+        e[0] = np.exp(x[0])
+        jx = np.arange(len(x)) * x
+        for k in range(1, len(x)):
+            e[k] = np.dot(jx[1:k + 1], e[k - 1::-1]) / k
+        return TaylorNumber(e)
+
+    def log(self):
+        """Returns the natural logarithm of the TaylorNumber instance.
+
+        x l' = x', so l_k = (x_k - 1/k sum_{j=1}^{k-1} j l_j x_{k-j}) / x_0.
+        """
+        x = self.coeffs
+        l = np.empty(len(x))
+        l[0] = np.log(x[0])
+        j = np.arange(len(x))
+        for k in range(1, len(x)):
+            l[k] = (x[k] - np.dot(j[1:k] * l[1:k], x[k - 1:0:-1]) / k) / x[0]
+        return TaylorNumber(l)
+
+    def sin(self):
+        """Returns the sine of the TaylorNumber instance."""
+        return self._sincos(-1)[0]
+
+    def cos(self):
+        """Returns the cosine of the TaylorNumber instance."""
+        return self._sincos(-1)[1]
+
+    def tan(self):
+        """Returns the tangent of the TaylorNumber instance."""
+        s, c = self._sincos(-1)
+        return s / c
+
+    def arcsin(self):
+        """Returns the inverse sine of the TaylorNumber instance, whose derivative is (1 - x**2)**(-1/2)."""
+        return self._integrate(np.arcsin(self.real), ((1 - self * self) ** -0.5).coeffs)
+
+    def arccos(self):
+        """Returns the inverse cosine of the TaylorNumber instance, whose derivative is -(1 - x**2)**(-1/2)."""
+        return self._integrate(np.arccos(self.real), -((1 - self * self) ** -0.5).coeffs)
+
+    def arctan(self):
+        """Returns the inverse tangent of the TaylorNumber instance, whose derivative is 1 / (1 + x**2)."""
+        return self._integrate(np.arctan(self.real), (1 / (1 + self * self)).coeffs)
+
+    def sinh(self):
+        """Returns the hyperbolic sine of the TaylorNumber instance."""
+        return self._sincos(1)[0]
+
+    def cosh(self):
+        """Returns the hyperbolic cosine of the TaylorNumber instance."""
+        return self._sincos(1)[1]
+
+    def tanh(self):
+        """Returns the hyperbolic tangent of the TaylorNumber instance."""
+        s, c = self._sincos(1)
+        return s / c
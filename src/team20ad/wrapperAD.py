@@ -1,13 +1,181 @@
+import time
+import numpy as np
+
+from . import cache
 from .forwardAD import ForwardAD
-from .reverseAD import ReverseAD
+from .reverseAD import ReverseAD, _BATCH_COST
+from .codegenAD import CodegenAD
+from .tapeAD import TapeAD
+from .expression import compile_graph
+
+
+# engines AD can delegate to, by mode; see register_engine()
+ENGINES = {'forward': ForwardAD, 'reverse': ReverseAD, 'codegen': CodegenAD, 'tape': TapeAD}
+_ALIASES = {'f': 'forward', 'r': 'reverse', 'c': 'codegen', 't': 'tape'}
+
+# modes chosen by autotune_mode(), by cache key
+_tuned = {}
+
+
+# relative costs of the engines, roughly in microseconds, fitted to the measured times of
+# ForwardAD and ReverseAD on a few hundred random and structured sets of functions
+_SCALAR_COST = 1.0  # evaluating an operation on plain scalars (subterms depending on no variable)
+_FORWARD_SETUP_COST = 37.0  # per call of ForwardAD: sparsity pattern, Dpf, constant functions
+_SEED_COST = 5.2  # per variable seeded with a DualNumber in ForwardAD
+_DUAL_COST = 2.8  # evaluating an operation on DualNumber objects in ForwardAD
+_PRODUCT_COST = 3.8  # mul, truediv and pow on DualNumbers, whose rules combine both tangents
+_TANGENT_COST = 0.006  # per entry of the tangent vectors of ForwardAD
+_REVERSE_SETUP_COST = 5.0  # per call of ReverseAD
+_INPUT_COST = 3.2  # per variable traced as a Node in ReverseAD
+_RECORD_COST = 3.3  # recording a Node in the trace of ReverseAD
+_SWEEP_SETUP_COST = 12.0  # per reverse sweep
+_SWEEP_COST = 0.27  # per child of a Node, in a reverse sweep
+_PRODUCTS = ('mul', 'truediv', 'pow')
+
+
+def estimate_cost(var_names, func_list):
+    """Estimates the cost of differentiating functions in forward and reverse mode.
+
+    The estimate counts the operations each engine evaluates on the shared expression
+    graph: forward mode evaluates every operation once, carrying a tangent vector with one
+    entry per variable through the subterms that depend on a variable; reverse mode
+    records every operation once, then sweeps the subterms of each function depending on
+    any variable, or the union of them all at once when the functions share most of their
+    subterms. The operations are weighted by kind, and the fixed costs of each call and
+    of each variable are included, so a single function of many variables goes to
+    reverse mode and many functions of a few variables to forward mode.
+
+    Parameters
+    ------
+    var_names : list of str
+        names of the variables.
+    func_list : str, Expression, or list of str or Expression
+        (a list of) function(s) encoded as string(s) or parsed Expression(s).
+
+    Returns
+    ------
+    dict
+        the estimated costs, in arbitrary units, under the keys 'forward' and 'reverse'.
+
+    Examples
+    ------
+    >>> estimate_cost(['x', 'y'], ['x * y', 'exp(x)'])
+    {'forward': 54.024, 'reverse': 43.35}
+    """
+    graph = compile_graph(func_list)
+    var_names = list(var_names)
+    deps = graph.dependencies()
+    pattern = graph.sparsity(var_names)
+    ops = [i for i, node in enumerate(graph.nodes) if node.op not in ('var', 'const')]
+    active = [i for i in ops if deps[i]]
+    products = sum(1 for i in active if graph.nodes[i].op in _PRODUCTS)
+    scalar = _SCALAR_COST * (len(ops) - len(active))
+
+    forward = _FORWARD_SETUP_COST + _SEED_COST * len(var_names) + scalar \
+        + _PRODUCT_COST * products + _DUAL_COST * (len(active) - products) \
+        + _TANGENT_COST * len(var_names) * len(active)
+
+    reverse = _REVERSE_SETUP_COST + _INPUT_COST * len(var_names) + scalar + _RECORD_COST * len(active)
+    # a sweep visits every child of the Nodes it reaches, including those of other functions
+    children = [0] * len(graph.nodes)
+    for node in graph.nodes:
+        for a in node.args:
+            children[a] += 1
+    swept = [int(j) for j in np.flatnonzero(pattern.any(axis = 1))]
+    union = graph.cone(swept)
+    if len(swept) > 1 and sum(len(graph.cone([j])) for j in swept) > _BATCH_COST * len(union):
+        # the functions are swept together (see ReverseAD)
+        reverse += _SWEEP_SETUP_COST + _SWEEP_COST * _BATCH_COST * sum(children[i] for i in union)
+    else:
+        for j in swept:
+            reverse += _SWEEP_SETUP_COST + _SWEEP_COST * sum(children[i] for i in graph.cone([j]))
+
+    return {'forward': round(forward, 6), 'reverse': round(reverse, 6)}
+
+
+def register_engine(mode, engine):
+    """Registers an engine, making it available as a mode of AD and to autotune_mode().
+
+    Parameters
+    ------
+    mode : str
+        the name of the mode.
+    engine : class
+        the engine, constructed as engine(var_dict, func_list) and providing the
+        func_evals and Dpf attributes.
+    """
+    ENGINES[mode] = engine
+
+
+def autotune_mode(var_dict, func_list, repeat = 3):
+    """Returns the fastest registered engine, measured on a sample point.
+
+    Every engine in ENGINES is run `repeat` times at var_dict and the one with the lowest
+    best time is chosen; engines that raise an error at var_dict are left out. The choice
+    is remembered for the set of functions and variables, in memory and, if the persistent
+    cache is enabled (see `cache.set_cache_dir()`), on disk, so later calls do not measure
+    again.
+
+    Parameters
+    ------
+    var_dict : dict
+        the sample point, a dictionary of variables and their corresponding values.
+    func_list : str, Expression, or list of str or Expression
+        (a list of) function(s) encoded as string(s) or parsed Expression(s).
+    repeat : int, optional (default = 3)
+        the number of runs of each engine.
+
+    Returns
+    ------
+    str
+        the mode of the fastest engine.
+    dict or None
+        the best time in seconds of each engine that succeeded, or None if the choice
+        was cached.
+
+    Raises
+    ------
+    Exception
+        the error of the first engine, if every engine fails at var_dict.
+    """
+    # the shapes of the values are part of the key: not every engine supports array-valued points
+    shapes = tuple(np.shape(var_value) for var_value in var_dict.values())
+    key = cache.cache_key('mode', tuple(compile_graph(func_list).func_list), tuple(var_dict), shapes,
+                          tuple(sorted(ENGINES)))
+    mode = _tuned.get(key) or cache.load('mode', key)
+    if mode in ENGINES:
+        _tuned[key] = mode
+        return mode, None
+
+    timings = {}
+    errors = []
+    for name, engine in ENGINES.items():
+        best = float('inf')
+        try:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                engine(var_dict, func_list)
+                best = min(best, time.perf_counter() - start)
+        except Exception as error:
+            errors.append(error)  # the engine does not support the functions or the point
+            continue
+        timings[name] = best
+    if not timings:
+        raise errors[0]
+
+    mode = min(timings, key = timings.get)
+    _tuned[key] = mode
+    cache.store('mode', key, mode)
+    return mode, timings
 
 
 class AD:
     """Automatic Differentiation wrapper that a mode can be specified. 
 
     If the mode is left unspecified by the user, it automatically determines 
-    which mode to use based on the number of independent variables 
-    and the number of functions to differentiate.
+    which mode to use from the estimated cost of each mode (see estimate_cost()),
+    which accounts for the number of independent variables and functions as well as
+    the size, sharing and sparsity of the functions.
 
     Parameters
     ------
@@ -15,8 +183,17 @@ class AD:
         a dictionary of variables and their corresponding values
     func_list: str or list of str
         (a list of) function(s) encoded as string(s)
-    mode: {None, "forward", "f", "reverse", "r"}
-        string indicating mode of AD. Default is None.
+    mode: {None, "forward", "f", "reverse", "r", "codegen", "c", "tape", "t"}
+        string indicating mode of AD. Default is None. "codegen" differentiates through
+        generated straight-line code (see CodegenAD), "tape" is reverse mode on a flat
+        tape (see TapeAD). Engines added with register_engine()
+        are available under their mode.
+    autotune: bool, optional (default = False)
+        if True and mode is None, the mode is chosen by timing the engines at var_dict
+        instead of by estimated cost (see autotune_mode()).
+    chunk_size: int, optional (default = None)
+        the number of variables seeded per pass in forward mode (see ForwardAD);
+        ignored by the other modes.
 
     Attributes
     ------
@@ -24,29 +201,36 @@ class AD:
         the evaluation of function(s) at the given point 
     Dpf: numpy.array
         derivatives of function(s) evaluated at the given point
-    res: ForwardAD or ReverseAD objects
-        ForwardAD or ReverseAD objects that the AD instance delegates diffirentiation tasks to
+    res: ForwardAD, ReverseAD, CodegenAD or TapeAD objects
+        ForwardAD, ReverseAD, CodegenAD or TapeAD objects that the AD instance delegates diffirentiation tasks to
+    cost: dict or None
+        the estimated costs of forward and reverse mode the mode was chosen from; None if
+        the mode was specified or autotuned
+    timings: dict or None
+        the best time in seconds of each engine if the mode was autotuned; None otherwise,
+        including when the autotuned mode was cached
 
     Examples
     --------
-    >>> var_dict = {'x': 1, 'y': 1}
-    >>> func_list = ['x**2 + y**2', 'exp(x + y)']
+    >>> var_dict = {'x': 1, 'y': 2}
+    >>> func_list = ['x**2 + y**2', 'exp(x + y)', 'tan(x + y) * sqrt(y)']
     >>> ad = AD(var_dict, func_list)
-    Number of variables <= number of functions: forward mode by default.
+    Estimated cost of forward mode 72.896 <= reverse mode 80.55: forward mode by default.
     >>> ad()
     ===== Forward AD =====
-    Vars: {'x': 1, 'y': 1}
-    Funcs: ['x**2 + y**2', 'exp(x + y)']
+    Vars: {'x': 1, 'y': 2}
+    Funcs: ['x**2 + y**2', 'exp(x + y)', 'tan(x + y) * sqrt(y)']
     -----
-    Func evals: [2, 7.38905609893065]
+    Func evals: [5, 20.085536923187668, -0.20159125448504428]
     Gradient:
-    [[2.        2.       ]
-     [7.3890561 7.3890561]]
+    [[ 2.          4.        ]
+     [20.08553692 20.08553692]
+     [ 1.4429497   1.39255189]]
 
     >>> var_dict = {'x': 1, 'y': 2, 'z': 3}
     >>> func_list = ['tan(x) + exp(y) + sqrt(z)']
     >>> ad = AD(var_dict, func_list)
-    Number of variables > number of functions: reverse mode by default.
+    Estimated cost of forward mode 66.69 > reverse mode 44.99: reverse mode by default.
     >>> ad()
     ===== Reverse AD =====
     Vars: {'x': 1, 'y': 2, 'z': 3}
@@ -70,30 +254,48 @@ class AD:
      [20.08553692 20.08553692]
      [ 1.4429497   1.39255189]]
     """
-    def __init__(self, var_dict, func_list, mode = None):
+    def __init__(self, var_dict, func_list, mode = None, autotune = False, chunk_size = None):
         # check mode param valid
-        if (mode is not None) and (mode not in ("forward", "f", "reverse", "r")):
-            raise ValueError(f"Mode can be either forward, f, reverse, r, or None.") 
-        
-        self.mode = mode
-        if self.mode is None: # if None, choose mode based on the criterion mentioned above
-            num_var = len(var_dict)
-            num_func = 1  # case: func_list is one string
-            if isinstance(func_list, list):
-                num_func = len(func_list)
+        if (mode is not None) and (mode not in ENGINES) and (mode not in _ALIASES):
+            raise ValueError(f"Mode can be either {', '.join(f'{m}, {a}' for a, m in _ALIASES.items())}, "
+                             f"a registered mode, or None.")
 
-            if num_var <= num_func:
+        self.mode = mode
+        self.cost = None
+        self.timings = None
+        if self.mode is None and autotune: # measure the engines, or reuse a measured choice
+            self.mode, self.timings = autotune_mode(var_dict, func_list)
+            print(f"Autotuned: {self.mode} mode.")
+        elif self.mode is None: # if None, choose the mode with the lower estimated cost
+            self.cost = estimate_cost(list(var_dict), func_list)
+            if self.cost['forward'] <= self.cost['reverse']:
                 self.mode = "forward"
-                print('Number of variables <= number of functions: forward mode by default.')
+                print(f"Estimated cost of forward mode {self.cost['forward']} <= reverse mode {self.cost['reverse']}: forward mode by default.")
             else:
                 self.mode = "reverse"
-                print('Number of variables > number of functions: reverse mode by default.')
+                print(f"Estimated cost of forward mode {self.cost['forward']} > reverse mode {self.cost['reverse']}: reverse mode by default.")
 
-        if self.mode in ("forward", "f"):
-            self.res = ForwardAD(var_dict, func_list)
+        engine = ENGINES[_ALIASES.get(self.mode, self.mode)]
+        if chunk_size is not None and issubclass(engine, ForwardAD):
+            self.res = engine(var_dict, func_list, chunk_size = chunk_size)
         else:
-            self.res = ReverseAD(var_dict, func_list)
+            self.res = engine(var_dict, func_list)
+
+        self.func_evals = self.res.func_evals
+        self.Dpf = self.res.Dpf
+
+    def update(self, **changed_vars):
+        """Re-evaluates at a point where only the given variables changed.
+
+        Only the functions depending on a changed variable are evaluated again
+        (see ForwardAD.update() and ReverseAD.update()).
 
+        Parameters
+        ------
+        changed_vars : int or float
+            new values of variables, passed as keyword arguments.
+        """
+        self.res.update(**changed_vars)
         self.func_evals = self.res.func_evals
         self.Dpf = self.res.Dpf
 
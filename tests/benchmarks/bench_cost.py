@@ -0,0 +1,57 @@
+"""Benchmark of the mode chosen by estimate_cost().
+
+Times ForwardAD and ReverseAD on functions of various numbers of variables and functions,
+and prints the estimated costs next to the measured times, marking the cases where the
+estimate chooses the slower engine. The constants of the cost model in wrapperAD.py were
+fitted to such measurements. Run from the root of the repository:
+
+    python tests/benchmarks/bench_cost.py
+"""
+
+import sys
+sys.path.append("./src/")
+
+import timeit
+
+from team20ad.expression import compile_graph
+from team20ad.forwardAD import ForwardAD
+from team20ad.reverseAD import ReverseAD
+from team20ad.wrapperAD import estimate_cost
+
+
+def make_problems():
+    """Returns (name, var_dict, func_list) triples of various shapes."""
+    problems = []
+    for n in (3, 10, 30, 60, 120):
+        var_dict = {f'x{i}': 0.1 + 0.01 * i for i in range(n)}
+        problems.append((f"chain, n = {n}, m = 1", var_dict,
+                         [' + '.join(f'sin(x{i}) * x{i + 1}' for i in range(n - 1))]))
+        problems.append((f"diagonal, n = m = {n}", var_dict,
+                         [f'exp(x{i}) * x{i} + cos(x{i})' for i in range(n)]))
+        if n <= 60:  # reverse mode takes seconds beyond
+            problems.append((f"dense, n = m = {n}", var_dict,
+                             [' + '.join(f'x{i} * {j + 1}' for i in range(n)) + f' + sin(x{j})' for j in range(n)]))
+    for m in (5, 30, 100):
+        problems.append((f"one variable, m = {m}", {'x': 0.3}, [f'sin(x * {j + 1}) + x ** 2' for j in range(m)]))
+    return problems
+
+
+def best_time(engine, var_dict, func_list, number = 20):
+    """Returns the best time of engine(var_dict, func_list) in microseconds, with garbage collection on."""
+    timer = timeit.Timer(lambda: engine(var_dict, func_list), 'gc.enable()')
+    return min(timer.repeat(5, number)) / number * 1e6
+
+
+def main():
+    print(f"{'problem':<24}{'forward (us)':>14}{'reverse (us)':>14}{'est. forward':>14}{'est. reverse':>14}")
+    for name, var_dict, func_list in make_problems():
+        compile_graph(func_list)
+        forward, reverse = best_time(ForwardAD, var_dict, func_list), best_time(ReverseAD, var_dict, func_list)
+        cost = estimate_cost(list(var_dict), func_list)
+        wrong = (cost['forward'] <= cost['reverse']) != (forward <= reverse)
+        print(f"{name:<24}{forward:>14.1f}{reverse:>14.1f}{cost['forward']:>14.1f}{cost['reverse']:>14.1f}"
+              + ("  slower engine chosen" if wrong else ""))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Micro-benchmark of the DualNumber operators.
+
+Prints the cost of each operator in nanoseconds per call, for a DualNumber combined with
+another DualNumber and with a float, and the time of a ForwardAD evaluation dominated by
+DualNumber arithmetic. Run from the root of the repository:
+
+    python tests/benchmarks/bench_dualNumber.py
+"""
+
+import sys
+sys.path.append("./src/")
+
+import timeit
+
+from team20ad.dualNumber import DualNumber
+from team20ad.forwardAD import ForwardAD
+
+
+OPERATORS = {
+    'neg': '-x',
+    'add': 'x + {}',
+    'radd': '{} + x',
+    'sub': 'x - {}',
+    'rsub': '{} - x',
+    'mul': 'x * {}',
+    'rmul': '{} * x',
+    'truediv': 'x / {}',
+    'rtruediv': '{} / x',
+    'pow': 'x ** {}',
+    'eq': 'x == {}',
+}
+
+
+def per_call(stmt, namespace, number = 200000, repeat = 5):
+    """Returns the best time of a statement in nanoseconds per call."""
+    timer = timeit.Timer(stmt, globals = namespace)
+    return min(timer.repeat(repeat, number)) / number * 1e9
+
+
+def main():
+    namespace = {'x': DualNumber(1.5, 1.0), 'y': DualNumber(0.5, 2.0), 'c': 2.5}
+
+    print(f"{'operator':<10}{'dual-dual (ns)':>16}{'dual-float (ns)':>17}")
+    for name, stmt in OPERATORS.items():
+        dual = per_call(stmt.format('y'), namespace)
+        scalar = per_call(stmt.format('c'), namespace) if '{}' in stmt else float('nan')
+        print(f"{name:<10}{dual:>16.1f}{scalar:>17.1f}")
+
+    func = ' + '.join(f"x{i} * x{i + 1} / (x{i} + 1) - x{i} ** 2" for i in range(50))
+    var_dict = {f"x{i}": 0.5 + i / 100 for i in range(51)}
+    ForwardAD(var_dict, func)  # compile the graph once
+    elapsed = per_call(lambda: ForwardAD(var_dict, func, chunk_size = 1), {}, number = 5, repeat = 3)
+    print(f"ForwardAD, 51 variables, 250 operations, scalar tangents: {elapsed / 1e6:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Micro-benchmark of the functions of elementary.py.
+
+Prints the cost of each function in nanoseconds per call on a float, a DualNumber, an
+array of 1000 points and a DualArray of 1000 points. Run from the root of the repository:
+
+    python tests/benchmarks/bench_elementary.py
+"""
+
+import sys
+sys.path.append("./src/")
+
+import timeit
+
+import numpy as np
+
+from team20ad import elementary
+from team20ad.dualNumber import DualNumber, DualArray
+
+
+FUNCTIONS = ['sqrt', 'exp', 'log', 'sin', 'cos', 'tan', 'arcsin', 'arccos', 'arctan',
+             'sinh', 'cosh', 'tanh', 'logistic']
+
+
+def per_call(func, arg, number):
+    """Returns the best time of func(arg) in nanoseconds per call."""
+    timer = timeit.Timer(lambda: func(arg))
+    return min(timer.repeat(5, number)) / number * 1e9
+
+
+def main():
+    points = np.linspace(0.1, 0.9, 1000)
+    args = {'float': (0.5, 100000), 'DualNumber': (DualNumber(0.5, 1.), 100000),
+            'ndarray': (points, 2000), 'DualArray': (DualArray(points), 2000)}
+
+    print(f"{'function':<10}" + ''.join(f"{name + ' (ns)':>18}" for name in args))
+    for name in FUNCTIONS:
+        func = getattr(elementary, name)
+        times = [per_call(func, arg, number) for arg, number in args.values()]
+        print(f"{name:<10}" + ''.join(f"{t:>18.1f}" for t in times))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark of the reverse mode engines on a large graph.
+
+Prints the time and the peak memory allocated by ReverseAD (Node objects) and TapeAD (a
+flat tape) differentiating functions of about 10^5 operations in total, then the time of
+re-evaluating at a new point with update(), which TapeAD does by replaying its tape. Run
+from the root of the repository:
+
+    python tests/benchmarks/bench_tape.py
+"""
+
+import sys
+sys.path.append("./src/")
+
+import time
+import tracemalloc
+
+from team20ad.reverseAD import ReverseAD
+from team20ad.tapeAD import TapeAD
+
+
+def make_problem(num_funcs = 500, terms = 50):
+    """Returns a point and functions chaining `terms` terms of about four operations each."""
+    var_dict = {f'x{i}': 0.1 + i / num_funcs for i in range(num_funcs)}
+    func_list = [' + '.join(f'sin(x{i} * {k + 1}) * x{(i + k) % num_funcs}' for k in range(terms))
+                 for i in range(num_funcs)]
+    return var_dict, func_list
+
+
+def measure(engine, var_dict, func_list):
+    """Returns the time in seconds of one run and its peak memory in MB, measured in another run."""
+    start = time.perf_counter()
+    engine(var_dict, func_list)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    engine(var_dict, func_list)
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    var_dict, func_list = make_problem()
+    ReverseAD(var_dict, func_list)  # parse the functions once, outside of the measurements
+
+    print(f"{'engine':<10}{'time (s)':>12}{'peak (MB)':>12}")
+    for engine in (ReverseAD, TapeAD):
+        elapsed, peak = measure(engine, var_dict, func_list)
+        print(f"{engine.__name__:<10}{elapsed:>12.3f}{peak:>12.1f}")
+
+    print(f"\n{'engine':<10}{'update (s)':>12}")
+    for engine in (ReverseAD, TapeAD):
+        ad = engine(var_dict, func_list)
+        start = time.perf_counter()
+        ad.update(**{name: value + 0.01 for name, value in var_dict.items()})
+        print(f"{engine.__name__:<10}{time.perf_counter() - start:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+import sys
+sys.path.append("./src/")
+
+import os
+import pickle
+import pytest
+import numpy as np
+import team20ad
+from team20ad import cache, codegenAD, expression, wrapperAD
+from team20ad.wrapperAD import AD
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.delenv("TEAM20AD_CACHE_DIR", raising = False)
+    cache.set_cache_dir(str(tmp_path))
+    expression._compile_graph.cache_clear()
+    codegenAD._compile_kernel.cache_clear()
+    wrapperAD._tuned.clear()
+    yield str(tmp_path)
+    cache.set_cache_dir(None)
+    expression._compile_graph.cache_clear()
+    codegenAD._compile_kernel.cache_clear()
+    wrapperAD._tuned.clear()
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.delenv("TEAM20AD_CACHE_DIR", raising = False)
+    assert cache.get_cache_dir() is None
+    cache.store('graph', 'key', 1)
+    assert cache.load('graph', 'key') is None
+    cache.clear_cache()
+
+
+def test_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEAM20AD_CACHE_DIR", str(tmp_path))
+    assert cache.get_cache_dir() == str(tmp_path)
+
+
+def test_store_load(cache_dir):
+    key = cache.cache_key('graph', ('x',))
+    assert key == cache.cache_key('graph', ('x',))
+    assert key != cache.cache_key('graph', ('y',))
+    assert cache.load('graph', key) is None
+
+    cache.store('graph', key, {'a': 1})
+    assert cache.load('graph', key) == {'a': 1}
+    assert os.listdir(cache_dir) == [f"graph-{key}.pkl"]
+
+    cache.clear_cache()
+    assert os.listdir(cache_dir) == []
+
+
+def test_invalid_entries(cache_dir):
+    key = cache.cache_key('graph', ('x',))
+    path = os.path.join(cache_dir, f"graph-{key}.pkl")
+    with open(path, 'wb') as f:
+        pickle.dump(('0.0.0', {'a': 1}), f)
+    assert cache.load('graph', key) is None  # written by another version
+
+    with open(path, 'wb') as f:
+        f.write(b'corrupt')
+    assert cache.load('graph', key) is None
+
+
+def test_warm_graph(cache_dir, monkeypatch):
+    funcs = ['x * exp(y)', 'sin(x) * exp(y)']
+    ad = AD({'x': 1, 'y': 2}, funcs, mode = 'r')
+    assert len(os.listdir(cache_dir)) == 1
+
+    # a new process starts with a cold in-memory cache but never parses the functions again
+    expression._compile_graph.cache_clear()
+    monkeypatch.setattr(expression, 'compile_func', None)
+    warm = AD({'x': 1, 'y': 2}, funcs, mode = 'r')
+    assert warm.res.graph is not ad.res.graph
+    assert [node.op for node in warm.res.graph.nodes] == [node.op for node in ad.res.graph.nodes]
+    assert np.allclose(warm.Dpf, ad.Dpf)
+
+
+def test_warm_kernel(cache_dir, monkeypatch):
+    ad = AD({'x': 1, 'y': 2}, ['x * exp(y)'], mode = 'c')
+    assert len(os.listdir(cache_dir)) == 2
+
+    codegenAD._compile_kernel.cache_clear()
+    monkeypatch.setattr(codegenAD, 'generate_source', None)
+    warm = AD({'x': 1, 'y': 2}, ['x * exp(y)'], mode = 'c')
+    assert warm.res.kernel.source == ad.res.kernel.source
+    assert np.allclose(warm.Dpf, ad.Dpf)
+
+    # another variable ordering is another kernel
+    monkeypatch.undo()
+    AD({'y': 2, 'x': 1}, ['x * exp(y)'], mode = 'c')
+    assert len(os.listdir(cache_dir)) == 3
+
+
+def test_version_invalidates(cache_dir, monkeypatch):
+    key = cache.cache_key('graph', ('x',))
+    cache.store('graph', key, 1)
+    monkeypatch.setattr(cache, '__version__', team20ad.__version__ + '.post1')
+    assert cache.cache_key('graph', ('x',)) != key
+    assert cache.load('graph', key) is None
+
+
+def test_autotune_cached(cache_dir):
+    ad = AD({'x': 1, 'y': 2}, ['x * y', 'sin(x)'], autotune = True)
+    assert ad.timings is not None
+    assert any(name.startswith('mode-') for name in os.listdir(cache_dir))
+
+    # another process only finds the choice on disk
+    wrapperAD._tuned.clear()
+    ad2 = AD({'x': 3, 'y': 4}, ['x * y', 'sin(x)'], autotune = True)
+    assert ad2.mode == ad.mode
+    assert ad2.timings is None
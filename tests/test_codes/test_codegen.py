@@ -0,0 +1,124 @@
+import sys
+sys.path.append("./src/")
+
+import importlib.util
+import pytest
+import numpy as np
+from team20ad.codegenAD import *
+from team20ad.forwardAD import ForwardAD
+from team20ad.wrapperAD import AD
+
+
+class TestCodegenAD:
+
+    def test_CodegenAD(self):
+        vars = {'x': 0.5, 'y': 4}
+        fcts = ['cos(x) + y ** 2', '2 * log(y) - sqrt(x)/3', 'sqrt(x)/3', '3 * sinh(x) - 4 * arcsin(x) + 5']
+        z = CodegenAD(vars, fcts)
+
+        assert np.array_equal(np.around(z.func_evals, 4), np.array([16.8776, 2.5369, 0.2357, 4.4689]))
+        assert np.array_equal(np.around(z.Dpf, 4),
+                              np.array([[-0.4794, 8.], [-0.2357, 0.5], [0.2357, 0.], [-1.2359, 0.]]))
+
+    def test_matches_forward(self):
+        vars = {'x': 0.3, 'y': 1.5, 'z': 2}
+        fcts = ['exp(x * y) / z - -x', 'tan(x) * cos(y) + arccos(x) - arctan(z)', 'x ** y + 2 ** z',
+                'cosh(x) * tanh(y) / sinh(z)', 'log(y, 2) + logistic(x, 2, k = 3) + logistic(z)',
+                'abs(-x) * y ** -2', 'x', '3']
+        z = CodegenAD(vars, fcts)
+        f = ForwardAD(vars, fcts)
+        assert np.allclose(z.func_evals, f.func_evals)
+        assert np.allclose(z.Dpf, f.Dpf)
+
+    def test_ordering(self):
+        z = CodegenAD({'y': 2, 'x': 3}, ['x * y ** 2'])
+        assert z.func_evals == [12]
+        assert np.array_equal(z.Dpf, [[12, 4]])
+
+    def test_call(self, capfd):
+        z = CodegenAD({'x': 1, 'y': 1}, ['x**2 + y**2', 'exp(x + y)'])
+        z()
+        out, err = capfd.readouterr()
+        assert out.startswith("===== Codegen AD =====")
+
+    def test_invalid(self):
+        with pytest.raises(TypeError):
+            CodegenAD(['x'], 'x')
+        with pytest.raises(NameError):
+            CodegenAD({'x': 1}, 'x * y')
+        with pytest.raises(ValueError):
+            CodegenAD({'x': 1, '_y': 2}, 'x * _y')
+        with pytest.raises(ValueError):
+            CodegenAD({'x': 2}, 'log(3, x)')
+
+
+def test_generate_source():
+    source = generate_source(['x', 'y'], ['x * y', 'sin(x)'])
+    assert source == ("import math as _math\n\n\n"
+                      "def ad_kernel(x, y):\n"
+                      "    _v2 = x * y\n"
+                      "    _v3 = _math.sin(x)\n"
+                      "    _p3_0 = _math.cos(x)\n"
+                      "    return [_v2, _v3], [[y, x], [_p3_0, 0.0]]\n")
+
+    # no structurally zero partial is computed
+    source = generate_source(['a', 'b', 'c'], ['exp(a) + b', 'c * 2'])
+    assert '_d' not in source
+    assert 'return [_v3, _v6], [[_v1, 1.0, 0.0], [0.0, 0.0, 2]]' in source
+
+
+def test_compile_kernel():
+    kernel = compile_kernel(['x', 'y'], ['x * y', 'x - y'], name = 'f')
+    assert kernel is compile_kernel(['x', 'y'], ['x * y', 'x - y'], name = 'f')
+    assert kernel.__name__ == 'f'
+    assert kernel.source == generate_source(['x', 'y'], ['x * y', 'x - y'], name = 'f')
+    assert kernel(2, 3) == ([6, -1], [[3, 2], [1.0, -1.0]])
+    assert kernel(1., 1.) == ([1., 0.], [[1., 1.], [1.0, -1.0]])
+
+
+def test_write_module(tmp_path):
+    path = tmp_path / "kernel.py"
+    write_module(str(path), ['x', 'y'], ['x * exp(y)'], name = 'jac')
+    spec = importlib.util.spec_from_file_location("kernel", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    vals, jac = module.jac(2., 0.)
+    assert vals == [2.]
+    assert jac == [[1., 2.]]
+
+
+def test_AD_codegen():
+    z = AD({'x': 1, 'y': 2}, ['x**2 + y**2', 'exp(x + y)'], mode = 'c')
+    assert isinstance(z.res, CodegenAD)
+    assert np.allclose(z.Dpf, [[2, 4], [np.exp(3), np.exp(3)]])
+
+
+def test_non_finite():
+    # infinite constants are written as float('inf'), and exp, sinh and cosh overflow to inf
+    for f, x, value, derivative in (('x * 1e309', 1., np.inf, np.inf), ('x + exp(1000)', 1., np.inf, 1.),
+                                    ('exp(x)', 800., np.inf, np.inf), ('sinh(x)', -800., -np.inf, np.inf),
+                                    ('cosh(x)', 800., np.inf, np.inf), ('logistic(x)', -800., 0., 0.)):
+        z = CodegenAD({'x': x}, f)
+        assert z.func_evals == [value]
+        assert z.Dpf[0, 0] == derivative
+    assert "float('-inf')" in generate_source(['x'], 'x * -1e309')
+
+
+def test_domain():
+    # the generated code raises the errors of ForwardAD outside the domains of the functions
+    for f, x in (('sqrt(x)', 0.), ('sqrt(x)', -1.), ('log(x)', -1.), ('log(x, 2)', 0.), ('arcsin(x)', 1.),
+                 ('arccos(x)', -2.), ('tan(x)', np.pi / 2), ('x + arcsin(2 * x)', 0.5)):
+        with pytest.raises(ValueError) as expected:
+            ForwardAD({'x': x}, f)
+        with pytest.raises(ValueError) as error:
+            CodegenAD({'x': x}, f)
+        assert str(error.value) == str(expected.value)
+
+    # each operand is checked once per kind of domain
+    assert generate_source(['x'], 'sqrt(x) + log(x)').count('raise ValueError') == 1
+    z = CodegenAD({'x': 0.5}, ['sqrt(x) + log(x, 2)', 'arcsin(x)'])
+    z.update(x = 0.25)
+    assert np.allclose(z.Dpf, ForwardAD({'x': 0.25}, ['sqrt(x) + log(x, 2)', 'arcsin(x)']).Dpf)
+    with pytest.raises(ValueError):
+        z.update(x = -0.25)
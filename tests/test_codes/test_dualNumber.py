@@ -3,7 +3,7 @@ sys.path.append("./src/")
 
 import pytest
 import numpy as np
-from team20ad.dualNumber import DualNumber
+from team20ad.dualNumber import DualNumber, SparseTangent
 from team20ad.elementary import *
 from team20ad.forwardAD import *
 
@@ -200,3 +200,190 @@ class TestDualNumber:
         assert y.real == 3
         assert y.dual == 1
 
+
+        y = abs(DualNumber(-3, np.array([1., 2.])))
+        assert y.real == 3
+        assert np.array_equal(y.dual, [-1., -2.])
+
+    def test_vector_dual(self):
+        x = DualNumber(3, np.array([1., 0.]))
+        y = DualNumber(2, np.array([0., 1.]))
+
+        z = x * y + x / y - y ** 2
+        assert z.real == 3 * 2 + 3 / 2 - 4
+        assert np.allclose(z.dual, [2 + 1 / 2, 3 - 3 / 4 - 4])
+
+        z = 2 ** x + exp(y) * sin(x)
+        assert np.allclose(z.dual, [8 * np.log(2) + np.exp(2) * np.cos(3), np.exp(2) * np.sin(3)])
+
+        assert x == DualNumber(3, np.array([1., 0.]))
+        assert x != DualNumber(3, np.array([0., 1.]))
+        assert DualNumber(3, np.zeros(2)) == 3
+
+    def test_operand_types(self):
+        x = DualNumber(3, 1)
+        with pytest.raises(AttributeError):
+            x.extra = 1
+
+        # subclasses of the supported scalars take the general path
+        assert x + True == DualNumber(4, 1)
+        assert x * np.float64(2.) == DualNumber(6., 2.)
+        assert 1 / x == DualNumber(1 / 3, -1 / 9)
+
+        for other in ('2', [2], None, np.int64(2)):
+            with pytest.raises(TypeError):
+                x + other
+            with pytest.raises(TypeError):
+                x / other
+        with pytest.raises(TypeError):
+            x ** '2'
+        with pytest.raises(TypeError):
+            x == '3'
+
+
+class TestDualArray:
+
+    def test_initializer(self):
+        x = DualArray([1, 2])
+        assert np.array_equal(x.dual, [1., 1.])
+        assert x.shape == (2,)
+        assert len(x) == 2
+        with pytest.raises(TypeError):
+            DualArray(["a", "b"])
+        with pytest.raises(ValueError):
+            DualArray([1., 2.], [1., 2., 3.])
+
+    def test_arithmetic(self):
+        # each point matches the scalar DualNumber rules
+        a, b = np.array([1., 2., -3.]), np.array([0.5, 4., 2.])
+        x, y = DualArray(a, [1., 1., 1.]), DualArray(b, [0., 2., 1.])
+        for z, f in [(x + y, lambda p, q: p + q), (x - y, lambda p, q: p - q), (x * y, lambda p, q: p * q),
+                     (x / y, lambda p, q: p / q), (x ** y, lambda p, q: p ** q), (2 ** x, lambda p, q: 2 ** p),
+                     (3 - x, lambda p, q: 3 - p), (3 / x, lambda p, q: 3 / p), (-x, lambda p, q: -p),
+                     (abs(x), lambda p, q: abs(p)), (x * b, lambda p, q: p * q.real), (b + x, lambda p, q: q.real + p)]:
+            for k in range(3):
+                expected = f(DualNumber(a[k], 1.), DualNumber(b[k], y.dual[k]))
+                assert np.isclose(z.real[k], expected.real)
+                assert np.isclose(z.dual[k], expected.dual)
+
+        with pytest.raises(ZeroDivisionError):
+            x / DualArray([1., 0., 1.])
+        with pytest.raises(TypeError):
+            x + "string"
+
+    def test_directions(self):
+        # a leading axis of the dual part holds several directions at every point
+        x = DualArray([1., 2.], [[1., 1.], [0., 0.]])
+        y = DualArray([3., 4.], [[0., 0.], [1., 1.]])
+        z = x * y
+        assert np.array_equal(z.dual, [[3., 4.], [1., 2.]])
+        assert np.array_equal(z[1].dual, [4., 2.])
+
+    def test_compare(self):
+        x = DualArray([1., 2.])
+        assert np.array_equal(x < 2, [True, False])
+        assert np.array_equal(x >= DualArray([0., 3.]), [True, False])
+        assert np.array_equal(x == DualArray([1., 2.], [1., 0.]), [True, False])
+        assert np.array_equal(x != DualArray([1., 2.], [1., 0.]), [False, True])
+
+
+class TestUfuncs:
+
+    def test_dual_number(self):
+        x = DualNumber(0.5)
+        y = np.sin(x) * np.exp(x) + np.power(x, 2) - np.float64(3) * x
+        expected = sin(x) * exp(x) + x ** 2 - 3 * x
+        assert y == expected
+        assert np.abs(DualNumber(-2., 1.)) == DualNumber(2., -1.)
+        assert np.float64(0.5) < DualNumber(1.)
+
+        # ufuncs without a DualNumber rule are not supported
+        with pytest.raises(TypeError):
+            np.floor(x)
+
+    def test_object_arrays(self):
+        x = np.array([DualNumber(0.1), DualNumber(0.2, 2.)], dtype = object)
+        y = np.multiply(x, DualNumber(3.))
+        assert isinstance(y, np.ndarray)
+        assert y[0] == DualNumber(0.1 * 3, 3 + 0.1)
+        assert y[1] == DualNumber(0.2 * 3, 6 + 0.2)
+
+        y = DualNumber(2.) * np.array([1., 2.])
+        assert y[1] == DualNumber(4., 2.)
+
+        packed = DualArray.from_duals(x)
+        assert np.array_equal(packed.real, [0.1, 0.2])
+        assert np.array_equal(packed.dual, [1., 2.])
+        assert packed.to_duals()[1] == x[1]
+
+    def test_dual_array(self):
+        x = DualArray([0.1, 0.2, 0.3])
+        assert np.allclose(np.sin(x).dual, np.cos([0.1, 0.2, 0.3]))
+        assert isinstance(np.array([1., 2., 3.]) * x, DualArray)
+
+        total = np.sum(x * x)
+        assert np.isclose(total.real, 0.14)
+        assert np.isclose(total.dual, 1.2)
+        assert np.isclose(np.mean(x).real, 0.2)
+
+        # gradient of the dot product with a constant vector
+        x = DualArray([1., 2.], np.eye(2))
+        y = np.dot(x, np.array([3., 4.]))
+        assert y.real == 11
+        assert np.array_equal(y.dual, [3., 4.])
+        y = np.dot(np.array([[1., 2.], [3., 4.]]), x)
+        assert np.array_equal(y.dual, [[1., 3.], [2., 4.]])
+
+    def test_array_functions(self):
+        x = DualNumber(2., np.array([1., 0.]))
+        y = DualNumber(3., np.array([0., 1.]))
+        z = np.dot(np.array([x, y]), np.array([x, y]))
+        assert z == DualNumber(13., np.array([4., 6.]))
+        assert np.sum(x) == x
+
+
+class TestSparseTangent:
+
+    def test_tangent(self):
+        a = SparseTangent({0: 1., 3: 2.})
+        b = SparseTangent({3: 1., 5: 4.})
+        assert repr(a) == "SparseTangent({0: 1.0, 3: 2.0})"
+        assert len(a) == 2
+        assert (a + b).entries == {0: 1., 3: 3., 5: 4.}
+        assert (a - b).entries == {0: 1., 3: 1., 5: -4.}
+        assert (2 * a).entries == {0: 2., 3: 4.}
+        assert (np.float64(2.) * a).entries == {0: 2., 3: 4.}
+        assert (np.int64(2) * a).entries == {0: 2., 3: 4.}
+        assert (a / np.float32(2.)).entries == {0: 0.5, 3: 1.}
+        assert np.int64(0) + a is a
+        assert (a / 2).entries == {0: 0.5, 3: 1.}
+        assert (-a).entries == {0: -1., 3: -2.}
+        assert 0 + a is a
+        assert np.array_equal(a.indices, [0, 3])
+        assert np.array_equal(a.toarray(4), [1., 0., 0., 2.])
+
+        assert a == SparseTangent({0: 1., 3: 2., 4: 0.})
+        assert a != b
+        assert SparseTangent({1: 0.}) == 0
+        assert a != 0
+
+        with pytest.raises(TypeError):
+            a + 1
+        with pytest.raises(TypeError):
+            a * a
+        with pytest.raises(TypeError):
+            a / '2'
+
+    def test_dual_number(self):
+        # the DualNumber rules and elementary functions carry sparse tangents unchanged
+        x = DualNumber(0.5, SparseTangent({0: 1.}))
+        y = DualNumber(2., SparseTangent({9: 1.}))
+        z = sin(x) * y ** 2 + exp(y) / x - sqrt(x) + 3
+        dense = sin(DualNumber(0.5, np.array([1., 0.]))) * DualNumber(2., np.array([0., 1.])) ** 2 \
+            + exp(DualNumber(2., np.array([0., 1.]))) / DualNumber(0.5, np.array([1., 0.])) \
+            - sqrt(DualNumber(0.5, np.array([1., 0.]))) + 3
+        assert np.isclose(z.real, dense.real)
+        assert np.array_equal(z.dual.indices, [0, 9])
+        assert np.allclose(z.dual.values, dense.dual)
+        assert abs(-x).dual == x.dual
+        assert x == DualNumber(0.5, SparseTangent({0: 1.}))
@@ -0,0 +1,201 @@
+import sys
+sys.path.append("./src/")
+
+import pytest
+import numpy as np
+from team20ad.expression import *
+from team20ad.forwardAD import ForwardAD
+from team20ad.reverseAD import ReverseAD
+
+
+def test_expression():
+    f = Expression('x**2 + y')
+    assert f.variables == ['x', 'y']
+    assert repr(f) == "Expression('x**2 + y')"
+
+    with pytest.raises(TypeError):
+        Expression(1)
+    with pytest.raises(SyntaxError):
+        Expression('x +')
+
+
+def test_compile_func_cached():
+    assert compile_func('sin(x) * y') is compile_func('sin(x) * y')
+
+    f = Expression('exp(x)')
+    exprs = compile_func_list([f, 'sin(x) * y'])
+    assert exprs[0] is f
+    assert exprs[1] is compile_func('sin(x) * y')
+    assert compile_func_list('x')[0].func == 'x'
+
+    with pytest.raises(TypeError):
+        compile_func_list(['x', 2])
+    with pytest.raises(TypeError):
+        compile_func_list(2)
+
+
+def test_graph_nodes():
+    g = compile_graph(['-x * 2.5', '+y / abs(x)'])
+    assert g is compile_graph(['-x * 2.5', '+y / abs(x)'])
+    assert repr(g) == "ExpressionGraph(['-x * 2.5', '+y / abs(x)'])"
+    assert g.var_names == ['x', 'y']
+    assert [node.op for node in g.nodes] == ['var', 'neg', 'const', 'mul', 'var', 'abs', 'truediv']
+    assert g.outputs == [3, 6]
+    assert len(g) == 7
+    assert repr(g.nodes[0]) == "ExprNode('var', value='x')"
+    assert repr(g.nodes[3]) == "ExprNode('mul', args=(1, 2))"
+    assert g.cone([0]) == [0, 1, 2, 3]
+
+
+def test_graph_shared_subterms():
+    g = compile_graph(['exp(x + y) * sqrt(z)', 'sqrt(z) - exp(y + x)', 'exp(x + y)'])
+    assert [node.op for node in g.nodes] == ['var', 'var', 'add', 'exp', 'var', 'sqrt', 'mul', 'sub']
+    assert g.outputs == [6, 7, 3]
+    assert g.cone([2]) == [0, 1, 2, 3]
+
+    # constants are merged by type and value
+    g = compile_graph(['x * 2 + x * 2.0', 'x * 2'])
+    assert [node.op for node in g.nodes] == ['var', 'const', 'mul', 'const', 'mul', 'add']
+    assert g.outputs == [5, 2]
+
+
+def test_graph_folding():
+    g = compile_graph(['2 * 3 * x', 'x * (sqrt(4) - 1)', 'log(8, 2) + exp(0)'])
+    assert [node.op for node in g.nodes] == ['const', 'var', 'mul', 'const']
+    assert g.nodes[0].value == 6
+    assert g.outputs == [2, 1, 3]
+    assert g.nodes[3].value == 4.0 and type(g.nodes[3].value) is float
+
+    # errors are left to the evaluation
+    g = compile_graph(['sqrt(-1) + x', '1 / 0'])
+    assert [node.op for node in g.nodes] == ['const', 'const', 'sqrt', 'var', 'add', 'const', 'truediv']
+    with pytest.raises(ValueError):
+        ForwardAD({'x': 1}, 'sqrt(-1) + x')
+    with pytest.raises(ZeroDivisionError):
+        ReverseAD({'x': 1}, '1 / 0')
+
+
+def test_graph_identities():
+    for f in ('x + 0', '0 + x', 'x - 0', 'x * 1', '1.0 * x', 'x / 1', 'x ** 1', '--x', '+x', 'x + 0 * y'):
+        g = compile_graph(f)
+        assert [node.op for node in g.nodes] == ['var'], f
+
+    for f in ('x * 0', '0 * exp(x)', 'x - x', 'sin(x) ** 0'):
+        g = compile_graph(f)
+        assert [node.op for node in g.nodes] == ['const'], f
+        assert g.var_names == []
+
+    for f in ('0 - x', 'x * -1', '-1 * x'):
+        g = compile_graph(f)
+        assert [node.op for node in g.nodes] == ['var', 'neg'], f
+
+    g = compile_graph(['x * 0 + y', 'y * exp(x)'])
+    assert g.var_names == ['x', 'y']
+    assert [node.op for node in g.nodes] == ['var', 'var', 'exp', 'mul']
+    assert g.outputs == [1, 3]
+
+
+def test_engines_simplified():
+    vars = {'x': 2, 'y': 3}
+    fcts = ['x * 1 + 0 * y', '(x - x) * y', 'y ** 1 / 1 - 0', '2 ** 3 * x ** 0']
+    for ad in (ForwardAD(vars, fcts), ReverseAD(vars, fcts)):
+        assert np.allclose(ad.func_evals, [2, 0, 3, 8])
+        assert np.array_equal(ad.Dpf, [[1, 0], [0, 0], [0, 1], [0, 0]])
+
+
+def test_graph_sparsity():
+    g = compile_graph(['x * y', 'exp(z) + 1', 'y * 0 + 2', 'sin(x + z)'])
+    assert g.var_names == ['x', 'y', 'z']
+    assert g.dependencies()[g.outputs[0]] == 0b011
+    assert np.array_equal(g.sparsity(), [[1, 1, 0], [0, 0, 1], [0, 0, 0], [1, 0, 1]])
+    # columns follow the given ordering; unknown variables have empty columns
+    assert np.array_equal(g.sparsity(['z', 'w', 'x']), [[0, 0, 1], [1, 0, 0], [0, 0, 0], [1, 0, 1]])
+
+
+def test_engines_sparsity():
+    n = 30
+    vars = {f'x{k}': 0.1 * (k + 1) for k in range(n)}
+    fcts = [f'x{k} * exp(x{(k + 1) % n})' for k in range(n)] + ['4']
+    expected = np.zeros((n + 1, n))
+    for k in range(n):
+        expected[k, k] = np.exp(vars[f'x{(k + 1) % n}'])
+        expected[k, (k + 1) % n] = vars[f'x{k}'] * np.exp(vars[f'x{(k + 1) % n}'])
+
+    for ad in (ForwardAD(vars, fcts), ReverseAD(vars, fcts)):
+        assert np.array_equal(ad.sparsity, expected != 0)
+        assert np.allclose(ad.func_evals[-1], 4)
+        assert np.allclose(ad.Dpf, expected)
+
+
+def test_graph_evaluate():
+    g = compile_graph(['x * y', '-x + 1', 'x ** 2 - y'])
+    assert g.evaluate({'x': 2, 'y': 3}, ARITHMETIC) == [6, -1, 1]
+    assert g.evaluate({'x': 2}, ARITHMETIC, outputs = [1]) == [-1]
+
+    with pytest.raises(NameError):
+        g.evaluate({'x': 2}, ARITHMETIC)
+
+
+def test_graph_calls():
+    g = compile_graph(['log(x, base = 2)', 'logistic(x, k = 2)', 'logistic(x, 1, 2, 3)'])
+    assert [len(g.nodes[i].args) for i in g.outputs] == [2, 3, 4]
+    assert [g.nodes[i].value for i in g.nodes[g.outputs[1]].args] == ['x', 1, 2]
+
+    for f in ('log(x, 2, base = 2)', 'log(x, y = 2)', 'sin(x, 2)'):
+        with pytest.raises(TypeError):
+            compile_graph(f)
+    with pytest.raises(NameError):
+        compile_graph('foo(x)')
+    for f in ('x // 2', 'x.real', '"x"', 'x if y else 2'):
+        with pytest.raises(ValueError):
+            compile_graph(f)
+
+
+def test_graph_numpy_calls():
+    g = compile_graph(['np.sin(x) + numpy.exp(y)', 'sin(x) + exp(y)', 'np.abs(x)', 'np.absolute(x)'])
+    assert g.outputs[0] == g.outputs[1]
+    assert g.outputs[2] == g.outputs[3]
+
+    with pytest.raises(NameError):
+        compile_graph('np.floor(x)')
+    with pytest.raises(TypeError):
+        compile_graph('np.log(x, 2)')
+
+
+def test_engines_accept_expressions():
+    fcts = compile_func_list(['cos(x) + y ** 2', '2 * log(y) - sqrt(x)/3', 'log(x, 2) * 3'])
+    for vars in ({'x': 0.5, 'y': 4}, {'x': 0.25, 'y': 2}):
+        fwd = ForwardAD(vars, fcts)
+        rev = ReverseAD(vars, fcts)
+        assert fwd.func_list == ['cos(x) + y ** 2', '2 * log(y) - sqrt(x)/3', 'log(x, 2) * 3']
+        assert np.allclose(fwd.func_evals, rev.func_evals)
+        assert np.allclose(fwd.Dpf, rev.Dpf)
+
+
+def test_engines_unused_and_constant():
+    vars = {'x': 1, 'y': 2}
+    for ad in (ForwardAD(vars, ['x**2', '3']), ReverseAD(vars, ['x**2', '3'])):
+        assert np.allclose(ad.func_evals, [1, 3])
+        assert np.array_equal(ad.Dpf, [[2, 0], [0, 0]])
+
+
+def test_engines_long_expression():
+    # a sum of thousands of terms, e.g. an unrolled loop, is built without recursion
+    n = 2500
+    vars = {f'x{i}': 0.001 * i for i in range(n)}
+    f = ' + '.join(f'exp(x{i})' for i in range(n))
+    assert len(compile_graph(f)) == 3 * n - 1
+    expected = np.exp(0.001 * np.arange(n))
+    for ad in (ForwardAD(vars, f), ReverseAD(vars, f)):
+        assert np.isclose(ad.func_evals[0], expected.sum())
+        assert np.allclose(ad.Dpf, expected)
+
+
+def test_graph_cone_memo():
+    # only the cones of single functions and of all functions are kept on the shared graph
+    g = compile_graph([f'sin(x{i}) * y' for i in range(6)])
+    assert g.cone([0, 3]) == sorted(set(g.cone([0])) | set(g.cone([3])))
+    for i in range(6):
+        g.cone([i, (i + 1) % 6])
+    assert set(g._cones) <= {(i,) for i in range(6)} | {tuple(range(6))}
+    assert g.cone(range(6)) is g.cone(range(6))
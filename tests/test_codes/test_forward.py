@@ -2,6 +2,7 @@ import sys
 sys.path.append("./src/")
 
 import numpy as np
+import pytest
 from team20ad.elementary import *
 from team20ad.forwardAD import *
 
@@ -17,6 +18,81 @@ class TestForwardAD:
         assert np.array_equal(np.around(z.Dpf, 4),
                               np.array([[-0.4794, 8.], [-0.2357, 0.5], [0.2357, 0.], [-1.2359, 0.]]))
 
+    def test_vector_seeds(self):
+        # one pass yields whole rows, including across shared and constant subterms
+        vars = {'x': -0.5, 'y': 4, 'z': 2}
+        fcts = ['abs(x) * y', 'x * y * z + exp(y * z)', 'sqrt(16) + z', '3']
+        z = ForwardAD(vars, fcts)
+
+        assert np.allclose(z.func_evals, [2, -4 + np.exp(8), 6, 3])
+        assert np.allclose(z.Dpf, [[-4, 0.5, 0],
+                                   [8, -1 + 2 * np.exp(8), -2 + 4 * np.exp(8)],
+                                   [0, 0, 1],
+                                   [0, 0, 0]])
+
+    def test_chunk_size(self):
+        vars = {f'x{k}': 0.1 * (k + 1) for k in range(7)}
+        fcts = ['x0 * x1 + sin(x6)', 'exp(x2 * x3) - x4', 'x5 ** 2', 'x0 * x6', '1 + 2']
+        full = ForwardAD(vars, fcts)
+        assert full.chunk_size == 7
+
+        for chunk_size in (1, 2, 3, 7, 100):
+            z = ForwardAD(vars, fcts, chunk_size = chunk_size)
+            assert np.allclose(z.func_evals, full.func_evals)
+            assert np.allclose(z.Dpf, full.Dpf)
+
+            z.update(x0 = 0.5, x5 = -1)
+            fresh = ForwardAD({**vars, 'x0': 0.5, 'x5': -1}, fcts)
+            assert np.allclose(z.func_evals, fresh.func_evals)
+            assert np.allclose(z.Dpf, fresh.Dpf)
+
+        with pytest.raises(ValueError):
+            ForwardAD(vars, fcts, chunk_size = 0)
+        with pytest.raises(TypeError):
+            ForwardAD(vars, fcts, chunk_size = 1.5)
+
+    def test_default_chunk_size(self, monkeypatch):
+        import team20ad.forwardAD
+        monkeypatch.setattr(team20ad.forwardAD, '_TANGENT_BUDGET', 1000)
+        vars = {f'x{k}': 0.1 * (k + 1) for k in range(40)}
+        fcts = [' + '.join(f'x{k} * x{k + 1}' for k in range(39))]
+        z = ForwardAD(vars, fcts)
+        assert z.chunk_size == 1000 // len(z.graph) < 40
+        assert np.allclose(z.Dpf, ForwardAD(vars, fcts, chunk_size = 40).Dpf)
+
+    def test_points(self):
+        # arrays of points are differentiated in one pass
+        points = np.linspace(0.1, 0.9, 5)
+        fcts = ['sin(x) * y + exp(x * y)', 'x ** y', 'log(y)', '3']
+        z = ForwardAD({'x': points, 'y': 2}, fcts)
+        assert z.Dpf.shape == (4, 2, 5)
+        for k, point in enumerate(points):
+            single = ForwardAD({'x': point, 'y': 2}, fcts)
+            assert np.allclose([f[k] for f in z.func_evals], single.func_evals)
+            assert np.allclose(z.Dpf[:, :, k], single.Dpf)
+
+        chunked = ForwardAD({'x': points, 'y': 2}, fcts, chunk_size = 1)
+        assert np.allclose(chunked.Dpf, z.Dpf)
+
+        z.update(y = 3)
+        assert np.allclose(z.Dpf, ForwardAD({'x': points, 'y': 3}, fcts).Dpf)
+
+    def test_update(self):
+        vars = {'x': 0.5, 'y': 4, 'z': 2}
+        fcts = ['cos(x) + y ** 2', 'exp(x * z)', 'sqrt(z) / y', 'log(y)']
+        z = ForwardAD(vars, fcts)
+        unaffected = z.Dpf[3].copy()
+
+        z.update(x = 0.25, z = 3)
+        fresh = ForwardAD({'x': 0.25, 'y': 4, 'z': 3}, fcts)
+        assert np.allclose(z.func_evals, fresh.func_evals)
+        assert np.allclose(z.Dpf, fresh.Dpf)
+        assert np.array_equal(z.Dpf[3], unaffected)
+        assert z.var_dict == {'x': 0.25, 'y': 4, 'z': 3}
+
+        with pytest.raises(KeyError):
+            z.update(w = 1)
+
     def test_repr_str(self):
         vars = {'x': 0.5, 'y': 4}
         fcts = ['cos(x) + y ** 2', '2 * log(y) - sqrt(x)/3', 'sqrt(x)/3', '3 * sinh(x) - 4 * arcsin(x) + 5']
@@ -31,3 +107,152 @@ def test_call(capfd):
     z()  # outputs to std out
     out, err = capfd.readouterr()
     assert out is not None
+
+
+class TestHessianAD:
+
+    def test_hessian(self):
+        vars = {'x': 0.5, 'y': 2., 'z': 1.5}
+        fcts = ['x**2 * y + sin(x * y)', 'exp(y) * log(z)', 'z', '3']
+        z = HessianAD(vars, fcts)
+        x, y = 0.5, 2.
+
+        assert np.allclose(z.func_evals[:2], [x ** 2 * y + np.sin(x * y), np.exp(y) * np.log(1.5)])
+        assert z.func_evals[3] == 3
+        assert np.allclose(z.Dpf, ForwardAD(vars, fcts).Dpf)
+
+        expected = [[2 * y - y ** 2 * np.sin(x * y), 2 * x + np.cos(x * y) - x * y * np.sin(x * y), 0],
+                    [2 * x + np.cos(x * y) - x * y * np.sin(x * y), -x ** 2 * np.sin(x * y), 0],
+                    [0, 0, 0]]
+        assert np.allclose(z.Hpf[0], expected)
+        expected = [[0, 0, 0],
+                    [0, np.exp(y) * np.log(1.5), np.exp(y) / 1.5],
+                    [0, np.exp(y) / 1.5, -np.exp(y) / 1.5 ** 2]]
+        assert np.allclose(z.Hpf[1], expected)
+        assert not z.Hpf[2:].any()
+
+    def test_upper_triangle(self, monkeypatch):
+        # only pairs of variables some function depends on together are traced
+        vars = {'x': 1., 'y': 2., 'z': 3.}
+        z = HessianAD(vars, ['x * y', 'z ** 2'])
+        calls = []
+        trace = z.graph.trace
+        monkeypatch.setattr(type(z.graph), 'trace', lambda self, *args: calls.append(args[2]) or trace(*args))
+        z = HessianAD(vars, ['x * y', 'z ** 2'])
+        assert calls == [None, [0], [0], [0], [1]]  # values, then (x, x), (x, y), (y, y), (z, z)
+        assert np.array_equal(z.Hpf[0], [[0, 1, 0], [1, 0, 0], [0, 0, 0]])
+        assert np.array_equal(z.Hpf[1], [[0, 0, 0], [0, 0, 0], [0, 0, 2]])
+
+        with pytest.raises(TypeError):
+            HessianAD([1.], 'x')
+
+    def test_call(self, capfd):
+        HessianAD({'x': 1.}, 'x ** 3')()
+        out, err = capfd.readouterr()
+        assert 'Hessian' in out
+
+
+class TestTaylorAD:
+
+    def test_derivatives(self):
+        vars = {'x': 0.5, 'y': 2.}
+        fcts = ['x**2 * y + sin(x * y)', 'exp(y) * log(x)', '3']
+        z = TaylorAD(vars, fcts, {'x': 1., 'y': -1.}, order = 4)
+        x, y = 0.5, 2.
+
+        assert np.allclose(z.func_evals[:2], [x ** 2 * y + np.sin(x * y), np.exp(y) * np.log(x)])
+        assert z.derivatives.shape == (3, 5)
+        assert np.allclose(z.derivatives[:, 0], z.func_evals)
+        assert not z.derivatives[2, 1:].any()
+
+        # first and second derivatives along the direction match the gradient and Hessian
+        v = np.array([1., -1.])
+        hessian = HessianAD(vars, fcts)
+        assert np.allclose(z.derivatives[:, 1], hessian.Dpf @ v)
+        assert np.allclose(z.derivatives[:, 2], hessian.Hpf @ v @ v)
+
+        # f(t) = (0.5 + t)**2 (2 - t) has third derivative -6 and fourth derivative 0
+        z = TaylorAD(vars, 'x**2 * y', {'x': 1., 'y': -1.}, order = 4)
+        assert np.allclose(z.derivatives[0, 3:], [-6., 0.])
+
+    def test_errors(self, capfd):
+        with pytest.raises(TypeError):
+            TaylorAD([1.], 'x', {'x': 1})
+        with pytest.raises(TypeError):
+            TaylorAD({'x': 1.}, 'x', [1.])
+        with pytest.raises(KeyError):
+            TaylorAD({'x': 1.}, 'x', {'y': 1.})
+        with pytest.raises(ValueError):
+            TaylorAD({'x': 1.}, 'x', {'x': 1.}, order = 0)
+
+        TaylorAD({'x': 1.}, 'x ** 3', {'x': 1.})()
+        out, err = capfd.readouterr()
+        assert 'Taylor' in out
+
+
+class TestJvp:
+
+    def test_jvp(self):
+        vars = {'x': 0.5, 'y': 4., 'z': 1.}
+        fcts = ['cos(x) + y ** 2', '2 * log(y) - sqrt(x)/3', 'z * x', '3']
+        Dpf = ForwardAD(vars, fcts).Dpf
+
+        func_evals, Jv = jvp(vars, fcts, {'x': 2., 'z': -1.})
+        assert np.allclose(func_evals, ForwardAD(vars, fcts).func_evals)
+        assert np.allclose(Jv, Dpf @ [2., 0., -1.])
+
+        # a batch of directions in one pass
+        V = np.array([[1., 0.], [2., 1.], [0., 3.]])
+        func_evals, JV = jvp(vars, fcts, V)
+        assert JV.shape == (4, 2)
+        assert np.allclose(JV, Dpf @ V)
+        assert np.allclose(jvp(vars, fcts, {'x': [1., 0.], 'y': [2., 1.], 'z': [0., 3.]})[1], JV)
+
+        z = ForwardAD(vars, fcts)
+        z.update(x = 0.25)
+        assert np.allclose(z.jvp([1., 1., 1.])[1], z.Dpf @ [1., 1., 1.])
+
+        with pytest.raises(KeyError):
+            jvp(vars, fcts, {'w': 1.})
+        with pytest.raises(ValueError):
+            jvp(vars, fcts, [1., 2.])
+        with pytest.raises(TypeError):
+            jvp([0.5], fcts, [1.])
+
+    def test_jvp_points(self):
+        vars = {'x': np.array([0.5, 1.5]), 'y': 2.}
+        fcts = ['x * y', 'exp(y)']
+        z = ForwardAD(vars, fcts)
+        func_evals, Jv = jvp(vars, fcts, [1., 2.])
+        assert Jv.shape == (2, 2)
+        assert np.allclose(Jv, np.einsum('mnp,n->mp', z.Dpf, [1., 2.]))
+        assert np.allclose(func_evals[1], [np.exp(2.)] * 2)
+
+        func_evals, JV = jvp(vars, fcts, np.eye(2))
+        assert JV.shape == (2, 2, 2)
+        assert np.allclose(JV, z.Dpf)
+
+
+def test_sparse_jacobian():
+    vars = {f"x{i}": 0.1 + i / 10 for i in range(6)}
+    fcts = [f"x{i} * x{i + 1} + sin(x{i})" for i in range(5)] + ['log(x5) / x0', '2']
+    func_evals, rows = sparse_jacobian(vars, fcts)
+    z = ForwardAD(vars, fcts)
+
+    assert np.allclose(func_evals, z.func_evals)
+    assert np.allclose([row.toarray(6) for row in rows], z.Dpf)
+    assert [row.indices.tolist() for row in rows] == [[0, 1], [1, 2], [2, 3], [3, 4], [4, 5], [0, 5], []]
+
+    with pytest.raises(TypeError):
+        sparse_jacobian([1.], 'x')
+
+
+def test_sparse_jacobian_integer_point():
+    # the sign of an integer is a NumPy integer, which scales the tangent like a float
+    func_evals, rows = sparse_jacobian({'x': 3}, ['abs(x)'])
+    assert func_evals == [3]
+    assert rows[0] == SparseTangent({0: 1.})
+
+    func_evals, rows = sparse_jacobian({'x': np.int64(-3), 'y': np.float32(2)}, ['abs(x) * y', 'x / y'])
+    assert np.allclose(func_evals, [6, -1.5])
+    assert np.allclose([row.toarray(2) for row in rows], [[-2, 3], [0.5, 0.75]])
@@ -0,0 +1,92 @@
+import sys
+sys.path.append("./src/")
+
+import pytest
+import numpy as np
+from team20ad.hyperDualNumber import HyperDualNumber
+from team20ad.elementary import *
+
+
+def parts(x):
+    return [x.real, x.eps1, x.eps2, x.eps1eps2]
+
+
+def test_initializer():
+    x = HyperDualNumber(2)
+    assert parts(x) == [2, 0, 0, 0]
+    assert repr(HyperDualNumber(1., 2., 3., 4.)) == "HyperDualNumber(1.0, 2.0, 3.0, 4.0)"
+    assert isinstance(str(x), str)
+
+    with pytest.raises(TypeError):
+        HyperDualNumber('2')
+    with pytest.raises(AttributeError):
+        x.dual = 1
+
+
+def test_arithmetic():
+    x = HyperDualNumber(3., 1., 0.)
+    y = HyperDualNumber(2., 0., 1.)
+
+    assert parts(x + y) == [5., 1., 1., 0.]
+    assert parts(1 + x) == [4., 1., 0., 0.]
+    assert parts(x - y) == [1., 1., -1., 0.]
+    assert parts(1 - x) == [-2., -1., 0., 0.]
+    assert parts(-x) == [-3., -1., 0., 0.]
+
+    # d2(xy)/dxdy = 1
+    assert parts(x * y) == [6., 2., 3., 1.]
+    assert parts(2 * x) == [6., 2., 0., 0.]
+
+    # d2(x/y)/dxdy = -1/y**2
+    assert np.allclose(parts(x / y), [1.5, 0.5, -0.75, -0.25])
+    assert np.allclose(parts(3 / y), [1.5, 0., -0.75, 0.])
+    assert np.allclose(parts(np.float64(2.) * x), [6., 2., 0., 0.])
+
+    with pytest.raises(ZeroDivisionError):
+        x / HyperDualNumber(0.)
+    with pytest.raises(ZeroDivisionError):
+        1 / HyperDualNumber(0, 1., 1.)
+    with pytest.raises(TypeError):
+        x + '1'
+    with pytest.raises(TypeError):
+        x * [1]
+
+
+def test_pow():
+    x = HyperDualNumber(3., 1., 1.)
+    assert parts(x ** 3) == [27., 27., 27., 18.]
+    assert parts(x ** 1) == [3., 1., 1., 0.]
+    assert parts(HyperDualNumber(0., 1., 1.) ** 2) == [0., 0., 0., 2.]
+
+    # d2(x**y)/dxdy = x**(y-1) (1 + y log(x))
+    x = HyperDualNumber(3., 1., 0.)
+    y = HyperDualNumber(2., 0., 1.)
+    assert np.allclose(parts(x ** y), [9., 6., 9 * np.log(3), 3 * (1 + 2 * np.log(3))])
+
+    # d2(2**x)/dx2 = log(2)**2 2**x
+    x = HyperDualNumber(3., 1., 1.)
+    assert np.allclose(parts(2 ** x), [8., 8 * np.log(2), 8 * np.log(2), 8 * np.log(2) ** 2])
+
+    with pytest.raises(ValueError):
+        (-2) ** x
+    with pytest.raises(TypeError):
+        '2' ** x
+
+
+def test_compare():
+    x = HyperDualNumber(3., 1., 1.)
+    assert x == HyperDualNumber(3., 1., 1.)
+    assert x != HyperDualNumber(3., 1., 0.)
+    assert HyperDualNumber(3.) == 3
+    assert x != 3
+    assert x < 4 and x <= 3 and x > 2 and x >= 3
+    assert x < HyperDualNumber(4.)
+    assert parts(abs(-x)) == [3., 1., 1., 0.]
+
+
+def test_chain():
+    x = HyperDualNumber(0.5, 1., 1.)
+    y = sin(x) * exp(x)
+    expected = 2 * np.cos(0.5) * np.exp(0.5)  # (sin(x) exp(x))'' = 2 cos(x) exp(x)
+    assert np.isclose(y.eps1eps2, expected)
+    assert np.isclose(np.exp(0.5) * np.sin(0.5), y.real)
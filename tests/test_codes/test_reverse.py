@@ -2,8 +2,11 @@ import sys
 sys.path.append("./src/")
 
 import numpy as np
+import pytest
 from team20ad.elementary import *
 from team20ad.reverseAD import *
+from team20ad.forwardAD import ForwardAD
+from team20ad import reverseAD
 
 
 class TestReverseAD: 
@@ -14,6 +17,97 @@ class TestReverseAD:
         z = ReverseAD(vars, fcts)
 
         assert np.array_equal(np.around(z.func_evals, 4), np.array([16.8776, 2.5369, 0.2357, 4.4689]))
+        assert np.array_equal(np.around(z.Dpf, 4),
+                              np.array([[-0.4794, 8.], [-0.2357, 0.5], [0.2357, 0.], [-1.2359, 0.]]))
+
+    def test_shared_subterms(self):
+        vars = {'x': 0.5, 'y': 4, 'z': 2}
+        fcts = ['exp(x + y) * sqrt(z)', 'sqrt(z) - exp(y + x)', 'exp(x + y)', 'x * x - 3 - z', 'abs(-x)']
+        z = ReverseAD(vars, fcts)
+        e, s = np.exp(4.5), np.sqrt(2)
+
+        assert np.allclose(z.func_evals, [e * s, s - e, e, -4.75, 0.5])
+        assert np.allclose(z.Dpf, [[e * s, e * s, e / 2 / s],
+                                   [-e, -e, 1 / 2 / s],
+                                   [e, e, 0],
+                                   [1, 0, -1],
+                                   [1, 0, 0]])
+
+    def test_update(self):
+        vars = {'x': 0.5, 'y': 4, 'z': 2}
+        fcts = ['cos(x) + y ** 2', 'exp(x * z)', 'sqrt(z) / y', 'log(y)']
+        z = ReverseAD(vars, fcts)
+        unaffected = z.Dpf[3].copy()
+
+        z.update(x = 0.25, z = 3)
+        fresh = ReverseAD({'x': 0.25, 'y': 4, 'z': 3}, fcts)
+        assert np.allclose(z.func_evals, fresh.func_evals)
+        assert np.allclose(z.Dpf, fresh.Dpf)
+        assert np.array_equal(z.Dpf[3], unaffected)
+        assert z.var_dict == {'x': 0.25, 'y': 4, 'z': 3}
+
+        with pytest.raises(KeyError):
+            z.update(w = 1)
+
+    def test_batched_sweep(self, monkeypatch):
+        # functions sharing a large subterm are swept together, with one adjoint per function
+        vars = {f'x{i}': 0.1 * (i + 1) for i in range(10)}
+        shared = ' + '.join(f'sin(x{i}) * x{(i + 1) % 10}' for i in range(10))
+        fcts = [f'({shared}) * {j + 1} + x{j}' for j in range(10)] + [shared, shared, 'x0 * 2', '3']
+        z = ReverseAD(vars, fcts)
+        graph = z.graph
+        assert sum(len(graph.cone([j])) for j in range(12)) > reverseAD._BATCH_COST * len(graph.cone(range(12)))
+
+        monkeypatch.setattr(reverseAD, '_BATCH_COST', np.inf)
+        expected = ReverseAD(vars, fcts)
+        assert np.allclose(z.Dpf, expected.Dpf)
+        assert np.allclose(z.func_evals, expected.func_evals)
+        assert np.array_equal(z.Dpf[13], np.zeros(10))
+
+    def test_vjp(self):
+        vars = {'x': 0.5, 'y': 4}
+        fcts = ['cos(x) + y ** 2', '2 * log(y) - sqrt(x)/3', 'sqrt(x)/3', '3', 'x * y']
+        z = ReverseAD(vars, fcts)
+        u = np.array([1., -2., 0.5, 7., 3.])
+        func_evals, uJ = vjp(vars, fcts, u)
+        assert np.allclose(func_evals, z.func_evals)
+        assert np.allclose(uJ, u @ z.Dpf)
+
+        U = np.array([u, np.zeros(5), [0., 1., 0., 0., 0.]])
+        func_evals, UJ = z.vjp(U)
+        assert UJ.shape == (3, 2)
+        assert np.allclose(UJ, U @ z.Dpf)
+
+        # the same function listed twice accumulates both weights
+        assert np.allclose(vjp(vars, ['x * y', 'x * y'], [1, 2])[1], [12., 1.5])
+        assert np.allclose(vjp(vars, '3', [[1.], [2.]])[1], np.zeros((2, 2)))
+
+        with pytest.raises(ValueError):
+            z.vjp([1, 2])
+        with pytest.raises(ValueError):
+            z.vjp(np.ones((2, 2, 5)))
+        with pytest.raises(TypeError):
+            vjp(1, fcts, u)
+
+    def test_variable_log_base(self):
+        z = ReverseAD({'x': 8, 'y': 2}, ['log(x, y)', 'log(2, y)'])
+        assert np.allclose(z.func_evals, [3, 1])
+        assert np.allclose(z.Dpf, [[1 / (8 * np.log(2)), -np.log(8) / (2 * np.log(2) ** 2)],
+                                   [0, -1 / (2 * np.log(2))]])
+
+    def test_logistic_parameters(self):
+        fcts = ['logistic(x, L=2, k=3, x_0=0.5) * y', 'logistic(y, 2, 3)', 'logistic(x)']
+        z = ReverseAD({'x': 0.5, 'y': 2}, fcts)
+        expected = ForwardAD({'x': 0.5, 'y': 2}, fcts)
+        assert np.allclose(z.func_evals, expected.func_evals)
+        assert np.allclose(z.Dpf, expected.Dpf)
+        assert np.allclose(z.Dpf[0], [2 * 1.5, 1])
+
+        z.update(x = 1)
+        assert np.allclose(z.Dpf, ForwardAD({'x': 1, 'y': 2}, fcts).Dpf)
+
+        with pytest.raises(ValueError):
+            ReverseAD({'x': 0.5}, 'logistic(x, L=x)')
 
     def test_repr_str(self):
         vars = {'x': 0.5, 'y': 4}
@@ -4,6 +4,7 @@ sys.path.append("./src/")
 from team20ad.reverseAD import *
 import numpy as np
 import pytest
+import warnings
 
 
 def test_node_init():
@@ -29,7 +30,19 @@ def test_node_get_derivatives():
 
 
 def test_node_partial():
-    pass
+    # shared subterms are accumulated over every path: y = (x * x) * (x * x) + x
+    x = Node(2.)
+    s = x * x
+    y = s * s + x
+    assert x.partial() == 4 * 2. ** 3 + 1
+    assert s.partial() == 2 * 4.
+
+    # chains far deeper than the recursion limit: y = x * 1.0001 ** n + n
+    x = Node(1.)
+    y = x
+    for _ in range(100000):
+        y = y * 1.0001 + 1
+    assert np.isclose(x.partial(), 1.0001 ** 100000)
 
 
 def test_node_str():
@@ -264,6 +277,10 @@ def test_node_abs():
     assert y.var == 88
     assert y.partial() == 1
 
+    x = Node(-2)
+    y = abs(x)
+    assert x.partial() == -1
+
 
 def test_node_pow():
     x = Node(2)
@@ -337,6 +354,18 @@ def test_node_log():
     with pytest.raises(TypeError):
         y = Node.log(1)
 
+    # a Node base contributes to the derivative
+    x, b = Node(8), Node(2)
+    y = Node.log(x, b)
+    assert np.isclose(y.var, 3)
+    assert np.isclose(x.partial(), 1 / (8 * np.log(2)))
+    assert np.isclose(b.partial(), -np.log(8) / (2 * np.log(2) ** 2))
+
+    b = Node(4)
+    y = Node.log(2, b)
+    assert np.isclose(y.var, 0.5)
+    assert np.isclose(b.partial(), -np.log(2) / (4 * np.log(4) ** 2))
+
 
 def test_node_sqrt():
     x = Node(2)
@@ -352,6 +381,11 @@ def test_node_sqrt():
         x = Node(-2)
         y = Node.sqrt(x)
 
+    x = Node(0.)
+    y = Node.sqrt(x)
+    assert y.var == 0
+    assert x.partial() == np.inf
+
     with pytest.raises(TypeError):
         y = Node.sqrt("string")
 
@@ -437,6 +471,15 @@ def test_node_arcsin():
     y = Node.arcsin(1/4)
     assert y == np.arcsin(1/4)
 
+    # the endpoints have infinite derivatives, computed without a division by zero
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        for point in (1., -1.):
+            x = Node(point)
+            y = Node.arcsin(x)
+            assert y.var == np.arcsin(point)
+            assert x.partial() == np.inf
+
 
 def test_node_arccos():
     x = Node(1/4)
@@ -453,6 +496,14 @@ def test_node_arccos():
 
     assert Node.arccos(1/4) == np.arccos(1/4)
 
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        for point in (1., -1.):
+            x = Node(point)
+            y = Node.arccos(x)
+            assert y.var == np.arccos(point)
+            assert x.partial() == -np.inf
+
 
 def test_node_arctan():
     x = Node(1/4)
@@ -509,3 +560,24 @@ def test_node_logistic():
 
     with pytest.raises(TypeError):
         y = Node.logistic("string")
+
+
+def test_node_ufuncs():
+    x = Node(0.5)
+    y = np.sin(x) * np.exp(x) + np.power(x, 2) - np.float64(3) * x
+    assert y.var == np.sin(0.5) * np.exp(0.5) + 0.25 - 1.5
+    assert np.isclose(x.partial(), np.exp(0.5) * (np.cos(0.5) + np.sin(0.5)) + 1 - 3)
+
+    x, y = Node(1.), Node(2.)
+    z = np.sum([x, y * y])
+    assert z.var == 5
+    assert y.partial() == 4
+
+    x, y = Node(1.), Node(2.)
+    z = np.dot([x, y], [3., 4.])
+    assert z.var == 11
+    assert x.partial() == 3
+
+    nodes = np.array([Node(1.), Node(2.)], dtype = object)
+    z = np.multiply(nodes, Node(3.))
+    assert [n.var for n in z] == [3., 6.]
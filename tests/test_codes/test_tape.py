@@ -0,0 +1,126 @@
+import sys
+sys.path.append("./src/")
+
+import numpy as np
+import pytest
+from team20ad.reverseAD import ReverseAD
+from team20ad.tapeAD import *
+
+
+class TestTapeAD:
+
+    def test_matches_reverse(self):
+        vars = {'x': 0.5, 'y': 4, 'z': 2}
+        fcts = ['cos(x) + y ** 2', '2 * log(y) - sqrt(x)/3', '3 * sinh(x) - 4 * arcsin(x) + 5',
+                'exp(x + y) * sqrt(z)', 'x ** z + 2 ** x', 'log(x, 2) + abs(-x) * tanh(z) / z',
+                'arctan(y) - cos(z) + tan(x) + cosh(x) + arccos(x)', '3']
+        z = TapeAD(vars, fcts)
+        expected = ReverseAD(vars, fcts)
+
+        assert np.allclose(z.func_evals, expected.func_evals)
+        assert np.allclose(z.Dpf, expected.Dpf)
+
+    def test_logistic(self):
+        z = TapeAD({'x': 0.5}, ['logistic(x)', 'logistic(x, 2, 3, 0.1)'])
+        value = 2 / (1 + np.exp(-3 * 0.4))
+        assert np.allclose(z.func_evals, [1 / (1 + np.exp(-0.5)), value])
+        assert np.isclose(z.Dpf[1, 0], 3 * value * (1 - value / 2))
+        assert np.allclose(TapeAD({'x': 0.5}, 'logistic(x, L=2, k=3, x_0=0.1)').Dpf, z.Dpf[1])
+        with pytest.raises(ValueError):
+            TapeAD({'x': 0.5}, 'logistic(x, L=x)')
+
+    def test_update(self):
+        vars = {'x': 0.5, 'y': 4, 'z': 2}
+        fcts = ['cos(x) + y ** 2', 'exp(x * z)', 'sqrt(z) / y', 'log(y)']
+        z = TapeAD(vars, fcts)
+        unaffected = z.Dpf[3].copy()
+
+        z.update(x = 0.25, z = 3)
+        fresh = TapeAD({'x': 0.25, 'y': 4, 'z': 3}, fcts)
+        assert np.allclose(z.func_evals, fresh.func_evals)
+        assert np.allclose(z.Dpf, fresh.Dpf)
+        assert np.array_equal(z.Dpf[3], unaffected)
+
+        with pytest.raises(KeyError):
+            z.update(w = 1)
+
+    def test_replay(self):
+        # update() replays the recorded tape, which gives the results of recording again
+        vars = {'x': 0.5, 'y': 4, 'z': 2}
+        fcts = ['cos(x) + y ** 2 - 1 / z', '2 ** x * log(y, 2) - sqrt(x) / 3', 'x ** z + abs(-y) - 3',
+                'logistic(x, 2, 3, 0.1) * tanh(z) + arctan(y) * cosh(x) / sinh(z)',
+                'exp(x * z) * tan(x) + arcsin(x) - arccos(x) + sin(y)', '3']
+        z = TapeAD(vars, fcts)
+        tape, size = z.tape, len(z.tape)
+        for point in ({'x': 0.25, 'y': 3., 'z': 1.5}, {'x': 0.7, 'y': 0.5, 'z': 4}):
+            z.update(**point)
+            fresh = TapeAD(point, fcts)
+            assert np.allclose(z.func_evals, fresh.func_evals)
+            assert np.allclose(z.Dpf, fresh.Dpf)
+        assert z.tape is tape and len(tape) == size
+
+        with pytest.raises(ValueError):
+            z.update(x = 2)
+
+    def test_variable_log_base(self):
+        # a variable base is recorded as an operand, so replay uses its new value
+        z = TapeAD({'x': 8, 'y': 2}, ['log(x, y)', 'log(2, y)'])
+        z.update(y = 4)
+        assert np.allclose(z.func_evals, [1.5, 0.5])
+        assert np.allclose(z.Dpf, [[1 / (8 * np.log(4)), -np.log(8) / (4 * np.log(4) ** 2)],
+                                   [0., -np.log(2) / (4 * np.log(4) ** 2)]])
+
+    def test_domain_boundaries(self):
+        # the endpoints of the domains are accepted with infinite derivatives, as by ReverseAD
+        for f, x in (('sqrt(x)', 0), ('arcsin(x)', 1), ('arcsin(x)', -1), ('arccos(x)', 1), ('arccos(x)', -1)):
+            z = TapeAD({'x': x}, f)
+            expected = ReverseAD({'x': x}, f)
+            assert np.allclose(z.func_evals, expected.func_evals)
+            assert np.array_equal(z.Dpf, expected.Dpf)
+            assert np.isinf(z.Dpf[0, 0])
+
+    def test_domain_errors(self):
+        with pytest.raises(ValueError):
+            TapeAD({'x': -1}, 'sqrt(x)')
+        with pytest.raises(ValueError):
+            TapeAD({'x': 2}, 'arcsin(x)')
+
+        # a negative base with a non-integer exponent has no real power
+        for f in ('x ** 0.5', 'x ** y', '(-2) ** y'):
+            with pytest.raises(ValueError):
+                TapeAD({'x': -1., 'y': 0.5}, f)
+        assert np.allclose(TapeAD({'x': -2., 'y': 3.}, 'x ** y + x ** 2').Dpf[0, 0], 8.)
+        z = TapeAD({'x': 1., 'y': 0.5}, 'x ** y')
+        with pytest.raises(ValueError):
+            z.update(x = -1.)
+
+
+class TestTape:
+
+    def test_growth(self):
+        # the buffers grow geometrically past their initial capacity
+        tape = Tape(capacity = 2)
+        x = tape.variable(1.5)
+        y = x
+        for _ in range(100):
+            y = y * 1.01 + x
+        assert len(tape) == 201
+        assert len(tape.values) == len(tape.parents) == len(tape.partials) == 201
+        assert tape.values[-1] == y.value
+
+        # dy/dx = sum of 1.01 ** k for k = 0..100
+        assert np.isclose(tape.gradient(y.index, [x.index])[0], (1.01 ** 101 - 1) / 0.01)
+
+    def test_operations(self):
+        tape = Tape()
+        x, y = tape.variable(2.), tape.variable(3.)
+        for f, dx, dy in [(x + y, 1, 1), (x - y, 1, -1), (x * y, 3, 2), (x / y, 1 / 3, -2 / 9),
+                          (x ** y, 12, 8 * np.log(2)), (2 - x, -1, 0), (1 / x, -0.25, 0),
+                          (2 ** y, 0, 8 * np.log(2)), (-x, -1, 0), (abs(-y), 0, 1),
+                          (np.sin(x) * y, 3 * np.cos(2), np.sin(2))]:
+            assert np.allclose(tape.gradient(f.index, [x.index, y.index]), [dx, dy])
+
+        assert x < y and y >= x and x == 2. and x != y
+        assert TapeVar.exp(1.) == np.exp(1.)
+        with pytest.raises(TypeError):
+            x + 'a'
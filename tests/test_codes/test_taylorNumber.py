@@ -0,0 +1,101 @@
+import sys
+sys.path.append("./src/")
+
+import math
+import pytest
+import numpy as np
+from team20ad.taylorNumber import TaylorNumber
+from team20ad.elementary import *
+
+
+def test_initializer():
+    x = TaylorNumber.variable(2., order = 3)
+    assert np.array_equal(x.coeffs, [2., 1., 0., 0.])
+    assert x.real == 2 and x.order == 3
+    assert repr(TaylorNumber([1., 2.])) == "TaylorNumber([1. 2.])"
+    assert isinstance(str(x), str)
+
+    with pytest.raises(TypeError):
+        TaylorNumber(['a'])
+    with pytest.raises(ValueError):
+        TaylorNumber([])
+    with pytest.raises(ValueError):
+        TaylorNumber.variable(1., order = 0)
+    with pytest.raises(AttributeError):
+        x.dual = 1
+
+
+def test_arithmetic():
+    x = TaylorNumber([1., 2., 3.])
+    y = TaylorNumber([2., 0., 1.])
+
+    assert x + y == TaylorNumber([3., 2., 4.])
+    assert 1 + x == TaylorNumber([2., 2., 3.])
+    assert x - y == TaylorNumber([-1., 2., 2.])
+    assert 1 - x == TaylorNumber([0., -2., -3.])
+    assert -x == TaylorNumber([-1., -2., -3.])
+    assert x * y == TaylorNumber([2., 4., 7.])
+    assert 2 * x == TaylorNumber([2., 4., 6.])
+    assert np.float64(2.) * x == TaylorNumber([2., 4., 6.])
+    assert np.allclose(((x * y) / y).coeffs, x.coeffs)
+    assert np.allclose((1 / (1 / x)).coeffs, x.coeffs)
+    assert x / 2 == TaylorNumber([0.5, 1., 1.5])
+
+    with pytest.raises(ZeroDivisionError):
+        x / TaylorNumber([0., 1., 0.])
+    with pytest.raises(ValueError):
+        x + TaylorNumber([1., 2.])
+    with pytest.raises(TypeError):
+        x * '2'
+
+
+def test_pow():
+    # derivatives of x**r are falling factorials
+    x = TaylorNumber.variable(2., order = 4)
+    for r in (3, 2.5, -2):
+        expected = [math.prod(r - i for i in range(k)) * 2. ** (r - k) for k in range(5)]
+        assert np.allclose((x ** r).derivatives(), expected)
+
+    assert (TaylorNumber.variable(0., order = 3) ** 2).coeffs.tolist() == [0., 0., 1., 0.]
+    assert np.allclose((x ** x).coeffs, exp(x * log(x)).coeffs)
+    assert np.allclose((2 ** x).derivatives(), 4 * np.log(2) ** np.arange(5))
+
+    with pytest.raises(ValueError):
+        TaylorNumber.variable(0., order = 3) ** 0.5
+    with pytest.raises(ValueError):
+        TaylorNumber.variable(-1., order = 3) ** 0.5
+    with pytest.raises(ValueError):
+        TaylorNumber.variable(-1., order = 3) ** x
+    with pytest.raises(ValueError):
+        (-2) ** x
+    with pytest.raises(TypeError):
+        x ** '2'
+
+
+def test_compare():
+    x = TaylorNumber([1., 2., 3.])
+    assert x == TaylorNumber([1., 2., 3.])
+    assert x != TaylorNumber([1., 2., 0.])
+    assert TaylorNumber([3., 0.]) == 3
+    assert x < 2 and x <= 1 and x > 0 and x >= 1
+    assert abs(-x) == x
+    assert abs(TaylorNumber([0., 1.])) == TaylorNumber([0., 0.])
+
+
+def test_elementary():
+    # composing each function with its inverse gives back every coefficient
+    x = TaylorNumber([0.3, 0.7, -0.2, 0.5, 0.1, 0.05])
+    for y in (sin(arcsin(x)), cos(arccos(x)), tan(arctan(x)), exp(log(x)), log(exp(x)),
+              sqrt(x) * sqrt(x), (x ** 2.5) ** 0.4, tanh(x) * cosh(x) - sinh(x) + x,
+              cosh(x) ** 2 - sinh(x) ** 2 + x - 1, log(x, 2) * np.log(2) - log(x) + x,
+              logistic(x, 2, 3, 0.1) - 2 / (1 + exp(-3 * (x - 0.1))) + x):
+        assert np.allclose(y.coeffs, x.coeffs)
+
+    # fourth derivatives along a direction
+    t = TaylorNumber.variable(0.5, order = 5)
+    assert np.allclose(sin(t).derivatives(), np.sin(0.5 + np.pi / 2 * np.arange(6)))
+    assert np.allclose(log(t).derivatives()[1:], [(-1) ** (k - 1) * math.factorial(k - 1) / 0.5 ** k
+                                                  for k in range(1, 6)])
+
+    with pytest.raises(ValueError):
+        log(TaylorNumber([-1., 1.]))
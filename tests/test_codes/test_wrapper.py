@@ -1,8 +1,11 @@
 import sys
+import time
 sys.path.append("./src/")
 
 from team20ad.wrapperAD import *
 import numpy as np
+import pytest
+from team20ad import wrapperAD
 
 
 class TestAD:
@@ -18,6 +21,149 @@ class TestAD:
         assert np.array_equal(np.around(z.Dpf, 4),
                               np.array([[-0.4794, 8.], [-0.2357, 0.5], [0.2357, 0.], [-1.2359, 0.]]))
 
+    def test_update(self):
+        vars = {'x': 0.5, 'y': 4, 'z': 2}
+        fcts = ['cos(x) + y ** 2', 'exp(x * z)', 'sqrt(z) / y', 'log(y)']
+        z = AD(vars, fcts, mode = 'r')
+        unaffected = z.Dpf[3].copy()
+
+        z.update(x = 0.25, z = 3)
+        fresh = AD({'x': 0.25, 'y': 4, 'z': 3}, fcts, mode = 'r')
+        assert np.allclose(z.func_evals, fresh.func_evals)
+        assert np.allclose(z.Dpf, fresh.Dpf)
+        assert np.array_equal(z.Dpf[3], unaffected)
+        assert z.res.var_dict == {'x': 0.25, 'y': 4, 'z': 3}
+
+        with pytest.raises(KeyError):
+            z.update(w = 1)
+
+    def test_tape_mode(self):
+        vars = {'x': 0.5, 'y': 4}
+        fcts = ['cos(x) + y ** 2', '2 * log(y) - sqrt(x)/3']
+        z = AD(vars, fcts, mode = 't')
+        assert z.res.__class__.__name__ == 'TapeAD'
+        assert np.allclose(z.Dpf, AD(vars, fcts, mode = 'r').Dpf)
+
+    def test_cost(self):
+        # one variable shared by many large functions: forward mode is cheaper
+        vars = {'x': 0.5}
+        fcts = [f'sin(exp(x) * {k}) + cos(x)' for k in range(1, 6)]
+        z = AD(vars, fcts)
+        assert z.mode == 'forward'
+        assert z.cost == estimate_cost(list(vars), fcts)
+        assert z.cost['forward'] <= z.cost['reverse']
+
+        # many variables, few functions: reverse mode is cheaper
+        vars = {f'x{k}': 0.1 * (k + 1) for k in range(400)}
+        fcts = [' + '.join(f'sin(x{k}) * x{k + 1}' for k in range(399))]
+        z = AD(vars, fcts)
+        assert z.mode == 'reverse'
+        assert z.cost['forward'] > z.cost['reverse']
+
+        # one function of a few tens of variables: reverse mode is cheaper
+        for n in (3, 30, 60):
+            vars = {f'x{k}': 0.1 * (k + 1) for k in range(n)}
+            fcts = [' + '.join(f'sin(x{k}) * x{k + 1}' for k in range(n - 1))]
+            assert AD(vars, fcts).mode == 'reverse'
+        assert AD({'x': 1, 'y': 2, 'z': 3}, 'tan(x) + exp(y) + sqrt(z)').mode == 'reverse'
+
+        # as many functions as variables, with dense rows: forward mode is cheaper
+        vars = {f'x{k}': 0.1 * (k + 1) for k in range(10)}
+        fcts = [' + '.join(f'x{k} * {j + 1}' for k in range(10)) + f' + sin(x{j})' for j in range(10)]
+        assert AD(vars, fcts).mode == 'forward'
+
+        # the cost is not estimated when the mode is given
+        assert AD(vars, fcts, mode = 'f').cost is None
+
+    def test_estimate_cost(self):
+        assert estimate_cost(['x', 'y'], ['x * y', 'exp(x)']) == {'forward': 54.024, 'reverse': 43.35}
+
+        # structurally zero rows are not swept, unused variables are still seeded and traced
+        cost = estimate_cost(['x', 'y', 'z'], ['x * y', 'exp(x)', '3'])
+        assert cost == {'forward': 59.236, 'reverse': 46.55}
+
+        # shared subterms are evaluated once in the trace
+        shared = estimate_cost(['x'], ['sin(x) * 2', 'sin(x) * 3'])
+        unshared = estimate_cost(['x'], ['sin(x) * 2', 'cos(x) * 3'])
+        assert shared['forward'] < unshared['forward']
+
+    def test_autotune(self, monkeypatch):
+        monkeypatch.setattr(wrapperAD, '_tuned', {})
+        vars = {'x': 0.5, 'y': 4}
+        fcts = ['cos(x) + y ** 2', '2 * log(y) - sqrt(x)/3']
+        z = AD(vars, fcts, autotune = True)
+        assert z.mode in ENGINES
+        assert set(z.timings) == set(ENGINES)
+        assert z.mode == min(z.timings, key = z.timings.get)
+        assert z.cost is None
+        assert np.allclose(z.Dpf, AD(vars, fcts, mode = 'f').Dpf)
+
+        # the choice is remembered for the same functions and variables
+        again = AD({'x': 1, 'y': 2}, fcts, autotune = True)
+        assert again.mode == z.mode
+        assert again.timings is None
+
+        # a mode given explicitly is not tuned
+        assert AD(vars, fcts, mode = 'r', autotune = True).timings is None
+
+    def test_register_engine(self, monkeypatch):
+        monkeypatch.setattr(wrapperAD, '_tuned', {})
+        monkeypatch.setattr(wrapperAD, 'ENGINES', dict(ENGINES))
+
+        class FastAD(ForwardAD):
+            pass
+
+        class SlowAD(ForwardAD):
+            def __init__(self, var_dict, func_list):
+                super().__init__(var_dict, func_list)
+                time.sleep(0.01)
+
+        register_engine('fast', FastAD)
+        for mode in ('forward', 'reverse', 'codegen', 'tape'):
+            register_engine(mode, SlowAD)
+        z = AD({'x': 1}, 'exp(x)', autotune = True)
+        assert z.mode == 'fast'
+        assert isinstance(z.res, FastAD)
+        assert isinstance(AD({'x': 1}, 'exp(x)', mode = 'fast').res, FastAD)
+
+        with pytest.raises(ValueError):
+            AD({'x': 1}, 'exp(x)', mode = 'slow')
+
+    def test_autotune_failing_engine(self, monkeypatch):
+        monkeypatch.setattr(wrapperAD, '_tuned', {})
+        monkeypatch.setattr(wrapperAD, 'ENGINES', dict(ENGINES))
+
+        class BrokenAD(ForwardAD):
+            def __init__(self, var_dict, func_list):
+                raise RuntimeError("unsupported")
+
+        # engines failing at the sample point are left out of the timings
+        register_engine('broken', BrokenAD)
+        z = AD({'x': 1}, 'exp(x)', autotune = True)
+        assert z.mode != 'broken' and 'broken' not in z.timings
+        assert np.allclose(z.Dpf, [[np.e]])
+
+        # codegen rejects the variable name, the other engines do not
+        z = AD({'_a': 1}, 'exp(_a)', autotune = True)
+        assert 'codegen' not in z.timings
+
+        # only forward mode supports array-valued points; a choice made at a scalar point is not reused
+        AD({'y': 1.}, 'exp(y)', autotune = True)
+        z = AD({'y': np.array([1., 2.])}, 'exp(y)', autotune = True)
+        assert list(z.timings) == ['forward']
+
+        # an error is raised only if every engine fails
+        monkeypatch.setattr(wrapperAD, 'ENGINES', {'broken': BrokenAD})
+        with pytest.raises(RuntimeError):
+            AD({'x': 2}, 'exp(x)', autotune = True)
+
+    def test_chunk_size(self):
+        vars = {'x': 0.5, 'y': 4}
+        fcts = ['cos(x) + y ** 2', '2 * log(y) - sqrt(x)/3']
+        assert AD(vars, fcts, mode = 'f', chunk_size = 1).res.chunk_size == 1
+        assert np.allclose(AD(vars, fcts, mode = 'forward', chunk_size = 1).Dpf, AD(vars, fcts, mode = 'r').Dpf)
+        assert isinstance(AD(vars, fcts, mode = 'r', chunk_size = 1).res, ReverseAD)
+
     def test_repr_str(self):
         vars = {'x': 0.5, 'y': 4}
         fcts = ['cos(x) + y ** 2', '2 * log(y) - sqrt(x)/3',